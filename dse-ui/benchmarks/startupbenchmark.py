@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cold / warm startup benchmark for dselib/dse.py.
+
+Launches DSE under Qt's offscreen platform once per run and perspective with startup tracing on, and measures the
+wall time from launching the process to the end of DseApp.create_view and to the first PerspectiveView.showEvent.
+
+    startupbenchmark.py [--perspective NAME ...] [--runs N] [--mode cold|warm|both] [--output FILE]
+                        [--baseline FILE] [--save-baseline] [--threshold PERCENT]
+
+Cold runs drop the OS page cache before every launch, which needs root on Linux; without it cold runs are skipped.
+Warm runs are preceded by one discarded launch so the page cache is hot.
+With --baseline the medians are compared against the stored results and the exit code is 1 on a regression.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DSE_UI_DIR = os.path.dirname(THIS_DIR)
+DSE_SCRIPT = os.path.join(DSE_UI_DIR, 'dselib', 'dse.py')
+CONFIG_FILE = os.path.join(DSE_UI_DIR, 'dselib', 'config', 'dseconfig.json')
+DEFAULT_BASELINE = os.path.join(THIS_DIR, 'startup_baseline.json')
+
+# the measured milestones, taken from the startup trace
+METRICS = ("create_view_ms", "first_show_ms")
+
+
+def get_configured_perspectives():
+    """
+    Retrieves the names of the perspectives defined in the root configuration file.
+    """
+    with open(CONFIG_FILE) as config_file:
+        data = json.load(config_file)
+
+    return [perspective["name"] for perspective in data["perspectiveDefinition"]["perspectives"]]
+
+
+def drop_page_cache():
+    """
+    Drops the OS page cache so the next launch reads everything from disk.
+    returns -- True if the cache was dropped, False if that isn't possible here.
+    """
+    if platform.system() != 'Linux':
+        return False
+
+    try:
+        subprocess.check_call(['sync'])
+        with open('/proc/sys/vm/drop_caches', 'w') as drop_caches:
+            drop_caches.write('3\n')
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+    return True
+
+
+def launch(perspective, timeout):
+    """
+    Launches DSE once in the given perspective and measures the startup milestones.
+    perspective -- The name of the perspective to start in.
+    timeout -- The number of seconds after which the launch is considered hung.
+    returns -- A dictionary {metric: milliseconds since launch}.
+    """
+    trace_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    trace_file.close()
+
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['DSE_EXIT_AFTER_STARTUP'] = '1'
+    env['DSE_STARTUP_TRACE'] = trace_file.name
+    env['PYTHONPATH'] = os.pathsep.join([DSE_UI_DIR] + [path for path in [env.get('PYTHONPATH')] if path])
+
+    try:
+        launch_time = time.time()
+        subprocess.run([sys.executable, DSE_SCRIPT, perspective], env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL)
+
+        with open(trace_file.name) as trace:
+            data = json.load(trace)
+    finally:
+        for path in (trace_file.name, os.path.splitext(trace_file.name)[0] + '.txt'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # trace timestamps are microseconds relative to the trace origin inside the process
+    origin_ms = (data["otherData"]["origin_epoch"] - launch_time) * 1000.0
+    events = data["traceEvents"]
+    create_view = [e for e in events if e["ph"] == "X" and e["name"] == "DseApp.create_view"]
+    first_show = [e for e in events if e["ph"] == "i" and e["name"] == "PerspectiveView.showEvent"]
+    if not create_view or not first_show:
+        raise RuntimeError("Startup trace of perspective " + perspective + " is missing its milestones!")
+
+    return {
+        "create_view_ms": origin_ms + (create_view[0]["ts"] + create_view[0]["dur"]) / 1000.0,
+        "first_show_ms": origin_ms + min(e["ts"] for e in first_show) / 1000.0,
+    }
+
+
+def summarize(samples):
+    """
+    Summarizes the samples of one perspective and mode.
+    samples -- A list of dictionaries as returned by launch.
+    returns -- A dictionary {metric: {"median", "min", "max", "samples"}}.
+    """
+    summary = {}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples]
+        summary[metric] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+            "samples": values,
+        }
+
+    return summary
+
+
+def run_benchmark(perspectives, modes, runs, timeout):
+    """
+    Runs the benchmark.
+    returns -- A dictionary {mode: {perspective: summary}}.
+    """
+    results = {}
+    for mode in modes:
+        if mode == 'cold' and not drop_page_cache():
+            sys.stderr.write("Skipping cold runs - unable to drop the page cache (needs root on Linux)\n")
+            continue
+
+        results[mode] = {}
+        for perspective in perspectives:
+            if mode == 'warm':
+                # discarded launch, brings the page cache up to temperature
+                launch(perspective, timeout)
+
+            samples = []
+            for _run in range(runs):
+                if mode == 'cold':
+                    drop_page_cache()
+                samples.append(launch(perspective, timeout))
+            results[mode][perspective] = summarize(samples)
+            print('%-5s %-20s create_view %8.1f ms   first show %8.1f ms' % (
+                mode, perspective, results[mode][perspective]["create_view_ms"]["median"],
+                results[mode][perspective]["first_show_ms"]["median"]))
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the medians against the baseline.
+    threshold -- The allowed slow down in percent.
+    returns -- A tuple (comparison dictionary, list of regression descriptions).
+    """
+    comparison = {}
+    regressions = []
+    for mode, perspectives in results.items():
+        for perspective, summary in perspectives.items():
+            baseline_summary = baseline.get(mode, {}).get(perspective)
+            if baseline_summary is None:
+                continue
+            for metric in METRICS:
+                current = summary[metric]["median"]
+                previous = baseline_summary[metric]["median"]
+                change = (current - previous) / previous * 100.0 if previous else 0.0
+                comparison.setdefault(mode, {}).setdefault(perspective, {})[metric] = {
+                    "baseline": previous, "current": current, "change_percent": change}
+                if change > threshold:
+                    regressions.append('%s %s %s: %.1f ms -> %.1f ms (%+.1f%%)' % (
+                        mode, perspective, metric, previous, current, change))
+
+    return comparison, regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Cold / warm startup benchmark for dse.py.')
+    parser.add_argument('--perspective', action='append', help='perspective to start in, all configured if omitted')
+    parser.add_argument('--runs', type=int, default=5, help='launches per perspective and mode')
+    parser.add_argument('--mode', choices=('cold', 'warm', 'both'), default='both')
+    parser.add_argument('--timeout', type=float, default=120.0, help='seconds before a launch is considered hung')
+    parser.add_argument('--output', help='file to write the json results to')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='stored results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slow down in percent')
+    args = parser.parse_args()
+
+    perspectives = args.perspective or get_configured_perspectives()
+    modes = ('cold', 'warm') if args.mode == 'both' else (args.mode,)
+    results = run_benchmark(perspectives, modes, args.runs, args.timeout)
+
+    report = {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "results": results,
+    }
+
+    regressions = []
+    if not args.save_baseline and os.path.isfile(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        report["comparison"], regressions = compare(results, baseline["results"], args.threshold)
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(report, baseline_file, indent=4)
+
+    for regression in regressions:
+        sys.stderr.write('REGRESSION: ' + regression + '\n')
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,18 @@
 import importlib
 import json
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import os.path
 import fnmatch
+from PyQt5.QtCore import QThread
 import dselib
 from dselib.baseui.services.dseservice import (DseService, DseServiceConfigurator)
 from dselib.baseui.services.servicemodel import ServiceDefinition
+from dselib.baseui.utils.configsnapshot import ConfigSnapshot
+from dselib.baseui.utils.startuptrace import startup_trace
+
+logger = logging.getLogger(__name__)
 
 class AppContext(object):
     """
@@ -12,14 +20,47 @@ class AppContext(object):
     Each ACES process is composed of multiple top-level windows, all of which share the same context.
     """
 
-    def __init__(self):
+    def __init__(self, batch=False):
         """
         Initializes the AppContext instance.
+        batch -- True if the context hosts a headless batch process without any windows, False otherwise.
         """
+        self.batch = batch
         self.argv = []
+        # {service id: service} of the fully initialized services
         self.services = {}
+
+        # {service id: service} of the services instantiated and registered but not initialized yet
+        self.loading_services = {}
+
+        # {service id: ident of the thread initializing the service}
+        self.service_owners = {}
+
+        # {service id: threading.Event set once the initialization of the loading service finished or failed}
+        self.service_events = {}
+
+        # services are QObjects and have to be instantiated on the main thread, while initialize_services runs the
+        # pool threads queue their instantiations as (callable, Future, thread ident) in main_thread_calls and complete the
+        # wakeup future
+        self.main_thread = threading.current_thread()
+        self.main_qthread = QThread.currentThread()
+        self.main_thread_lock = threading.Lock()
+        self.main_thread_calls = None
+        self.main_thread_wakeup = None
+
+        # idents of the threads whose queued calls the main thread is running, innermost last
+        self.main_thread_callers = []
+
         self.configurators = {}
         self.service_definitions = []
+        self.service_definition_map = {}
+        self.service_lock = threading.RLock()
+        self.service_metrics_enabled = False
+        self.config_path = None
+        self.config_files = []
+        self.config_documents = []
+        self.config_snapshot = None
+        self.config_watcher = None
         self.main_window = None
 
     def initialize(self, argv):
@@ -28,55 +69,190 @@ class AppContext(object):
         """
         self.argv = argv
         root_dir = os.path.dirname(dselib.__file__)
-        config_path = os.path.join(root_dir, 'config')
+        self.config_path = os.path.join(root_dir, 'config')
+
+        config_files = self._get_config_files()
+        if os.path.dirname(config_files[0]) != self.config_path:
+            print('USING ACESCONFIG FILE: ', config_files[0])
+
+        # parsing every file is expensive on network home directories, so unless one of the files changed
+        # we load the documents from the snapshot written by the previous start
+        snapshot_key = None
+        documents = None
+        if os.environ.get('DSE_NO_CONFIG_SNAPSHOT') is None:
+            self.config_snapshot = ConfigSnapshot(os.path.join(os.path.expanduser('~'), '.dse', 'dse_config_snapshot.json'))
+            snapshot_key = ConfigSnapshot.build_key(config_files)
+            documents = self.config_snapshot.load(snapshot_key)
+
+        from_snapshot = documents is not None
+        if not from_snapshot:
+            documents = self._parse_config_files(config_files)
 
-        aces_config_file = os.path.join(config_path, 'dseconfig.json')
+        with startup_trace.span("load configuration", "config", from_snapshot=from_snapshot):
+            self._load_configuration(documents)
+        self.config_files = config_files
+        self.config_documents = documents
+
+        # only configuration that loaded without errors ends up in the snapshot
+        if self.config_snapshot is not None and not from_snapshot:
+            self.config_snapshot.save(snapshot_key, documents)
+
+        # all service definitions are known now, so we can validate the declared dependencies
+        self._check_service_dependencies()
+
+        # service call metrics are opt-in and recorded by the Diagnostics service
+        self.service_metrics_enabled = (os.environ.get('DSE_SERVICE_METRICS') is not None and
+                                        "Diagnostics" in self.service_definition_map)
+
+        # global services are not instantiated here - each one is created, registered and initialized
+        # the first time it is requested through get_service (see _load_service), unless it asks to be preloaded
+        preload_service_ids = [service_definition.get_id() for service_definition in self.service_definitions
+                               if self._is_available(service_definition) and service_definition.is_preloaded()]
+        if preload_service_ids:
+            self.initialize_services(preload_service_ids)
+
+    def _get_config_files(self):
+        """
+        Retrieves the configuration files in load order.
+        The root dseconfig.json file (or its LOCAL_DEV override) comes first, everything else must be extensions to the base DSE system.
+        """
+        aces_config_file = os.path.join(self.config_path, 'dseconfig.json')
         local_dev = os.environ.get('LOCAL_DEV')
         if local_dev is not None and os.path.isfile(os.path.join(local_dev, 'dseconfig.json')):
             aces_config_file = os.path.join(local_dev, 'dseconfig.json')
-            print('USING ACESCONFIG FILE: ', aces_config_file)
 
-        # first we parse the root dseconfig.json file
-        with open(aces_config_file) as config_file:
-            data = json.load(config_file)
+        config_files = [aces_config_file]
+        for name in sorted(os.listdir(self.config_path)):
+            if fnmatch.fnmatch(name, "*.json") and name != "dseconfig.json":
+                config_files.append(os.path.join(self.config_path, name))
+
+        return config_files
+
+    def _parse_config_files(self, config_files):
+        """
+        Parses the given configuration files.
+        config_files -- The configuration file paths in load order, see _get_config_files.
+        returns -- A list of the parsed json documents.
+        """
+        documents = []
+        for name in config_files:
+            if name != config_files[0]:
+                print("Process file:" + os.path.basename(name))
+            with startup_trace.span("parse " + os.path.basename(name), "config"):
+                with open(name) as config_file:
+                    documents.append(json.load(config_file))
+
+        return documents
+
+    def get_config_watch_paths(self):
+        """
+        Retrieves the files and directories to watch for configuration changes.
+        """
+        watch_paths = [self.config_path] + list(self.config_files)
+        local_dev = os.environ.get('LOCAL_DEV')
+        if local_dev is not None and os.path.isdir(local_dev):
+            watch_paths.append(local_dev)
+
+        return watch_paths
+
+    def watch_configuration(self):
+        """
+        Starts watching the configuration files, reloading the configurators affected by a change.
+        returns -- The ConfigWatcher, whose config_reloaded signal reports the changed top-level keys.
+        """
+        if self.config_watcher is None:
+            # imported here so batch processes don't pull in the watcher
+            from dselib.baseui.configwatcher import ConfigWatcher
+            self.config_watcher = ConfigWatcher(self)
+
+        return self.config_watcher
+
+    def get_config_watcher(self):
+        """
+        Retrieves the ConfigWatcher, or None if the configuration isn't being watched.
+        """
+        return self.config_watcher
+
+    def reload_configuration(self):
+        """
+        Parses the configuration files again and reloads only the configurators reading a top-level key that changed.
+        Service definitions can't change while running, a change to them is reported and needs a restart.
+        returns -- A list of the top-level keys that changed.
+        """
+        config_files = self._get_config_files()
+        try:
+            documents = self._parse_config_files(config_files)
+        except (OSError, ValueError) as e:
+            # most likely a file that is still being written, we'll get another change notification
+            logger.error("Unable to reload the configuration: %s", e)
+            return []
+
+        changed_keys = self._get_changed_config_keys(self.config_documents, documents)
+        if "serviceDefinition" in changed_keys:
+            logger.warning("Service definitions changed, DSE has to be restarted to pick them up!")
+
+        for configurator in list(self.configurators.values()):
+            config_keys = configurator.get_config_keys()
+            if not any(config_key in changed_keys for config_key in config_keys):
+                continue
 
-            # gather the list of services, they will read the rest of the configuration file
+            configurator.reset_config()
+            for data in documents:
+                configurator.load_config(data)
+
+        self.config_files = config_files
+        self.config_documents = documents
+        if self.config_snapshot is not None:
+            self.config_snapshot.save(ConfigSnapshot.build_key(config_files), documents)
+
+        if changed_keys:
+            for service in list(self.services.values()):
+                service.config_reloaded(changed_keys)
+
+        return changed_keys
+
+    def _get_changed_config_keys(self, old_documents, new_documents):
+        """
+        Compares two sets of configuration documents per top-level key.
+        old_documents -- The documents that were loaded before.
+        new_documents -- The documents that were just parsed.
+        returns -- A list of the top-level keys whose content differs in any of the files.
+        """
+        keys = []
+        for data in old_documents + new_documents:
+            for key in data:
+                if key not in keys:
+                    keys.append(key)
+
+        return [key for key in keys if [data[key] for data in old_documents if key in data] !=
+                [data[key] for data in new_documents if key in data]]
+
+    def _load_configuration(self, documents):
+        """
+        Loads the service definitions and the configurator content from the given configuration documents.
+        documents -- The parsed configuration files, starting with the root dseconfig.json file.
+        """
+        root_data = documents[0]
+
+        # gather the list of services, they will read the rest of the configuration file
+        for key in root_data:
+            if key == "serviceDefinition":
+                self._load_service_definition(root_data[key])
+        # we've instantiated the built-in configurators, now read the rest of the config file using the configurators
+        for configurator_id in self.configurators:
+            self.configurators[configurator_id].load_config(root_data)
+
+        # at this point, we've loaded the built-in configuration, everything else must be
+        # extensions to the base DSE system - we go through each file and determine if there
+        # are additional services with configurators first, then back through each allowing all configurators to load
+        for data in documents[1:]:
             for key in data:
                 if key == "serviceDefinition":
                     self._load_service_definition(data[key])
-            # we've instantiated the built-in services, now read the rest of the config file using the configurators
+        for data in documents[1:]:
             for configurator_id in self.configurators:
                 self.configurators[configurator_id].load_config(data)
 
-        # at this point, we've loaded the built-in configuration, everything else must be
-        # extensions to the base DSE system - we go through each file and determine if there
-        # are additional services with configurators first, then back through each allowing all configurators to load        
-        for name in os.listdir(config_path):
-            if not fnmatch.fnmatch(name, "*.json"):
-                continue
-            if name != "dseconfig.json":
-                print("Process file:" + str(name))
-                with open(os.path.join(config_path, name)) as config_file:
-                    data = json.load(config_file)
-                    for key in data:
-                        if key == "serviceDefinition":
-                            self._load_service_definition(data[key])
-        for name in os.listdir(config_path):
-            if not fnmatch.fnmatch(name, "*.json"):
-                continue
-            if name != "dseconfig.json":
-                with open(os.path.join(config_path, name)) as config_file:
-                    data = json.load(config_file)
-
-                    for configurator_id in self.configurators:
-                        self.configurators[configurator_id].load_config(data)
-
-        # service initialization is a two-phase workflow where first all services are registered (where they can perform initialization
-        # pertaining only to them) followed by initialized (where they can perform initialization that may need other services)
-        # we complete the workflow here by initializing the services
-        for _service_id, service in list(self.services.items()):
-            service.initialize_service()
-
     def set_window(self, window):
         """
         sets the main window to context
@@ -88,13 +264,15 @@ class AppContext(object):
     def close(self):
         """
         Terminates the services within the context.
+        Only services that have actually been instantiated are unregistered.
         """
         for _serviceId, service in list(self.services.items()):
             service.unregister_service()
 
     def _load_service_definition(self, service_definition_entry):
         """
-        Loads a service definition configuration entry from the given file and instantiates the services and configurators.
+        Loads a service definition configuration entry from the given file and instantiates the configurators.
+        The services themselves are instantiated on demand by get_service.
         service_definition_entry -- The service definition entry to load from the configuration file.
         """
         if "services" not in service_definition_entry:
@@ -120,21 +298,43 @@ class AppContext(object):
             if "service" not in service_entry:
                 raise ValueError("Ill-formed service definition - service entry must specify a service class!")
 
-            service_definition = None
-            if "configurator" in service_entry:
-                service_definition = ServiceDefinition(service_entry["id"], is_global, service_entry["module"], service_entry["service"],
-                                                       service_entry["configurator"])
-            else:
-                service_definition = ServiceDefinition(service_entry["id"], is_global, service_entry["module"], service_entry["service"])
+            depends_on = service_entry.get("dependsOn", [])
+            if not isinstance(depends_on, list) or not all(isinstance(dependency, str) for dependency in depends_on):
+                raise ValueError("Ill-formed service definition - service entry's dependsOn must be a list of service ids!")
+
+            main_thread = service_entry.get("mainThread", False)
+            if not isinstance(main_thread, bool):
+                raise ValueError("Ill-formed service definition - service entry's mainThread flag must be a boolean")
+
+            preload = service_entry.get("preload", False)
+            if not isinstance(preload, bool):
+                raise ValueError("Ill-formed service definition - service entry's preload flag must be a boolean")
+
+            # global services don't use any UI unless they say so, view services always do
+            batch = service_entry.get("batch", is_global)
+            if not isinstance(batch, bool):
+                raise ValueError("Ill-formed service definition - service entry's batch flag must be a boolean")
+
+            service_definition = ServiceDefinition(service_entry["id"], is_global, service_entry["module"], service_entry["service"],
+                                                   service_entry.get("configurator"), depends_on, main_thread, preload, batch)
+
+            if service_definition.get_id() in self.service_definition_map:
+                raise ValueError("Error, duplicate service id detected: " + service_definition.get_id())
 
             # read in the service entry, add it to the list
-            # and instantiate the service / configurator
             self.service_definitions.append(service_definition)
+            self.service_definition_map[service_definition.get_id()] = service_definition
+
+            # configurators have to exist up front so they can read the rest of the configuration,
+            # the service itself is only instantiated once it is requested
+            # a batch process doesn't import the modules of the services needing the UI at all
+            if self.batch and not service_definition.supports_batch():
+                continue
 
-            # load the module, the configurator, and the service if it exists in a global context
-            print(service_definition.get_module()+"\n")
-            module = importlib.import_module(service_definition.get_module())
             if service_definition.get_configurator() is not None:
+                print(service_definition.get_module()+"\n")
+                with startup_trace.span("import " + service_definition.get_module(), "import"):
+                    module = importlib.import_module(service_definition.get_module())
                 configurator_class = getattr(module, service_definition.get_configurator())
                 configurator = configurator_class(self, service_definition.get_id())
                 if not isinstance(configurator, DseServiceConfigurator):
@@ -146,29 +346,398 @@ class AppContext(object):
                 else:
                     self.configurators[service_definition.get_id()] = configurator
 
-            service_class = getattr(module, service_definition.get_service())
-            if service_definition.is_global():
-                service = service_class(self, service_definition.get_id())
+    def _check_service_dependencies(self):
+        """
+        Ensures every declared service dependency exists and that the dependencies don't form a cycle.
+        Raises a ValueError describing the offending services otherwise.
+        """
+        # depth-first search, a service that is reached again while it is still on the path closes a cycle
+        visited = set()
+        path = []
+
+        def visit(service_definition):
+            if service_definition.get_id() in path:
+                cycle = path[path.index(service_definition.get_id()):] + [service_definition.get_id()]
+                raise ValueError("Error, cyclic service dependency detected: " + " -> ".join(cycle))
+
+            if service_definition.get_id() in visited:
+                return
+
+            path.append(service_definition.get_id())
+            for dependency_id in service_definition.get_dependencies():
+                dependency = self.service_definition_map.get(dependency_id)
+                if dependency is None:
+                    raise ValueError("Error, service \"" + service_definition.get_id() +
+                                     "\" depends on the undefined service \"" + dependency_id + "\"")
+                if service_definition.is_global() and not dependency.is_global():
+                    raise ValueError("Error, global service \"" + service_definition.get_id() +
+                                     "\" can't depend on the view service \"" + dependency_id + "\"")
+                if service_definition.supports_batch() and not dependency.supports_batch():
+                    raise ValueError("Error, batch service \"" + service_definition.get_id() +
+                                     "\" can't depend on the UI service \"" + dependency_id + "\"")
+                visit(dependency)
+            path.pop()
+            visited.add(service_definition.get_id())
+
+        for service_definition in self.service_definitions:
+            visit(service_definition)
+
+    def _sort_services(self, service_ids):
+        """
+        Orders the given services and everything they depend on so that dependencies come first.
+        Services that are already loaded are left out.
+        service_ids -- The ids of the services to order.
+        returns -- A list of ServiceDefinition instances in initialization order.
+        """
+        ordered = []
+        seen = set()
+
+        def visit(service_id):
+            if service_id in seen or service_id in self.services:
+                return
+            seen.add(service_id)
+            self._check_available(service_id)
+            service_definition = self.service_definition_map[service_id]
+            for dependency_id in service_definition.get_dependencies():
+                visit(dependency_id)
+            ordered.append(service_definition)
+
+        for service_id in service_ids:
+            visit(service_id)
+
+        return ordered
+
+    def initialize_services(self, service_ids=None, max_workers=None):
+        """
+        Creates and initializes the given global services, running independent initializations concurrently.
+        All services are instantiated and registered on the calling (main) thread in dependency order.  The
+        initialize_service calls then run on a thread pool as soon as everything the service dependsOn is initialized,
+        except for services flagged with mainThread, which are initialized on the calling thread, also when a pool
+        thread reaches them through get_service.
+        If an initialization fails, the services that didn't get initialized are unregistered and the error is raised.
+        service_ids -- The ids of the services to initialize, all global services if None.
+        max_workers -- The maximum number of concurrent initializations, one per service if None.
+        """
+        if service_ids is None:
+            service_ids = [service_definition.get_id() for service_definition in self.service_definitions
+                           if self._is_available(service_definition)]
+
+        with self.service_lock:
+            initialized = set(self.services)
+            pending = self._sort_services(service_ids)
+        if not pending:
+            return
+
+        for service_definition in pending:
+            self._instantiate_service(service_definition)
+
+        running = {}
+        try:
+            self._run_service_initializations(pending, running, initialized, max_workers or len(pending))
+        except Exception:
+            # services that never got to initialize must not stay in the context half-done
+            for service_definition in pending:
+                self._discard_service(service_definition.get_id(), unclaimed_only=True)
+            raise
+
+    def _run_service_initializations(self, pending, running, initialized, max_workers):
+        """
+        Schedules the initialize_service calls of the given instantiated services, see initialize_services.
+        While waiting for the pool, the instantiations requested by the pool threads are run on this thread.
+        pending -- The list of ServiceDefinition instances still to initialize, in dependency order.
+        running -- A dictionary {future: service id} of the initializations currently running on the pool.
+        initialized -- A set of the ids of the services that are fully initialized.
+        max_workers -- The maximum number of concurrent initializations.
+        """
+        with self.main_thread_lock:
+            self.main_thread_calls = []
+            self.main_thread_wakeup = Future()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                try:
+                    self._schedule_service_initializations(executor, pending, running, initialized)
+                finally:
+                    # the pool threads still running may need the main thread before the executor shuts down
+                    while running:
+                        completed, _not_completed = wait(list(running) + [self.main_thread_wakeup], return_when=FIRST_COMPLETED)
+                        self._run_main_thread_calls()
+                        for future in completed:
+                            running.pop(future, None)
+        finally:
+            with self.main_thread_lock:
+                calls = self.main_thread_calls
+                self.main_thread_calls = None
+                self.main_thread_wakeup = None
+            for function, done, caller in calls:
+                self._run_main_thread_call(function, done, caller)
+
+    def _schedule_service_initializations(self, executor, pending, running, initialized):
+        """
+        Submits the initializations of the pending services to the pool as their dependencies become initialized.
+        """
+        while pending or running:
+            ready = [service_definition for service_definition in pending
+                     if all(dependency_id in initialized for dependency_id in service_definition.get_dependencies())]
+            for service_definition in ready:
+                pending.remove(service_definition)
+                if not service_definition.needs_main_thread():
+                    running[executor.submit(self._load_service, service_definition)] = service_definition.get_id()
+
+            # services bound to the main thread run here while the pool works on the others
+            main_thread_ready = [service_definition for service_definition in ready if service_definition.needs_main_thread()]
+            for service_definition in main_thread_ready:
+                self._run_main_thread_calls()
+                self._load_service(service_definition)
+                initialized.add(service_definition.get_id())
+            if main_thread_ready:
+                continue
+
+            if not running:
+                # can't happen for a validated dependency graph
+                raise RuntimeError("Unable to initialize services, unresolved dependencies: " +
+                                   ", ".join(service_definition.get_id() for service_definition in pending))
+
+            completed, _not_completed = wait(list(running) + [self.main_thread_wakeup], return_when=FIRST_COMPLETED)
+            self._run_main_thread_calls()
+            for future in completed:
+                service_id = running.pop(future, None)
+                if service_id is None:
+                    continue
+                # re-raises the error of a failed initialization
+                future.result()
+                initialized.add(service_id)
+
+    def _call_on_main_thread(self, function):
+        """
+        Runs the given callable on the main thread and returns its result.
+        Outside of initialize_services the main thread doesn't serve requests, the callable then runs on the calling thread.
+        """
+        if threading.current_thread() is self.main_thread:
+            return function()
+
+        done = Future()
+        with self.main_thread_lock:
+            if self.main_thread_calls is None:
+                done = None
+            else:
+                self.main_thread_calls.append((function, done, threading.get_ident()))
+                if not self.main_thread_wakeup.done():
+                    self.main_thread_wakeup.set_result(None)
+        if done is None:
+            return function()
+
+        return done.result()
+
+    def _run_main_thread_calls(self):
+        """
+        Runs the callables the pool threads queued for the main thread, see _call_on_main_thread.
+        """
+        with self.main_thread_lock:
+            if not self.main_thread_calls:
+                return
+            calls = self.main_thread_calls
+            self.main_thread_calls = []
+            self.main_thread_wakeup = Future()
+
+        for function, done, caller in calls:
+            self._run_main_thread_call(function, done, caller)
+
+    def _run_main_thread_call(self, function, done, caller):
+        """
+        Runs a queued callable on behalf of the waiting thread, handing it the result or error.
+        """
+        self.main_thread_callers.append(caller)
+        try:
+            done.set_result(function())
+        except Exception as e:
+            done.set_exception(e)
+        finally:
+            self.main_thread_callers.pop()
+
+    def _load_service(self, service_definition):
+        """
+        Retrieves the global service described by the given definition, instantiating and initializing it if needed.
+        The services it declares in dependsOn are loaded first.  A service is initialized by the first thread asking for
+        it, other threads wait until it is done.  While a service initializes, the initializing thread gets the
+        service as is, so that a service it depends on can refer back to it.  A service flagged with mainThread is
+        always initialized on the main thread, a pool thread asking for it hands the initialization over and waits.
+        service_definition -- The ServiceDefinition of the service to load.
+        returns -- The service.
+        """
+        service_id = service_definition.get_id()
+        if service_id in self.services:
+            return self.services[service_id]
+
+        for dependency_id in service_definition.get_dependencies():
+            self.get_service(dependency_id)
+
+        self._instantiate_service(service_definition)
+
+        if service_definition.needs_main_thread() and (threading.current_thread() is not self.main_thread):
+            return self._call_on_main_thread(lambda: self._load_service(service_definition))
+
+        with self.service_lock:
+            if service_id in self.services:
+                return self.services[service_id]
+            if service_id not in self.loading_services:
+                # discarded by a failed initialize_services in the meantime
+                raise ValueError("Service: \"" + service_id + "\" failed to initialize!")
+            owner = self.service_owners.get(service_id)
+            if (owner == threading.get_ident()) or self._is_main_thread_caller(owner):
+                return self.loading_services[service_id]
+            event = self.service_events[service_id]
+            if owner is None:
+                self.service_owners[service_id] = threading.get_ident()
+
+        if owner is None:
+            self._initialize_service(service_definition)
+        elif threading.current_thread() is self.main_thread:
+            # the thread initializing the service may be waiting for the main thread to instantiate one of its dependencies
+            while not event.wait(0.05):
+                self._run_main_thread_calls()
+        else:
+            event.wait()
+
+        service = self.services.get(service_id)
+        if service is None:
+            raise ValueError("Service: \"" + service_id + "\" failed to initialize!")
+
+        return service
+
+    def _is_main_thread_caller(self, thread_ident):
+        """
+        Retrieves whether or not the calling thread is the main thread running a call queued by the given thread.
+        The main thread then acts for that thread, so a mainThread service it initializes can refer back to a service
+        the waiting thread is initializing.
+        """
+        return (threading.current_thread() is self.main_thread) and (thread_ident in self.main_thread_callers)
+
+    def _instantiate_service(self, service_definition):
+        """
+        Instantiates and registers the global service described by the given definition, unless it already exists.
+        The service is instantiated on the main thread, see _call_on_main_thread.
+        service_definition -- The ServiceDefinition of the service to instantiate.
+        """
+        service_id = service_definition.get_id()
+        if (service_id in self.services) or (service_id in self.loading_services):
+            return
+
+        diagnostics = None
+        if self.service_metrics_enabled and service_id != "Diagnostics":
+            diagnostics = self.get_service("Diagnostics")
+
+        def instantiate():
+            with self.service_lock:
+                if (service_id in self.services) or (service_id in self.loading_services):
+                    return
+
+                print(service_definition.get_module()+"\n")
+                with startup_trace.span("import " + service_definition.get_module(), "import"):
+                    module = importlib.import_module(service_definition.get_module())
+                service_class = getattr(module, service_definition.get_service())
+                service = service_class(self, service_id)
                 if not isinstance(service, DseService):
                     raise ValueError("Service with the name \"" + service_definition.get_service() + "\" is not a valid DseService instance!")
 
-                # register the service
-                service.register_service()
-                if service_definition.get_id() in self.services:
-                    raise ValueError("Error, duplicate service id detected: " + service_definition.get_id())
-                else:
-                    self.services[service_definition.get_id()] = service
+                if threading.current_thread() is not self.main_thread:
+                    # created outside of initialize_services on another thread, the service must still live on the main thread
+                    service.moveToThread(self.main_qthread)
+
+                if diagnostics is not None:
+                    diagnostics.instrument(service)
+
+                # service initialization is a two-phase workflow where the service is first registered (where it can perform initialization
+                # pertaining only to itself) followed by initialized (where it can perform initialization that may need other services)
+                with startup_trace.span("register_service " + service_id, "service"):
+                    service.register_service()
+                self.loading_services[service_id] = service
+                self.service_events[service_id] = threading.Event()
+
+        self._call_on_main_thread(instantiate)
+
+    def _initialize_service(self, service_definition):
+        """
+        Runs the second phase of the service workflow for an instantiated service claimed by the calling thread.
+        Only a fully initialized service is added to the context, if the initialization fails the service is unregistered.
+        service_definition -- The ServiceDefinition of the service to initialize.
+        """
+        service_id = service_definition.get_id()
+        service = self.loading_services[service_id]
+        try:
+            with startup_trace.span("initialize_service " + service_id, "service"):
+                service.initialize_service()
+        except Exception:
+            self._discard_service(service_id)
+            raise
 
+        with self.service_lock:
+            self.services[service_id] = service
+            del self.loading_services[service_id]
+            del self.service_owners[service_id]
+            event = self.service_events.pop(service_id)
+        event.set()
+
+    def _discard_service(self, service_id, unclaimed_only=False):
+        """
+        Unregisters a service that didn't get initialized and removes it from the context, waking up the threads waiting for it.
+        service_id -- The id of the service to discard.
+        unclaimed_only -- True to keep the service if a thread is initializing it, False otherwise.
+        """
+        with self.service_lock:
+            if (service_id not in self.loading_services) or (unclaimed_only and service_id in self.service_owners):
+                return
+            service = self.loading_services.pop(service_id)
+            self.service_owners.pop(service_id, None)
+            event = self.service_events.pop(service_id)
+
+        try:
+            service.unregister_service()
+        except Exception:
+            logger.exception("Unable to unregister the service %s", service_id)
+        event.set()
 
     def get_service(self, service_id):
         """
         Retrieves the a service from the context by id.
+        Global services are instantiated the first time they are requested.
         service_id -- The id of the service to retrieve.
         """
-        if service_id not in self.services:
+        # only fully initialized services are in the dictionary, everything else takes the locked path
+        service = self.services.get(service_id)
+        if service is not None:
+            return service
+
+        self._check_available(service_id)
+
+        return self._load_service(self.service_definition_map[service_id])
+
+    def _is_available(self, service_definition):
+        """
+        Retrieves whether or not the service described by the given definition can be loaded into the context.
+        Only global services are hosted by the context, a batch context only hosts the ones not needing the UI.
+        """
+        return service_definition.is_global() and (not self.batch or service_definition.supports_batch())
+
+    def _check_available(self, service_id):
+        """
+        Raises a ValueError if the service with the given id can't be loaded into the context.
+        """
+        service_definition = self.service_definition_map.get(service_id)
+        if (service_definition is None) or (not service_definition.is_global()):
             raise ValueError("Service: \"" + service_id + "\" does not exist in the context!")
 
-        return self.services[service_id]
+        if not self._is_available(service_definition):
+            raise ValueError("Service: \"" + service_id + "\" needs the UI and is not available in a batch context!")
+
+    def is_service_loaded(self, service_id):
+        """
+        Determines whether the service with the given id has already been fully initialized in the context.
+        Services that are instantiated but still initializing don't count as loaded.
+        service_id -- The id of the service to check.
+        returns -- True if the service has been initialized, False otherwise.
+        """
+        return service_id in self.services
 
     def get_configurator(self, service_id):
         """
@@ -180,6 +749,12 @@ class AppContext(object):
 
         return self.configurators[service_id]
 
+    def is_batch(self):
+        """
+        Retrieves whether or not the context hosts a headless batch process.
+        """
+        return self.batch
+
     def get_command_line_args(self):
         """
         Retrieves the command line arguments ACES was launched with.
@@ -0,0 +1,62 @@
+import logging
+
+from PyQt5.QtCore import *
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher(QObject):
+    """
+    Represents a watcher of the DSE configuration files that reloads the configuration when they change.
+    """
+    # signal raised after the configuration was reloaded, passing the list of top-level keys that changed
+    config_reloaded = pyqtSignal(list)
+
+    # editors usually write a file in several steps, so we wait for the changes to settle before reloading
+    RELOAD_DELAY = 300
+
+    def __init__(self, app_context, parent=None):
+        """
+        Initializes the ConfigWatcher instance.
+        app_context -- The application context whose configuration is watched.
+        parent -- The Qt parent of the watcher.
+        """
+        QObject.__init__(self, parent)
+        self.app_context = app_context
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_path_changed)
+        self.watcher.directoryChanged.connect(self._on_path_changed)
+
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(self.RELOAD_DELAY)
+        self.reload_timer.timeout.connect(self._reload)
+
+        self._update_watched_paths()
+
+    def _update_watched_paths(self):
+        """
+        Watches the current set of configuration files.
+        Files that were replaced (as most editors do when saving) drop out of the watcher and have to be added again.
+        """
+        watched_paths = self.watcher.files() + self.watcher.directories()
+        if watched_paths:
+            self.watcher.removePaths(watched_paths)
+        self.watcher.addPaths(self.app_context.get_config_watch_paths())
+
+    def _on_path_changed(self, path):
+        """
+        Invoked when a watched file or directory changes, (re)starts the reload delay.
+        path -- The path that changed.
+        """
+        self.reload_timer.start()
+
+    def _reload(self):
+        """
+        Reloads the configuration and reports the keys that changed.
+        """
+        changed_keys = self.app_context.reload_configuration()
+        self._update_watched_paths()
+        if changed_keys:
+            logger.info("Configuration reloaded: %s", ", ".join(changed_keys))
+            self.config_reloaded.emit(changed_keys)
@@ -1,8 +1,14 @@
+import logging
+from collections import OrderedDict
+
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import QMainWindow, QSplitter, QWidget
 from dselib.baseui.mainwidget import MainWidget
 from dselib.baseui.perspectivebase.perspectiveview import PerspectiveView
 from dselib.baseui.services.settingsservice import MainWindowSettings
+from dselib.baseui.utils.startuptrace import startup_trace
+
+logger = logging.getLogger(__name__)
 
 
 class DseApp(QObject):
@@ -20,11 +26,20 @@ class DseApp(QObject):
         self.active_perspective_view = None
         self.dse_win = None
         self.loaded_perspectives = {}
+        # perspective name -> view, least recently used first
+        self.perspective_views = OrderedDict()
+        # perspective name -> view cost measured when the view was created
+        self.view_costs = {}
+        self.prewarm_queue = []
 
         # store services we need
         self.perspective_service = self.app_context.get_service("Perspective")
         self.settings_service = self.app_context.get_service("Settings")
 
+        config_watcher = self.app_context.get_config_watcher()
+        if config_watcher is not None:
+            config_watcher.config_reloaded.connect(self._on_config_reloaded)
+
     def get_context(self):
         """
         Retrieves the perspective context of the app.
@@ -41,9 +56,17 @@ class DseApp(QObject):
         Creates and shows the top-level window associated with the controller.
         :param initial_perspective: the perspective to show when creating the new view.
         """
+        with startup_trace.span("DseApp.create_view", "ui"):
+            self._create_view(initial_perspective)
+
+    def _create_view(self, initial_perspective):
+        """
+        Implements create_view, which only adds the startup trace span around it.
+        """
         self.dse_win = DseAppWindow(self)
         self._read_window_settings()
         self.dse_win.closed.connect(self._on_window_closed)
+        self.dse_win.first_painted.connect(self._start_prewarm)
         # attach the main window to the context
         self.app_context.set_window(self.dse_win)
 
@@ -63,20 +86,15 @@ class DseApp(QObject):
         Switches the application window to display the perspective with the given name.
         :param perspective_name: The name of the perspective to load into the current view.
         """
-        # do we have a local instantiation of this perspective yet?
-        if perspective_name in self.loaded_perspectives:
-            perspective = self.loaded_perspectives[perspective_name]
-        else:
-            # we haven't instantiated the perspective in this view yet
-            # so we have to ask the perspective service to instantiate a new perspective for us
-            perspective = self.perspective_service.load_perspective(perspective_name)
+        with startup_trace.span("switch_perspective " + perspective_name, "perspective"):
+            self._switch_perspective(perspective_name)
 
-        # the entity returned from loading is the perspective controller
-        # this will have a method to retrieve the view for the perspective
-        perspective_view = perspective.load_view()
-        if not isinstance(perspective_view, PerspectiveView):
-            raise ValueError("Unable to switch perspectives, perspective view provided "
-                             "is not a valid perspective view!")
+    def _switch_perspective(self, perspective_name):
+        """
+        Implements switch_perspective, which only adds the startup trace span around it.
+        """
+        perspective = self._get_perspective(perspective_name)
+        perspective_view = self._get_perspective_view(perspective)
 
         # create the main content containing the perspective and feedback view
         main_content = self._create_main_content(perspective_view)
@@ -92,6 +110,134 @@ class DseApp(QObject):
         # update the title
         self.dse_win.setWindowTitle("DSE - " + self.active_perspective.get_title())
 
+        self._evict_perspective_views()
+
+    def _get_perspective(self, perspective_name):
+        """
+        Retrieves the perspective controller with the given name, loading it the first time it is requested.
+        :param perspective_name: The name of the perspective.
+        :returns: The perspective controller.
+        """
+        # do we have a local instantiation of this perspective yet?
+        if perspective_name not in self.loaded_perspectives:
+            # we haven't instantiated the perspective in this view yet
+            # so we have to ask the perspective service to instantiate a new perspective for us
+            self.loaded_perspectives[perspective_name] = self.perspective_service.load_perspective(perspective_name)
+
+        return self.loaded_perspectives[perspective_name]
+
+    def _get_perspective_view(self, perspective):
+        """
+        Retrieves the view of the given perspective from the view cache, creating it if it isn't cached.
+        :param perspective: The perspective controller.
+        :returns: The PerspectiveView of the perspective.
+        """
+        perspective_name = perspective.get_name()
+        perspective_view = self.perspective_views.get(perspective_name)
+        if perspective_view is None:
+            # the perspective controller has a method to retrieve the view for the perspective
+            with startup_trace.span("load_view " + perspective_name, "perspective"):
+                perspective_view = perspective.load_view()
+            if not isinstance(perspective_view, PerspectiveView):
+                raise ValueError("Unable to switch perspectives, perspective view provided "
+                                 "is not a valid perspective view!")
+            self.perspective_views[perspective_name] = perspective_view
+            self.view_costs[perspective_name] = perspective.get_view_cost(perspective_view)
+
+        self.perspective_views.move_to_end(perspective_name)
+        return perspective_view
+
+    def _get_view_cache_cost(self):
+        """
+        :returns: The total view cost of the cached perspective views.
+        """
+        return sum(self.view_costs[name] for name in self.perspective_views)
+
+    def _evict_perspective_views(self):
+        """
+        Drops the least recently used perspective views until the cache fits the view cache budget.
+        The view of the active perspective is never evicted, the perspective controllers stay loaded.
+        """
+        view_cache_budget = self.perspective_service.get_view_cache_budget()
+        cost = self._get_view_cache_cost()
+        for perspective_name in list(self.perspective_views):
+            if cost <= view_cache_budget:
+                break
+            if self.perspective_views[perspective_name] is self.active_perspective_view:
+                continue
+
+            cost -= self.view_costs[perspective_name]
+            self._drop_perspective_view(perspective_name)
+
+    def _drop_perspective_view(self, perspective_name):
+        """
+        Removes the view of the given perspective from the view cache and deletes it.
+        :param perspective_name: The name of the perspective.
+        """
+        perspective_view = self.perspective_views.pop(perspective_name, None)
+        self.view_costs.pop(perspective_name, None)
+        if perspective_view is not None:
+            perspective_view.deleteLater()
+
+    def _on_config_reloaded(self, changed_keys):
+        """
+        Invoked when the configuration was reloaded, drops the cached perspectives if their definitions changed.
+        The active perspective stays until the user switches away from it.
+        :param changed_keys: The list of top-level configuration keys that changed.
+        """
+        if "perspectiveDefinition" not in changed_keys:
+            return
+
+        for perspective_name in list(self.loaded_perspectives):
+            if self.loaded_perspectives[perspective_name] is self.active_perspective:
+                continue
+            del self.loaded_perspectives[perspective_name]
+            self._drop_perspective_view(perspective_name)
+
+    def _start_prewarm(self):
+        """
+        Invoked after the first paint of the window, queues the configured perspectives for loading in idle time.
+        """
+        self.prewarm_queue = [perspective_name for perspective_name in self.perspective_service.get_prewarm_perspective_names()
+                              if perspective_name not in self.perspective_views]
+        if self.prewarm_queue:
+            QTimer.singleShot(0, self._prewarm_next)
+
+    def _prewarm_next(self):
+        """
+        Loads the next queued perspective and its view, one per event loop iteration to keep the window responsive.
+        Prewarming stops once the view cache budget is used up, it never evicts views the user opened.  The cost of a
+        view is only known once it exists, so a prewarmed view that doesn't fit is dropped again.
+        """
+        view_cache_budget = self.perspective_service.get_view_cache_budget()
+        while self.prewarm_queue:
+            perspective_name = self.prewarm_queue.pop(0)
+            if perspective_name in self.perspective_views:
+                continue
+
+            if self._get_view_cache_cost() >= view_cache_budget:
+                self.prewarm_queue = []
+                return
+
+            try:
+                perspective = self._get_perspective(perspective_name)
+                self._get_perspective_view(perspective)
+                if self._get_view_cache_cost() > view_cache_budget:
+                    self._drop_perspective_view(perspective_name)
+                    self.prewarm_queue = []
+                    return
+            except Exception:
+                # a broken perspective shouldn't take the window down, switching to it will report the error
+                logger.exception("Unable to prewarm perspective %s", perspective_name)
+
+            # keep the active perspective the most recently used one
+            if self.active_perspective is not None:
+                self.perspective_views.move_to_end(self.active_perspective.get_name())
+            break
+
+        if self.prewarm_queue:
+            QTimer.singleShot(0, self._prewarm_next)
+
     def _create_main_content(self, perspective_view):
         """
         Creates the main content from the given view the perspective created.
@@ -150,6 +296,9 @@ class DseAppWindow(QMainWindow):
     # event raised when the window is closed
     closed = pyqtSignal()
 
+    # event raised after the window has been painted for the first time
+    first_painted = pyqtSignal()
+
     def __init__(self, controller, parent=None):
         """
         Initializes the AcesAppWindow instance.
@@ -160,6 +309,7 @@ class DseAppWindow(QMainWindow):
         self.controller = controller
         self.setWindowTitle("DSE")
         self.setAttribute(Qt.WA_DeleteOnClose)
+        self.first_paint_done = False
         self.set_style()
 
         # build the start page
@@ -188,6 +338,21 @@ class DseAppWindow(QMainWindow):
         """
         return self.controller
 
+    def event(self, event):
+        """
+        QMainWindow override.
+        Records the first paint of the window, which ends the startup trace.
+        :param event: the QEvent to handle
+        """
+        if not self.first_paint_done and event.type() == QEvent.Paint:
+            self.first_paint_done = True
+            startup_trace.mark("first paint", "ui")
+            # write the trace and let subscribers run once the paint has been handled
+            QTimer.singleShot(0, startup_trace.finish)
+            QTimer.singleShot(0, self.first_painted.emit)
+
+        return QMainWindow.event(self, event)
+
     def closeEvent(self, event):
         """
         QMainWindow override.
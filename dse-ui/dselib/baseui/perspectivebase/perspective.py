@@ -1,4 +1,4 @@
-from PyQt5.Qt import pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal
 
 class Perspective():
     """
@@ -47,6 +47,15 @@ class Perspective():
         """
         raise NotImplementedError
 
+    def get_view_cost(self, view):
+        """
+        Retrieves the memory cost of keeping the given view of the perspective alive in a window's view cache.
+        The cost is measured in Qt objects, by default the view and all of its child widgets, models, etc. are counted.
+        Perspectives whose views hold data outside of Qt objects (e.g. large python caches) should override this.
+        view -- The PerspectiveView created by load_view.
+        """
+        return len(view.findChildren(QObject)) + 1
+
     def get_definition(self):
         """
         Retrieves the perspective's definition.
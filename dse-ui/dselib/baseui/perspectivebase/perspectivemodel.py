@@ -4,12 +4,15 @@ class PerspectiveDefinition(object):
     :param name -- The name of the perspective.
     :param module -- The python module that defines the perspective class.
     :param controller -- The class name of the controller that will be instantiated when the perspective is loaded.
+    :param prewarm -- True if the perspective is loaded in the background once the main window is shown.
     """
-    def __init__(self, name, module, controller):
+    def __init__(self, name, module, controller, prewarm=False):
         self.name = name
         self.module = module
         self.controller = controller
+        self.prewarm = prewarm
         self.commands = []
+        self.controller_class = None
 
     def get_name(self):
         """
@@ -28,3 +31,22 @@ class PerspectiveDefinition(object):
         :returns -- the name of the class containing the perspective logic.
         """
         return self.controller
+
+    def get_controller_class(self):
+        """
+        :returns -- the resolved controller class, or None if it hasn't been resolved yet.
+        """
+        return self.controller_class
+
+    def set_controller_class(self, controller_class):
+        """
+        Sets the resolved controller class so the module doesn't have to be looked up again.
+        :param controller_class -- The Perspective subclass named by the definition.
+        """
+        self.controller_class = controller_class
+
+    def is_prewarmed(self):
+        """
+        :returns -- True if the perspective is loaded in the background once the main window is shown.
+        """
+        return self.prewarm
@@ -1,5 +1,6 @@
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import QWidget
+from dselib.baseui.utils.startuptrace import startup_trace
 
 
 class PerspectiveView(QWidget):
@@ -25,6 +26,7 @@ class PerspectiveView(QWidget):
         QWidget override.
         Event raised when the widget is shown.
         """
+        startup_trace.mark("PerspectiveView.showEvent", "ui")
         self.perspective_visibility_changed.emit(True)
     
     def hideEvent(self, hide_event):
@@ -0,0 +1,69 @@
+import json
+import os
+
+from dselib.baseui.services.dseservice import DseService
+from dselib.baseui.utils.servicemetrics import ServiceMetrics
+
+
+class DiagnosticsService(DseService):
+    """
+    Represents the service collecting call metrics of the other services.
+    Metrics are opt-in: they are only recorded when the DSE_SERVICE_METRICS environment variable is set, either to
+    the path of the json file the metrics are dumped to on exit or to any other value for the default location.
+    """
+    def __init__(self, context, service_id):
+        """
+        Initializes the DiagnosticsService instance.
+        context -- The context in which the service is loaded.
+        service_id -- A string identifying the service.
+        """
+        DseService.__init__(self, context, service_id)
+        self.metrics = ServiceMetrics()
+        self.dump_file = None
+
+        dump_file = os.environ.get('DSE_SERVICE_METRICS')
+        if dump_file is not None:
+            if not dump_file.endswith('.json'):
+                dump_file = os.path.join(os.path.expanduser('~'), '.dse', 'dse_service_metrics.json')
+            self.dump_file = dump_file
+
+    def is_enabled(self):
+        """
+        Retrieves whether or not service calls are being recorded.
+        """
+        return self.dump_file is not None
+
+    def instrument(self, service):
+        """
+        Starts recording the calls of the public methods of the given service.
+        service -- The DseService instance to instrument.
+        """
+        if self.is_enabled() and service is not self:
+            self.metrics.instrument(service)
+
+    def get_metrics(self):
+        """
+        Retrieves the recorded metrics.
+        returns -- A dictionary {"service_id.method": statistics} with call counts, cumulative time and latency percentiles.
+        """
+        return self.metrics.to_dict()
+
+    def dump_metrics(self, dump_file=None):
+        """
+        Writes the recorded metrics as json.
+        dump_file -- The file to write to, the configured file if None.
+        """
+        dump_file = dump_file or self.dump_file
+        dump_dir = os.path.dirname(dump_file)
+        if dump_dir and not os.path.isdir(dump_dir):
+            os.makedirs(dump_dir)
+
+        with open(dump_file, 'w') as metrics_file:
+            json.dump(self.get_metrics(), metrics_file, indent=4, sort_keys=True)
+
+    def unregister_service(self):
+        """
+        Invoked when the service is unloaded by the ACES system, dumps the metrics if recording is enabled.
+        """
+        if self.is_enabled():
+            self.dump_metrics()
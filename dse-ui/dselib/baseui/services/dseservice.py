@@ -29,6 +29,21 @@ class DseServiceConfigurator(QObject):
         """
         raise NotImplementedError
 
+    def get_config_keys(self):
+        """
+        Retrieves the top-level configuration keys the configurator reads.
+        When the configuration changes while DSE is running, only configurators reading a changed key are reloaded.
+        Configurators returning an empty list (the default) are not reloaded at all.
+        """
+        return []
+
+    def reset_config(self):
+        """
+        Discards the loaded configuration before the configurator loads the changed configuration files again.
+        Inheritors returning keys from get_config_keys must override this method.
+        """
+        raise NotImplementedError
+
 class DseService(QObject):
     """
     Represents a base service object for DSE.  A service is an object that provides "services"
@@ -68,6 +83,13 @@ class DseService(QObject):
         """
         pass
 
+    def config_reloaded(self, changed_keys):
+        """
+        Invoked after the configuration was reloaded while running, allowing the service to drop what it derived from it.
+        changed_keys -- The list of top-level configuration keys that changed.
+        """
+        pass
+
     def get_id(self):
         """
         Retrieves the id of the service that will be used for querying the service by entities in the ACES system.
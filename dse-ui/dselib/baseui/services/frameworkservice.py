@@ -1,7 +1,5 @@
 import os
 
-from PyQt5.QtWidgets import QDialog
-
 import dselib
 from dselib.baseui.services.dseservice import DseService
 import logging
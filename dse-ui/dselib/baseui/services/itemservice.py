@@ -1,8 +1,83 @@
 import sys
+import threading
 import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from PyQt5.QtCore import *
 from dselib.baseui.services.dseservice import DseService
+from dselib.baseui.utils.batchrunner import BatchItemResult, run_batch
+from dselib.baseui.utils.foldernameindex import FolderNameIndex
+from dselib.baseui.utils.foldersummary import FolderSummaryCache
+from dselib.baseui.utils.lrucache import LruCache
+from dselib.baseui.utils.statesnapshot import ItemStateSnapshot
+from dselib.baseui.utils.tagpath import TagPathResolver
+from dselib.baseui.utils.unitofwork import UnitOfWork
+
+
+class ToolReferenceTags(object):
+    """
+    Represents the reference tags of a tool definition, classified by their ToolIOReference type.
+    All lists keep the order in which the tool definition states the references.
+    """
+    def __init__(self, tool_definition):
+        """
+        Initializes the ToolReferenceTags instance.
+        tool_definition -- The tool definition whose references to classify.
+        """
+        self.tool_definition = tool_definition
+        self.input_tags = []
+        self.optional_input_tags = []
+        self.output_tags = []
+        self.input_output_tags = []
+
+        # Input and OptionalInput tags together
+        self.all_input_tags = []
+
+        # [(tag, True if the references are supporting items)] as used for worksets
+        self.workset_tags = []
+
+        # the references come back as a list of tuples (tag, ToolIOReference)
+        for tag, tool_reference in tool_definition.get_references():
+            if tool_reference == ToolIOReference.Input:
+                self.input_tags.append(tag)
+            elif tool_reference == ToolIOReference.OptionalInput:
+                self.optional_input_tags.append(tag)
+            elif tool_reference == ToolIOReference.Output:
+                self.output_tags.append(tag)
+            elif tool_reference == ToolIOReference.InputOutput:
+                self.input_output_tags.append(tag)
+
+            supporting = (tool_reference == ToolIOReference.Input) or (tool_reference == ToolIOReference.OptionalInput)
+            if supporting:
+                self.all_input_tags.append(tag)
+            self.workset_tags.append((tag, supporting))
+
+
+# marks a meta data entry without value in the values read from an item revision
+MISSING_VALUE = object()
+
+
+class MetaDataMappingPlan(object):
+    """
+    Represents which meta data entries of an output item type are derived from which entries of a base item type.
+    """
+    def __init__(self, output_item_type_definition, base_item_type_definition):
+        """
+        Initializes the MetaDataMappingPlan instance, pairing the entries by name.
+        output_item_type_definition -- The type definition of the output item.
+        base_item_type_definition -- The type definition of the base item revision.
+        """
+        base_names = set(entry.getName() for entry in base_item_type_definition.getMetaDataEntryDefinitions())
+
+        # [(entry name, meta data entry definition of the output item type)]
+        # the values themselves are still checked by ItemService.verify_output_value
+        self.entries = []
+        for output_meta_data_entry in output_item_type_definition.getMetaDataEntryDefinitions():
+            name = output_meta_data_entry.getName()
+            if name in base_names:
+                self.entries.append((name, output_meta_data_entry))
+
 
 class ItemService(DseService):
     """
@@ -10,6 +85,47 @@ class ItemService(DseService):
     """
     item_naming_toggled = pyqtSignal()
 
+    # raised after an item revision was created, passing the new item revision
+    item_created = pyqtSignal(object)
+
+    # raised the first time an existing item revision is loaded through this service, passing the item revision
+    item_loaded = pyqtSignal(object)
+
+    # raised after an item revision was deleted, passing the deleted item revision
+    item_deleted = pyqtSignal(object)
+
+    # raised after an item revision was renamed, passing the item revision and its old name, see record_item_renamed
+    item_renamed = pyqtSignal(object, str)
+
+    # raised after meta data values of an item revision changed, passing the item revision, see record_meta_data_changed
+    meta_data_changed = pyqtSignal(object)
+
+    # raised after references of an item revision were set or removed, passing the item revision holding the references
+    references_changed = pyqtSignal(object)
+
+    # raised after the CPD state of an item revision changed through this service, passing the item revision
+    # note: the batch operations raise it once the item revision is done
+    state_changed = pyqtSignal(object)
+
+    # raised while a batch of CPD operations runs, passing the number of finished item revisions, the total number and
+    # the BatchItemResult of the item revision that just finished
+    cpd_progress = pyqtSignal(int, int, object)
+
+    # the number of composed icons kept
+    ICON_CACHE_SIZE = 512
+
+    # the number of item revisions whose display names are kept
+    DISPLAY_NAME_CACHE_SIZE = 4096
+
+    # the number of base item revisions whose workset dependencies are kept
+    WORKSET_DEPENDENCY_CACHE_SIZE = 1024
+
+    # the formats in which a numeric suffix is appended to a name to make it unique within a folder
+    ITEM_NAME_FORMAT = "{base}{index}"
+    ITEM_COPY_NAME_FORMAT = "{base} ({index})"
+    WORKSET_NAME_FORMAT = "{base}_{index}"
+    FOLDER_NAME_FORMAT = "{base}{index}"
+
     def __init__(self, context, service_id):
         """
         Initializes the ItemService instance.
@@ -21,6 +137,50 @@ class ItemService(DseService):
         self.lws_manager = None
         self.context = context
         self.tool_service = None
+        self.tag_path_resolver = TagPathResolver()
+
+        # {item definition name: ToolReferenceTags of the default tool or None if there is no default tool}
+        self.tool_reference_tags = {}
+
+        # the UnitOfWork of the current thread, see unit_of_work
+        self.unit_of_work_state = threading.local()
+
+        # the item revisions loaded, created or copied through this service as the keys of an ordered dictionary, see
+        # get_loaded_item_revisions
+        self.loaded_item_revisions = OrderedDict()
+
+        # {item revision: [full display name, abbreviated display name, name]}, a display name is None until it is
+        # first asked for, the name tells a rename apart from other edits when the item revision is saved
+        self.display_names = LruCache(self.DISPLAY_NAME_CACHE_SIZE)
+
+        # {base item revision: (work items, supporting items, item revisions whose references were looked at)} as
+        # calculated by calculate_workset_dependencies, the least recently used ones are dropped
+        self.workset_dependencies = LruCache(self.WORKSET_DEPENDENCY_CACHE_SIZE, self._forget_workset_dependency_sources)
+
+        # {item revision: set of base item revisions} of the cached workset dependencies whose calculation looked at the item's references
+        self.workset_dependency_sources = {}
+
+        # {(output item definition name, base item definition name): MetaDataMappingPlan}
+        self.meta_data_mapping_plans = {}
+
+        # {(folder, True for the sub-folder names / False for the item revision names): FolderNameIndex}
+        # re-read whenever the names of the folder's entries differ from the ones an index was built from
+        self.folder_name_indexes = {}
+
+        # {workset: (state generation, (editable keys, non-editable keys), ItemStateSnapshot of its item revisions)}
+        # the generation is bumped whenever a state changes through this service or the snapshots are invalidated
+        self.state_snapshots = {}
+        self.state_generation = 0
+        self.state_snapshot_lock = threading.Lock()
+
+        self.folder_summaries = FolderSummaryCache(lambda folder: isinstance(folder, WorkspaceFolder))
+
+        # {(base id, status overlay, consistency overlay, size): QIcon or QPixmap of that size}
+        self.icon_cache = LruCache(self.ICON_CACHE_SIZE)
+
+        # built on first use, see _get_overlay_tables
+        self.status_overlays = None
+        self.consistency_overlays = None
 
     def initialize_service(self):
         """
@@ -29,6 +189,40 @@ class ItemService(DseService):
         self.framework_service = self.context.get_service("Framework")
         self.lws_manager = self.framework_service.lws_manager
 
+    def config_reloaded(self, changed_keys):
+        """
+        Invoked after the configuration was reloaded, drops the classified tool references and the composed icons.
+        changed_keys -- The list of top-level configuration keys that changed.
+        """
+        self.reset_tool_reference_tags()
+        if "imageDefinition" in changed_keys:
+            self.icon_cache.clear()
+
+    def get_tool_reference_tags(self, item_definition_name):
+        """
+        Retrieves the classified reference tags of the default tool of the given item definition.
+        The default tool definitions are only looked up and classified once, see reset_tool_reference_tags.
+        item_definition_name -- The name of the item definition.
+        returns -- A ToolReferenceTags instance, None if the item definition has no default tool.
+        """
+        try:
+            return self.tool_reference_tags[item_definition_name]
+        except KeyError:
+            pass
+
+        default_tool_definition = self.tool_service.get_default_tool_definition(item_definition_name)
+        tool_reference_tags = ToolReferenceTags(default_tool_definition) if default_tool_definition is not None else None
+        self.tool_reference_tags[item_definition_name] = tool_reference_tags
+
+        return tool_reference_tags
+
+    def reset_tool_reference_tags(self):
+        """
+        Drops the classified reference tags, to be called whenever the tool definitions were reloaded.
+        """
+        self.tool_reference_tags.clear()
+        self.invalidate_workset_dependencies()
+
     def toggle_display_name(self):
         """
         Toggles the display name between full and abbreviated.
@@ -45,10 +239,46 @@ class ItemService(DseService):
     def get_display_name(self, item_revision):
         """
         Serves as a central point of retrieving the display name for the given item revision.
+        Both forms of the name are cached (see invalidate_display_names), the show_full_name setting picks one of them.
         item_revision -- The item revision for which to get the display name for.
         """
-        show_full_name = self.lws_manager.sys_settings['show_full_name']
-        return item_revision.getDisplayName() if show_full_name == "True" else item_revision.getAbbreviatedDisplayName()
+        show_full_name = self.lws_manager.sys_settings['show_full_name'] == "True"
+        return self._get_cached_name(item_revision, 0 if show_full_name else 1)
+
+    def get_display_names(self, item_revisions):
+        """
+        Retrieves the display names for the given item revisions at once, e.g. to warm up the cache for a view.
+        item_revisions -- The item revisions for which to get the display names for.
+        returns -- A list of display names in the order of the given item revisions.
+        """
+        return [self.get_display_name(item_revision) for item_revision in item_revisions]
+
+    def invalidate_display_names(self, item_revision=None):
+        """
+        Drops the cached names of the given item revision.
+        Saving an item revision through save_item and the record_item_renamed and record_meta_data_changed methods do
+        this already, it is only needed for item revisions changed and saved elsewhere.
+        item_revision -- The item revision whose names to drop, None to drop all cached names.
+        """
+        if item_revision is None:
+            self.display_names.clear()
+        else:
+            self.display_names.pop(item_revision, None)
+
+    def _get_cached_name(self, item_revision, form):
+        """
+        Retrieves a cached name of the given item revision, computing it on first use.
+        form -- 0 for the full display name, 1 for the abbreviated display name.
+        """
+        names = self.display_names.get(item_revision)
+        if names is None:
+            names = [None, None, item_revision.getName()]
+            self.display_names.put(item_revision, names)
+
+        if names[form] is None:
+            names[form] = item_revision.getDisplayName() if form == 0 else item_revision.getAbbreviatedDisplayName()
+
+        return names[form]
 
     def explain_display_name(self, item_revision):
         """
@@ -63,7 +293,7 @@ class ItemService(DseService):
         Returns the abbreviated name of the item revision.
         item_revision -- The item revision for which to get the short name for.
         """
-        return item_revision.getAbbreviatedDisplayName()
+        return self._get_cached_name(item_revision, 1)
 
     def is_possible_to_open(self, workset):
         """
@@ -76,70 +306,172 @@ class ItemService(DseService):
         if workset is None:
             return False
 
-        offending_item_revisions = []
-        for item_revision in workset.get_editable_item_revisions():
-            if is_item_opened(item_revision):
-                offending_item_revisions.append((item_revision, "Already open in " + get_workset_item_is_opened_in(item_revision)))
-            elif (item_revision.getCpdState() in (CpdStateEnum.Completed, CpdStateEnum.Withdrawn)) or ((item_revision.getCpdState() == CpdStateEnum.CheckedOut) and (item_revision.getOwner() != self.framework_service.aces_session.getCurrentUserName())):
-                offending_item_revisions.append((item_revision, "Not in a state that can be made editable (" + str(item_revision.getCpdState()) + ")"))
+        # opening a workset an item revision is open in elsewhere must be ruled out, so the opened, state and owner
+        # columns of the snapshot are re-read before deciding
+        snapshot = self.get_state_snapshot(workset, True)
+        reasons = {}
+        for index in snapshot.select(editable=True, opened=True):
+            reasons[index] = "Already open in " + get_workset_item_is_opened_in(snapshot.item_revisions[index])
+
+        not_editable = snapshot.select(editable=True, opened=False, states=(CpdStateEnum.Completed, CpdStateEnum.Withdrawn))
+        not_editable += snapshot.select(editable=True, opened=False, states=(CpdStateEnum.CheckedOut,), exclude_owners=(snapshot.user_name,))
+        for index in not_editable:
+            reasons[index] = "Not in a state that can be made editable (" + str(snapshot.states[index]) + ")"
 
-        if len(offending_item_revisions) == 0:
+        if len(reasons) == 0:
             return (True, None)
 
-        return (False, offending_item_revisions)
+        return (False, [(snapshot.item_revisions[index], reasons[index]) for index in sorted(reasons)])
+
+    def get_state_snapshot(self, workset, refresh=False):
+        """
+        Retrieves the snapshot of the CPD state, owner, opened flag and item type of the item revisions of the given workset.
+        A snapshot is reused as is while the workset holds the same editable and non-editable item revisions and no state
+        changed through this service since it was taken.  If a state changed, only the state, owner and opened columns
+        are re-read, the snapshot is built again only if the item revisions of the workset changed.  Changes made
+        elsewhere (opening or closing worksets, CPD operations of other clients) aren't seen, call
+        invalidate_state_snapshots for them or pass refresh when the result decides on an operation.
+        workset -- The workset to retrieve the snapshot for.
+        refresh -- True to re-read the state, owner and opened columns of a cached snapshot in any case, False otherwise.
+        returns -- An ItemStateSnapshot instance, the editable column tells the editable item revisions of the workset.
+        """
+        editable_item_revisions = list(workset.get_editable_item_revisions())
+        non_editable_item_revisions = list(workset.get_non_editable_item_revisions())
+        keys = (frozenset(editable_item_revisions), frozenset(non_editable_item_revisions))
+        with self.state_snapshot_lock:
+            cached = self.state_snapshots.get(workset)
+            if (not refresh) and (cached is not None) and (cached[0] == self.state_generation) and (cached[1] == keys):
+                return cached[2]
+            generation = self.state_generation
+
+        user_name = self.framework_service.aces_session.getCurrentUserName()
+        if (cached is not None) and (cached[1] == keys):
+            snapshot = cached[2]
+            snapshot.refresh(is_item_opened, user_name)
+        else:
+            snapshot = ItemStateSnapshot(editable_item_revisions + non_editable_item_revisions,
+                                         [True] * len(editable_item_revisions) + [False] * len(non_editable_item_revisions),
+                                         is_item_opened, user_name)
+        with self.state_snapshot_lock:
+            # taken with the generation read before, so a state changing meanwhile makes it stale right away
+            self.state_snapshots[workset] = (generation, keys, snapshot)
+
+        return snapshot
+
+    def invalidate_state_snapshots(self, item_revision=None):
+        """
+        Marks the state snapshots as stale after the given item revision was opened or closed in a workset or its state
+        changed, their state, owner and opened columns are re-read the next time they are retrieved.
+        item_revision -- The item revision whose state changed, None for all item revisions.
+        note: all snapshots are marked, re-reading the columns of the others as well is cheap compared to tracking them.
+        """
+        with self.state_snapshot_lock:
+            self.state_generation += 1
+
+    def _drop_state_snapshots(self, item_revision=None, workset=None):
+        """
+        Drops the state snapshots holding the given deleted item revision and the one of the given deleted workset, so
+        the cache doesn't keep them alive.
+        """
+        with self.state_snapshot_lock:
+            self.state_snapshots.pop(workset, None)
+            for cached_workset, (_generation, _keys, snapshot) in list(self.state_snapshots.items()):
+                if (item_revision is not None) and snapshot.contains(item_revision):
+                    del self.state_snapshots[cached_workset]
+
+    def _item_state_changed(self, item_revision):
+        """
+        Invoked after the CPD state of an item revision was changed by this service.
+        """
+        self._invalidate_item_state(item_revision)
+        self.state_changed.emit(item_revision)
+
+    def _invalidate_item_state(self, item_revision):
+        """
+        Drops the cached information depending on the CPD state of the given item revision, including the workset
+        dependencies derived from its references, which a check-out or revision may have replaced.
+        """
+        self.invalidate_state_snapshots(item_revision)
+        self.folder_summaries.invalidate_item(item_revision)
+        self.invalidate_workset_dependencies(item_revision)
 
     def collect_variant_containers_with_parents(self, structure_item):
-        print('should traverse', structure_item)
+        """
+        Yields the variant containers referenced by the given structure item, descending into referenced structure items.
+        structure_item -- The structure item to start from.
+        returns -- A generator of tuples (variant container, None).
+        """
+        # depth first, with an explicit stack of the structure items whose references are being looked at
+        stack = [self._iter_structure_children(structure_item)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif child.getItemType() == ItemTypeEnum.Structure:
+                stack.append(self._iter_structure_children(child))
+            elif child.getItemType() == ItemTypeEnum.Variant:
+                yield child, None
 
-        # see if it has any references
+    def _iter_structure_children(self, structure_item):
+        """
+        Yields the item revisions referenced by the given structure item, skipping unset references.
+        """
         for tag_name in structure_item.getReferenceTagNames():
             if structure_item.getReferenceDefinition(tag_name).isArray():
                 for _key, child in list(structure_item.getReferencesMap(tag_name).items()):
-                    if child and child.getItemType() == ItemTypeEnum.Structure:
-                        print('structure child', child)
-                        for tmp in self.collect_variant_containers_with_parents(child):
-                            yield tmp
-                    elif child and child.getItemType() == ItemTypeEnum.Variant:
-                        print('variant child', child)
-                        yield child, None
+                    if child:
+                        yield child
             else:
                 child = structure_item.getReference(tag_name)
-                if child and child.getItemType() == ItemTypeEnum.Structure:
-                    print('structure child', child)
-                    for tmp in self.collect_variant_containers_with_parents(child):
-                        yield tmp
-                elif child and child.getItemType() == ItemTypeEnum.Variant:
-                    print('variant child', child)
-                    yield child, None
+                if child:
+                    yield child
 
-    def collect_item_revisions_with_parents(self, folder, recurse=True):
+    def iter_folders(self, folder, max_depth=None):
         """
-        Collects the item revisions from the given folder.
-        folder -- The folder to collect the item revisions from.
-        recurse -- True to gather from the sub folders as well, False otherwise.
-        returns -- A list of tuples (item_revision, parent_folder).
+        Yields the given folder and its sub folders, depth first in the order of the folders.
+        Stop consuming the generator to stop the walk.
+        folder -- The folder to start from.
+        max_depth -- The number of sub folder levels to descend, 0 for the folder itself only, None for all levels.
+        returns -- A generator of tuples (folder, depth).
         """
-        results = []
+        stack = [(folder, 0)]
+        while stack:
+            current_folder, depth = stack.pop()
+            yield current_folder, depth
 
-        self._collect_item_revisions_with_parents(folder, results, recurse)
+            if isinstance(current_folder, WorkspaceFolder) and ((max_depth is None) or (depth < max_depth)):
+                stack.extend((sub_folder, depth + 1) for sub_folder in reversed(current_folder.sub_folders))
 
-        return results
+    def iter_item_revisions_with_parents(self, folder, max_depth=None):
+        """
+        Yields the item revisions of the given folder and its sub folders, without building a list of the whole tree.
+        folder -- The folder to collect the item revisions from.
+        max_depth -- The number of sub folder levels to descend, 0 for the folder itself only, None for all levels.
+        returns -- A generator of tuples (item_revision, parent_folder).
+        """
+        for current_folder, _depth in self.iter_folders(folder, max_depth):
+            for item_revision in current_folder.contained_item_revisions:
+                yield item_revision, current_folder
 
-    def _collect_item_revisions_with_parents(self, folder, results, recurse):
+    def iter_item_revisions(self, folder, max_depth=None):
         """
-        Collects the item revisions from the given folder and puts them in the list defined by results.
+        Yields the item revisions of the given folder and its sub folders, without building a list of the whole tree.
+        folder -- The folder to collect the item revisions from.
+        max_depth -- The number of sub folder levels to descend, 0 for the folder itself only, None for all levels.
+        returns -- A generator of item revisions.
+        """
+        for current_folder, _depth in self.iter_folders(folder, max_depth):
+            for item_revision in current_folder.contained_item_revisions:
+                yield item_revision
+
+    def collect_item_revisions_with_parents(self, folder, recurse=True):
+        """
+        Collects the item revisions from the given folder.
         folder -- The folder to collect the item revisions from.
-        results -- The list to add the results to.
         recurse -- True to gather from the sub folders as well, False otherwise.
         returns -- A list of tuples (item_revision, parent_folder).
         """
-        for item_revision in folder.contained_item_revisions:
-            results.append((item_revision, folder))
-
-        # now do the sub folders
-        if isinstance(folder, WorkspaceFolder) and recurse:
-            for sub_folder in folder.sub_folders:
-                self._collect_item_revisions_with_parents(sub_folder, results, recurse)
+        return list(self.iter_item_revisions_with_parents(folder, None if recurse else 0))
 
     def collect_item_revisions(self, folder, recurse=True):
         """
@@ -148,26 +480,17 @@ class ItemService(DseService):
         recurse -- True to gather from the sub folders as well, False otherwise.
         returns -- A list of item revisions.
         """
-        results = []
+        return list(self.iter_item_revisions(folder, None if recurse else 0))
 
-        self._collect_item_revisions(folder, results, recurse)
-
-        return results
-
-    def _collect_item_revisions(self, folder, results, recurse=True):
+    def get_folder_summary(self, folder, max_depth=None):
         """
-        Collects the item revisions from the given folder and puts them in the list defined by results.
-        folder -- The folder to collect the item revisions from.
-        results -- The list to add the item revisions to.
-        recurse -- True to gather from the sub folders as well, False otherwise.
+        Retrieves the number of item revisions and the histogram of their CPD states for the given folder tree.
+        The statistics are cached per folder and only re-read for folders whose entries or item revision states changed.
+        folder -- The root of the folder tree.
+        max_depth -- The number of sub folder levels to include, 0 for the folder itself only, None for all levels.
+        returns -- A FolderSummary instance with item_count, folder_count and state_histogram, which must not be modified.
         """
-        # gather the item revisions in the folder itself
-        results.extend(folder.contained_item_revisions)
-
-        # now do the sub folders
-        if isinstance(folder, WorkspaceFolder) and recurse:
-            for sub_folder in folder.sub_folders:
-                self._collect_item_revisions(sub_folder, results, recurse)
+        return self.folder_summaries.get_summary(folder, max_depth)
 
     def can_delete_item_revision(self, item_revision):
         """
@@ -188,7 +511,17 @@ class ItemService(DseService):
         if item_revision is None:
             return
 
+        unit = self.get_unit_of_work()
+        if unit is not None:
+            unit.take_dirty(item_revision)
+
         self.lws_manager.delete_item(item_revision)
+        self.loaded_item_revisions.pop(item_revision, None)
+        self._drop_state_snapshots(item_revision)
+        self.folder_summaries.remove_item(item_revision)
+        self.invalidate_workset_dependencies(item_revision)
+        self.invalidate_display_names(item_revision)
+        self.item_deleted.emit(item_revision)
 
     def delete_folder(self, folder, parent_folder):
         """
@@ -198,8 +531,8 @@ class ItemService(DseService):
         parent_folder -- The parent folder of the folder being deleted.
         """
         # remove the item revision links
-        for item_revision in folder.contained_item_revisions:
-            folder.remove_item_revision(item_revision)
+        for item_revision in list(folder.contained_item_revisions):
+            self.remove_item_revision_from_folder(folder, item_revision)
 
         # now do the same thing for each sub-folder
         for sub_folder in folder.sub_folders:
@@ -210,6 +543,7 @@ class ItemService(DseService):
 
         # now remove the folder
         parent_folder.remove_folder(folder)
+        self._folder_removed(parent_folder, folder)
 
     def delete_workset(self, workset, parent_folder):
         """
@@ -218,11 +552,12 @@ class ItemService(DseService):
         parent_folder -- The parent folder of the workset being deleted.
         """
         # remove the item revision links
-        for item_revision in workset.contained_item_revisions:
-            workset.remove_item_revision(item_revision)
+        for item_revision in list(workset.contained_item_revisions):
+            self.remove_item_revision_from_folder(workset, item_revision)
 
         # remove the workset
         parent_folder.remove_folder(workset)
+        self._folder_removed(parent_folder, workset)
 
     def create_item(self, item_type_definition, name, attributes={}, references={}, close_after=False):
         """
@@ -236,7 +571,12 @@ class ItemService(DseService):
         returns -- The first revision of the newly created item.
         """
         new_item_revision = self.framework_service.aces_session.createItem(item_type_definition, name, attributes, references)
-        self.lws_manager.save_single_item(new_item_revision, close_after)
+        unit = self.get_unit_of_work()
+        if unit is not None:
+            unit.mark_created(new_item_revision)
+        self.save_item(new_item_revision, close_after)
+        self.loaded_item_revisions[new_item_revision] = None
+        self.item_created.emit(new_item_revision)
 
         return new_item_revision
 
@@ -247,7 +587,27 @@ class ItemService(DseService):
         item_revision -- The revision of the item to resolve.
         returns -- An AcesItemRevision representing the resolved item revision.
         """
-        return self.lws_manager.load_item_revision(item_id, item_revision)
+        resolved_item_revision = self.lws_manager.load_item_revision(item_id, item_revision)
+        if resolved_item_revision is not None:
+            self._record_item_loaded(resolved_item_revision)
+
+        return resolved_item_revision
+
+    def get_loaded_item_revisions(self):
+        """
+        Retrieves the item revisions loaded (see resolve_item), created, copied or revised through this service in this
+        session and not deleted since, in the order they were first seen.
+        returns -- A list of item revisions.
+        """
+        return list(self.loaded_item_revisions)
+
+    def _record_item_loaded(self, item_revision):
+        """
+        Records an existing item revision loaded through this service, raising item_loaded the first time.
+        """
+        if item_revision not in self.loaded_item_revisions:
+            self.loaded_item_revisions[item_revision] = None
+            self.item_loaded.emit(item_revision)
 
     def add_items_to_cpd(self, item_revisions, projects):
         """
@@ -261,47 +621,130 @@ class ItemService(DseService):
         returns -- A list of strings describing errors that occurred during the add.
         """
         errors = []
+        for result in self.add_items_to_cpd_batch(item_revisions, projects):
+            if not result.succeeded:
+                if result.traceback is not None:
+                    # TODO: this logic should go into the feedback service itself
+                    sys.stderr.write(result.traceback)
+                errors.append(result.error)
+
+        return errors
+
+    def add_items_to_cpd_batch(self, item_revisions, projects, progress=None):
+        """
+        Adds the specified set of item revisions to the CPD system, reporting the outcome per item revision.
+        Each item revision is opened, added, saved and checked in after the Local item revisions of the set it
+        references have been checked in, an item revision referencing one that failed is skipped.
+        Duplicate item revisions are added once.
+        note: the item revisions are added one after the other, the LWS manager isn't thread-safe and every step of
+        the add is a call into it, so there is nothing to run side by side.
+        item_revisions -- A list of item revisions that will be added to CPD, see add_items_to_cpd.
+        projects -- A list of projects that the item revisions will be added to.
+        progress -- A callable (finished count, total count, result) invoked after each item revision, the cpd_progress signal is raised as well.
+        returns -- A list of BatchItemResult instances in the order of the given item revisions.
+        """
         # ensure the item revision isn't null and is in the state local
         if item_revisions is None:
             raise ValueError("Expected valid list of item revision instances!")
 
-        for i, item_revision in enumerate(item_revisions):
-            # TODO: figure out how to use the feedback service for this
-            print(i + 1, '/', len(item_revisions), item_revision.getName())
-
+        for item_revision in item_revisions:
             if item_revision.getCpdState() != CpdStateEnum.Local:
                 raise ValueError("Only item revisions in the state \'Local\' can be added to the CPD system!")
 
+        def add_item(item_revision, result):
+            result.stage = "open"
+            if not item_revision.isEditable():
+                self.lws_manager.open_item(item_revision)
+
             # add the item to CPD
-            try:
-                if not item_revision.isEditable():
-                    self.lws_manager.open_item(item_revision)
+            result.stage = "add"
+            self.lws_manager.add_item(item_revision, projects)
+            result.stage = "save"
+            self.lws_manager.save_single_item(item_revision)
 
-                self.lws_manager.add_item(item_revision, projects)
-                self.lws_manager.save_single_item(item_revision)
-            except Exception as e:
-                # TODO: this logic should go into the feedback service itself
-                sys.stderr.write(''.join(
-                    traceback.format_stack()[:-1] +
-                    traceback.format_exception(*sys.exc_info())[1:]
-                ))
-                errors.append(str(e))
+            # check-in the item to complete the add, this will add the meta-data, data objects, and attachments
+            result.stage = "checkin"
+            self.lws_manager.checkin_item(item_revision)
+
+        return run_batch(item_revisions, add_item, self._get_reference_dependencies(item_revisions),
+                         self._get_batch_progress(progress))
+
+    def _get_reference_dependencies(self, item_revisions):
+        """
+        Determines which of the given item revisions directly reference each other.
+        A reference closing a cycle is left out, so the result can be used to order the item revisions.
+        item_revisions -- A list of item revisions.
+        returns -- A dictionary {item revision: [item revisions]} of the item revisions of the set each item revision references.
+        """
+        item_revision_set = set(item_revisions)
+        dependencies = {}
+
+        # depth first walk, an item revision is "done" once all item revisions it references are
+        visiting = set()
+        done = set()
+        for root_item_revision in item_revisions:
+            if root_item_revision in done:
+                continue
+
+            visiting.add(root_item_revision)
+            stack = [(root_item_revision, self._iter_direct_references(root_item_revision))]
+            while stack:
+                item_revision, references = stack[-1]
+                referenced_item_revision = next(references, None)
+                if referenced_item_revision is None:
+                    stack.pop()
+                    visiting.discard(item_revision)
+                    done.add(item_revision)
+                    continue
+
+                if (referenced_item_revision not in item_revision_set) or (referenced_item_revision in visiting):
+                    # either not part of the set or the reference closes a cycle
+                    continue
+
+                dependencies.setdefault(item_revision, []).append(referenced_item_revision)
+                if referenced_item_revision in done:
+                    continue
+
+                visiting.add(referenced_item_revision)
+                stack.append((referenced_item_revision, self._iter_direct_references(referenced_item_revision)))
+
+        return dependencies
+
+    def _get_batch_progress(self, progress):
+        """
+        Creates the progress callback of a batch operation raising the cpd_progress signal.
+        The callback also does the bookkeeping of the item revisions whose state the operation changed.
+        progress -- An additional callable (finished count, total count, result) to invoke, or None.
+        """
+        def report_progress(finished_count, total_count, result):
+            if result.succeeded:
+                self._item_state_changed(result.item_revision)
+            elif result.attempts:
+                # a failed operation may have changed the state part of the way
+                self._invalidate_item_state(result.item_revision)
+            self.cpd_progress.emit(finished_count, total_count, result)
+            if progress is not None:
+                progress(finished_count, total_count, result)
 
-        # now that item revisions have been created we can check them all in to complete the add
-        # this will add the meta-data, data objects, and attachments
+        return report_progress
+
+    def collect_items_for_cpd(self, item_revisions):
+        """
+        Collects the given item revisions together with all the Local item revisions they reference (recursively),
+        which is the list add_items_to_cpd expects.
+        item_revisions -- A list of item revisions that should be added to CPD.
+        returns -- A list of item revisions without duplicates, the given ones first.
+        """
+        results = []
+        visited = set()
         for item_revision in item_revisions:
-            # check-in the item
-            try:
-                self.lws_manager.checkin_item(item_revision)
-            except Exception as e:
-                # TODO: this logic should go into the feedback service itself
-                sys.stderr.write(''.join(
-                    traceback.format_stack()[:-1] +
-                    traceback.format_exception(*sys.exc_info())[1:]
-                ))
-                errors.append(str(e))
+            if item_revision not in visited:
+                visited.add(item_revision)
+                results.append(item_revision)
+        for item_revision in item_revisions:
+            results.extend(self.iter_references(item_revision, (CpdStateEnum.Local,), True, visited))
 
-        return errors
+        return results
 
     def checkout_item(self, item_revision):
         """
@@ -309,14 +752,22 @@ class ItemService(DseService):
         item_revision -- The item revision to check out.
         """
         self.lws_manager.checkout_item(item_revision)
+        self._item_state_changed(item_revision)
 
     def checkin_item(self, item_revision):
         """
         Checks the item revision into the CPD system.
         item_revision -- The item revision to check in.
         """
-        self.lws_manager.save_single_item(item_revision)
+        # the check-in needs the item revision saved, so a pending save of the unit of work is done now
+        unit = self.get_unit_of_work()
+        pending = unit.take_dirty(item_revision) if unit is not None else None
+        if (pending is not None) and (pending[1] is not None):
+            self.lws_manager.save_single_item(item_revision, pending[1])
+        else:
+            self.lws_manager.save_single_item(item_revision)
         self.lws_manager.checkin_item(item_revision)
+        self._item_state_changed(item_revision)
 
     def revise_item(self, item_revision):
         """
@@ -330,6 +781,9 @@ class ItemService(DseService):
                 raise ValueError("Only item revisions in the state \'Completed\' can be revised in the CPD system!")
 
             new_revision = self.lws_manager.revise_item(item_revision)
+            self._item_state_changed(item_revision)
+            if new_revision is not None:
+                self._record_item_loaded(new_revision)
 
         return new_revision
 
@@ -339,6 +793,7 @@ class ItemService(DseService):
         item_revision -- The item revision to withdraw.
         """
         self.lws_manager.withdraw_item(item_revision)
+        self._item_state_changed(item_revision)
 
     def complete_items(self, item_revisions):
         """
@@ -357,11 +812,53 @@ class ItemService(DseService):
 
             try:
                 self.lws_manager.complete_item(item_revision)
+                self._item_state_changed(item_revision)
             except Exception as e:
+                # a failed completion may have changed the state part of the way
+                self._invalidate_item_state(item_revision)
                 errors.append(str(e))
 
         return errors
 
+    def complete_items_batch(self, item_revisions, retries=2, progress=None):
+        """
+        Completes the given item revisions in the CPD system, reporting the outcome per item revision.
+        Unlike complete_items, all item revisions are validated up front, those in the wrong state or owned by someone
+        else are reported as failed and the others are completed regardless.  Duplicate item revisions are completed once.
+        note: the item revisions are completed one after the other, the LWS manager isn't thread-safe.
+        item_revisions -- A list of item revisions to complete.
+        retries -- The number of times a completion failing with a transient error (e.g. a lost connection) is retried.
+        progress -- A callable (finished count, total count, result) invoked after each completion, the cpd_progress signal is raised as well.
+        returns -- A list of BatchItemResult instances in the order of the given item revisions.
+        """
+        # ensure the item revision isn't null
+        if item_revisions is None:
+            raise ValueError("Expected valid list of item revision instances!")
+
+        # validate everything against one snapshot of the states and the user
+        cpd_user = self.lws_manager.sys_settings['cpd_user']
+        snapshot = [(item_revision, item_revision.getCpdState(), item_revision.getOwner()) for item_revision in item_revisions]
+        completable_item_revisions = [item_revision for item_revision, cpd_state, owner in snapshot
+                                      if (cpd_state == CpdStateEnum.InPreparation) and (owner == cpd_user)]
+
+        def complete_item(item_revision, result):
+            result.stage = "complete"
+            self.lws_manager.complete_item(item_revision)
+
+        completed = run_batch(completable_item_revisions, complete_item, None, self._get_batch_progress(progress), retries)
+        completed_by_item = dict((result.item_revision, result) for result in completed)
+
+        results = []
+        for item_revision, _cpd_state, _owner in snapshot:
+            result = completed_by_item.get(item_revision)
+            if result is None:
+                result = BatchItemResult(item_revision)
+                result.stage = "validate"
+                result.error = "Only item revisions in the state \'InPreparation\' and owned by you can be completed in the CPD system!"
+            results.append(result)
+
+        return results
+
     def get_indirect_references(self, item_revision, tag):
         """
         Retrieves the reference defined by tag from the base item revision.
@@ -370,24 +867,19 @@ class ItemService(DseService):
         returns -- A list of item revisions, of length one in the case of a non-array query containing all item revisions in an array query.
         """
         # TODO: the name of this method is wrong - it should just be get_references and the method should determine if it's direct or indirect
-        tag_elements = tag.split('.')
-        base_item_revision = item_revision
-        refs = []
-        for tag_element in tag_elements:
-            if base_item_revision.getDefinition().getReferenceDefinitionByTag(tag_element).isArray():
-                # note: this only works if the array reference is last in the dot notation query
-                # we have no support for intermediate array queries
-                for key in base_item_revision.getReferenceKeys(tag_element):
-                    refs.append(base_item_revision.getReference(tag_element, key))
-            else:
-                base_item_revision = base_item_revision.getReference(tag_element)
-                if base_item_revision is None:
-                    # can't go any further in the recursion
-                    return []
+        return self.tag_path_resolver.resolve_references(item_revision, tag)
 
-        # if we recursed down and got a final reference, add it to the inputs
-        refs.append(base_item_revision)
-        return refs
+    def get_indirect_references_batch(self, item_revisions, tag, visited=None):
+        """
+        Retrieves the reference defined by tag from each of the given base item revisions.
+        Intermediate item revisions shared by the paths are only resolved once, which is what makes rendering a
+        column of a large workset cheap.
+        item_revisions -- The item revisions that are the source for the references to retrieve.
+        tag -- A string defining the tag path of the references to retrieve, either direct (i.e. single tag) or indirect (i.e. dot notation tag).
+        visited -- A set to which the item revisions whose references were looked at are added, or None.
+        returns -- A list holding the result of get_indirect_references for each of the given item revisions, in the same order.
+        """
+        return self.tag_path_resolver.resolve_references_batch(item_revisions, tag, visited)
 
     def get_indirect_reference_definition(self, item_revision, tag):
         """
@@ -396,17 +888,11 @@ class ItemService(DseService):
         tag -- A string defining the tag path of the references to retrieve, either direct (i.e. single tag) or indirect (i.e. dot notation tag).
         returns -- A reference definition for the given reference.
         """
-        tag_elements = tag.split('.')
-        base_item_revision = item_revision
-        for i in range(0, len(tag_elements) - 1):
-            base_item_revision = base_item_revision.getReference(tag_elements[i])
-            if base_item_revision is None:
-                break
-
+        base_item_revision = self.tag_path_resolver.resolve_parent(item_revision, tag)
         if base_item_revision is None:
             return None
 
-        return base_item_revision.getReferenceDefinition(tag_elements[-1])
+        return base_item_revision.getReferenceDefinition(self.tag_path_resolver.compile(tag).leaf)
 
     def set_indirect_reference(self, source_item_revision, tag, target_item_revision):
         """
@@ -415,17 +901,12 @@ class ItemService(DseService):
         tag -- The tag defining the reference to be set.  The tag may be a direct or indirect.
         target_item_revision -- The target item revision to set as the referenced item revision.
         """
-        tag_elements = tag.split('.')
-        base_item_revision = source_item_revision
-        for i in range(0, len(tag_elements) - 1):
-            base_item_revision = base_item_revision.getReference(tag_elements[i])
-            if base_item_revision is None:
-                break
-
+        base_item_revision = self.tag_path_resolver.resolve_parent(source_item_revision, tag)
         if base_item_revision is None:
             raise RuntimeError("Could not set reference on null item revision!")
 
-        base_item_revision.setReference(tag_elements[-1], target_item_revision)
+        base_item_revision.setReference(self.tag_path_resolver.compile(tag).leaf, target_item_revision)
+        self._item_references_changed(base_item_revision)
 
     def create_task_output(self, base_item_revision, tag, parent_folder):
         """
@@ -458,40 +939,87 @@ class ItemService(DseService):
         created_item_revisions = []
 
         # look up the tool definition to find out what outputs we have to create
-        # the references come back as a list of tuples (tag, ToolIOReference)
-        tool_references = tool_definition.get_references()
-        for (tag, tool_reference) in tool_references:
-            if tool_reference == ToolIOReference.Output:
-                # check whether a reference is already set on the item or not
-                # for Output types, the system will always create one, but we check whether this is a situation where that output
-                # has been previously created (i.e. create scenario vs. launch tool scenario)
-                # it may also be the case here that the reference is a dot notation reference, so we have to keep this in mind when getting the reference
-                referenced_item_revisions = self.get_indirect_references(base_item_revision, tag)
-                if not referenced_item_revisions:
-                    # get the item reference definition so we know the type
-                    reference_definition = self.get_indirect_reference_definition(base_item_revision, tag)
-
-                    # create the output item
-                    output_item_attributes = self.derive_output_attributes(reference_definition.getItemDefinition(), base_item_revision)
-                    output_item_revision = self.create_item(reference_definition.getItemDefinition(), self.get_unique_item_name(reference_definition.getItemDefinition(), parent_folder), output_item_attributes, None)
-
-                    # set the reference to the output item
-                    self.set_indirect_reference(base_item_revision, tag, output_item_revision)
-                    created_item_revisions.append(output_item_revision)
+        # usually this is the default tool, which we have classified already
+        tool_reference_tags = self.get_tool_reference_tags(base_item_revision.getDefinition().getName())
+        if (tool_reference_tags is None) or (tool_reference_tags.tool_definition is not tool_definition):
+            tool_reference_tags = ToolReferenceTags(tool_definition)
+
+        # the meta data values of the base item revision are read once for all outputs
+        base_values = {}
+        for tag in tool_reference_tags.output_tags:
+            # check whether a reference is already set on the item or not
+            # for Output types, the system will always create one, but we check whether this is a situation where that output
+            # has been previously created (i.e. create scenario vs. launch tool scenario)
+            # it may also be the case here that the reference is a dot notation reference, so we have to keep this in mind when getting the reference
+            referenced_item_revisions = self.get_indirect_references(base_item_revision, tag)
+            if not referenced_item_revisions:
+                # get the item reference definition so we know the type
+                reference_definition = self.get_indirect_reference_definition(base_item_revision, tag)
+
+                # create the output item
+                output_item_attributes = self.derive_output_attributes(reference_definition.getItemDefinition(), base_item_revision, base_values)
+                output_item_revision = self.create_item(reference_definition.getItemDefinition(), self.get_unique_item_name(reference_definition.getItemDefinition(), parent_folder), output_item_attributes, None)
+
+                # set the reference to the output item
+                self.set_indirect_reference(base_item_revision, tag, output_item_revision)
+                created_item_revisions.append(output_item_revision)
 
         return created_item_revisions
 
     def calculate_workset_dependencies(self, base_item_revision):
         """
         Determines what the work and supporting items should be for the given base item revision.
+        The result is kept until references it was derived from change through this service, the CPD state of one of
+        those item revisions changes (a check-out or revision may bring other references), the tool definitions are
+        reloaded or it is one of the WORKSET_DEPENDENCY_CACHE_SIZE least recently used results.  Code changing
+        references otherwise, e.g. reloading item revisions from the workspace, must call invalidate_workset_dependencies.
         base_item_revision -- The item revision to calculate the workset dependencies for.
         returns -- A 2-tuple of lists, the first for work items and the second for supporting items.
         """
         if base_item_revision is None:
             raise ValueError("Unable to calculate workset dependencies for a null base item revision!")
 
-        work_items = []
-        supporting_items = []
+        return self.calculate_workset_dependencies_batch([base_item_revision])[0]
+
+    def calculate_workset_dependencies_batch(self, base_item_revisions):
+        """
+        Determines what the work and supporting items should be for each of the given base item revisions.
+        Base item revisions of the same type are resolved together, so item revisions they share (e.g. a common task)
+        are only looked at once.
+        base_item_revisions -- The item revisions to calculate the workset dependencies for.
+        returns -- A list of 2-tuples of lists as returned by calculate_workset_dependencies, in the order of the given item revisions.
+        """
+        # group the base item revisions not calculated yet by type, they share the tool definition
+        dependencies = {}
+        groups = OrderedDict()
+        for base_item_revision in base_item_revisions:
+            cached = self.workset_dependencies.get(base_item_revision)
+            if cached is not None:
+                dependencies[base_item_revision] = cached
+            else:
+                group = groups.setdefault(base_item_revision.getDefinition().getName(), OrderedDict())
+                group[base_item_revision] = None
+
+        for item_definition_name, group in groups.items():
+            dependencies.update(self._calculate_workset_dependencies(item_definition_name, list(group)))
+
+        results = []
+        for base_item_revision in base_item_revisions:
+            work_items, supporting_items, _sources = dependencies[base_item_revision]
+            results.append((list(work_items), list(supporting_items)))
+
+        return results
+
+    def _calculate_workset_dependencies(self, item_definition_name, base_item_revisions):
+        """
+        Calculates and stores the workset dependencies of base item revisions of the same type.
+        item_definition_name -- The name of the item definition of the base item revisions.
+        base_item_revisions -- The base item revisions, without duplicates.
+        returns -- A dictionary {base item revision: (work items, supporting items, item revisions looked at)}.
+        """
+        work_items = [[] for _base_item_revision in base_item_revisions]
+        supporting_items = [[] for _base_item_revision in base_item_revisions]
+        visited = set()
 
         # get the default tool definition for the given base item revision
         # the tool definition states the inputs, outputs, and tasks
@@ -499,33 +1027,76 @@ class ItemService(DseService):
         # 1. an "input" reference is always a supporting item
         # 2. an "output" reference is always a work item
         # 3. a "task" reference is a work item if it's edit attribute is set to "true", otherwise it's a supporting item
-        default_tool_definition = self.tool_service.get_default_tool_definition(base_item_revision.getDefinition().getName())
-        io_references = default_tool_definition.get_references()
-        for tag, tool_io_reference in io_references:
-            refs = self.get_indirect_references(base_item_revision, tag)
-            if refs:
-                if (tool_io_reference == ToolIOReference.Input) or (tool_io_reference == ToolIOReference.OptionalInput):
-                    supporting_items.extend(refs)
-                else:
-                    work_items.extend(refs)
+        tool_reference_tags = self.get_tool_reference_tags(item_definition_name)
+        for tag, supporting in tool_reference_tags.workset_tags:
+            for index, refs in enumerate(self.get_indirect_references_batch(base_item_revisions, tag, visited)):
+                if refs:
+                    if supporting:
+                        supporting_items[index].extend(refs)
+                    else:
+                        work_items[index].extend(refs)
 
         # all input and output items have been gathered, now we do the task items
-        for task in default_tool_definition.get_tasks():
+        for task in tool_reference_tags.tool_definition.get_tasks():
             for task_tag in task.get_tags():
-                refs = self.get_indirect_references(base_item_revision, task_tag.get_tag())
-                if refs:
-                    if task_tag.is_editable():
-                        work_items.extend(refs)
-                    else:
-                        supporting_items.extend(refs)
+                for index, refs in enumerate(self.get_indirect_references_batch(base_item_revisions, task_tag.get_tag(), visited)):
+                    if refs:
+                        if task_tag.is_editable():
+                            work_items[index].extend(refs)
+                        else:
+                            supporting_items[index].extend(refs)
+
+        # the whole group is dropped as soon as any of the references looked at changes
+        sources = frozenset(visited)
+        dependencies = {}
+        for index, base_item_revision in enumerate(base_item_revisions):
+            # we have all the "direct" dependencies
+            # the last thing to check is if an item appears in both, then we can remove the reference in the supporting items
+            for work_item in work_items[index]:
+                if work_item in supporting_items[index]:
+                    supporting_items[index].remove(work_item)
+
+            dependencies[base_item_revision] = (work_items[index], supporting_items[index], sources)
+            for item_revision in sources:
+                self.workset_dependency_sources.setdefault(item_revision, set()).add(base_item_revision)
+            self.workset_dependencies.put(base_item_revision, dependencies[base_item_revision])
+
+        return dependencies
+
+    def invalidate_workset_dependencies(self, item_revision=None):
+        """
+        Drops the workset dependencies derived from the references of the given item revision.
+        item_revision -- The item revision whose references changed, None to drop all workset dependencies.
+        """
+        if item_revision is None:
+            self.workset_dependencies.clear()
+            self.workset_dependency_sources.clear()
+            return
 
-        # we have all the "direct" dependencies
-        # the last thing to check is if an item appears in both, then we can remove the reference in the supporting items
-        for work_item in work_items:
-            if work_item in supporting_items:
-                supporting_items.remove(work_item)
+        for base_item_revision in list(self.workset_dependency_sources.get(item_revision, ())):
+            dependencies = self.workset_dependencies.pop(base_item_revision)
+            if dependencies is not None:
+                self._forget_workset_dependency_sources(base_item_revision, dependencies)
+        self.workset_dependency_sources.pop(item_revision, None)
 
-        return (work_items, supporting_items)
+    def _forget_workset_dependency_sources(self, base_item_revision, dependencies):
+        """
+        Forgets the item revisions looked at for the workset dependencies of the given base item revision, after they
+        were dropped from the cache.
+        """
+        for item_revision in dependencies[2]:
+            base_item_revisions = self.workset_dependency_sources.get(item_revision)
+            if base_item_revisions is not None:
+                base_item_revisions.discard(base_item_revision)
+                if not base_item_revisions:
+                    del self.workset_dependency_sources[item_revision]
+
+    def _item_references_changed(self, item_revision):
+        """
+        Invoked after references of an item revision were set or removed by this service.
+        """
+        self.invalidate_workset_dependencies(item_revision)
+        self.references_changed.emit(item_revision)
 
     def create_item_and_outputs(self, item_type_definition, tool_definition, parent_folder, name, attributes, references, task_references, close_after=False):
         """
@@ -552,29 +1123,31 @@ class ItemService(DseService):
         # are in a state that they can be edited - otherwise we cannot create the required output references!
         created_item_revisions = []
 
-        # first create the base item
-        base_item_revision = self.create_item(item_type_definition, name, attributes, references)
-        created_item_revisions.append(base_item_revision)
-
-        # now create the outputs
-        created_output_revisions = self.create_outputs(tool_definition, base_item_revision, parent_folder)
-        created_item_revisions.extend(created_output_revisions)
-
-        # finally, for each task the user wants to perform, we need to create those items as well
-        for task in task_references:
-            for tag in task_references[task]:
-                if task_references[task][tag] is None:
-                    # we only want to automatically create an instance of the referenced item if the reference is not an array valued reference
-                    if not self._is_array_reference(base_item_revision, tag):
-                        # if there is no reference set, but the task is selected, we need to create this object
-                        created_item_revisions.append(self.create_task_output(base_item_revision, tag, parent_folder))
-                else:
-                    # they chose one, so make sure we set the reference
-                    self.set_indirect_reference(base_item_revision, tag, task_references[task][tag])
+        # a unit of work saves each new item once at the end and deletes them again if creating one of them fails
+        with self.unit_of_work():
+            # first create the base item
+            base_item_revision = self.create_item(item_type_definition, name, attributes, references)
+            created_item_revisions.append(base_item_revision)
+
+            # now create the outputs
+            created_output_revisions = self.create_outputs(tool_definition, base_item_revision, parent_folder)
+            created_item_revisions.extend(created_output_revisions)
+
+            # finally, for each task the user wants to perform, we need to create those items as well
+            for task in task_references:
+                for tag in task_references[task]:
+                    if task_references[task][tag] is None:
+                        # we only want to automatically create an instance of the referenced item if the reference is not an array valued reference
+                        if not self._is_array_reference(base_item_revision, tag):
+                            # if there is no reference set, but the task is selected, we need to create this object
+                            created_item_revisions.append(self.create_task_output(base_item_revision, tag, parent_folder))
+                    else:
+                        # they chose one, so make sure we set the reference
+                        self.set_indirect_reference(base_item_revision, tag, task_references[task][tag])
 
-        # save the new items after setting all those references
-        for item_revision in created_item_revisions:
-            self.lws_manager.save_single_item(item_revision, close_after)
+            # save the new items once, after setting all those references
+            for item_revision in created_item_revisions:
+                self.save_item(item_revision, close_after)
 
         return created_item_revisions
 
@@ -596,27 +1169,7 @@ class ItemService(DseService):
         returns -- A string defining a unique name within the parent_folder space.
         """
         base_name = item_revision.getName() + "- Copy"
-        name = base_name
-        unique = True
-        for revision in parent_folder.contained_item_revisions:
-            if revision.getName() == name:
-                unique = False
-                break
-
-        current_index = 1
-        new_name = name
-        while not unique:
-            new_name = base_name + " (" + str(current_index) + ")"
-            unique = True
-            for revision in parent_folder.contained_item_revisions:
-                if revision.getName() == new_name:
-                    unique = False
-                    break
-
-            current_index += 1
-
-        return new_name
-
+        return self.get_folder_name_index(parent_folder, False).get_unique_name(base_name, self.ITEM_COPY_NAME_FORMAT)
 
     def get_unique_item_name(self, item_type_definition, parent_folder):
         """
@@ -626,26 +1179,7 @@ class ItemService(DseService):
         returns -- A string defining a unique name within the parent_folder space.
         """
         base_name = item_type_definition.getDisplayName()
-        name = base_name
-        unique = True
-        for item_revision in parent_folder.contained_item_revisions:
-            if item_revision.getName() == name:
-                unique = False
-                break
-
-        current_index = 1
-        new_name = name
-        while not unique:
-            new_name = base_name + str(current_index)
-            unique = True
-            for item_revision in parent_folder.contained_item_revisions:
-                if item_revision.getName() == new_name:
-                    unique = False
-                    break
-
-            current_index += 1
-
-        return new_name
+        return self.get_folder_name_index(parent_folder, False).get_unique_name(base_name, self.ITEM_NAME_FORMAT)
 
     def get_unique_workset_name(self, parent_folder, workset_name=None):
         """
@@ -660,25 +1194,7 @@ class ItemService(DseService):
         else:
             name = "Workset"
 
-        unique = True
-        for folder in parent_folder.sub_folders:
-            if folder.name == name:
-                unique = False
-                break
-
-        current_index = 1
-        new_name = name
-        while not unique:
-            new_name = name + "_" + str(current_index)
-            unique = True
-            for folder in parent_folder.sub_folders:
-                if folder.name == new_name:
-                    unique = False
-                    break
-
-            current_index += 1
-
-        return new_name
+        return self.get_folder_name_index(parent_folder, True).get_unique_name(name, self.WORKSET_NAME_FORMAT)
 
     def get_unique_folder_name(self, parent_folder, source_folder):
         """
@@ -691,25 +1207,123 @@ class ItemService(DseService):
             name = source_folder
         else:
             name = "New Folder"
-        unique = True
-        for folder in parent_folder.sub_folders:
-            if folder.name == name:
-                unique = False
-                break
-
-        current_index = 1
-        new_name = name
-        while not unique:
-            new_name = name + str(current_index)
-            unique = True
-            for folder in parent_folder.sub_folders:
-                if folder.name == new_name:
-                    unique = False
-                    break
-
-            current_index += 1
-
-        return new_name
+
+        return self.get_folder_name_index(parent_folder, True).get_unique_name(name, self.FOLDER_NAME_FORMAT)
+
+    def reserve_unique_names(self, parent_folder, base_name, count, name_format=None, sub_folders=False):
+        """
+        Retrieves and reserves a number of unique names in the designated parent folder at once, for batch creation and pasting.
+        The get_unique_*_name methods don't reserve anything, two calls return the same name until an entry uses it.
+        Reserved names aren't handed out again, neither by this method nor by the get_unique_*_name methods, until the
+        entries using them are added to the folder or release_unique_names is called for the ones that weren't used.
+        parent_folder -- The folder the items or sub-folders will be created in.
+        base_name -- The name to use as the basis for the new unique names.
+        count -- The number of names to reserve.
+        name_format -- The format appending the suffix to the base name, ITEM_NAME_FORMAT or FOLDER_NAME_FORMAT if None.
+        sub_folders -- True if the names are for sub-folders or worksets, False if they are for item revisions.
+        returns -- A list of strings defining unique names within the parent_folder space.
+        """
+        if name_format is None:
+            name_format = self.FOLDER_NAME_FORMAT if sub_folders else self.ITEM_NAME_FORMAT
+
+        return self.get_folder_name_index(parent_folder, sub_folders).reserve_unique_names(base_name, count, name_format)
+
+    def release_unique_names(self, parent_folder, names, sub_folders=False):
+        """
+        Releases names handed out by reserve_unique_names that won't be used after all.
+        parent_folder -- The folder the names were reserved in.
+        names -- The names to release.
+        sub_folders -- True if the names were for sub-folders or worksets, False if they were for item revisions.
+        """
+        index = self.folder_name_indexes.get((parent_folder, sub_folders))
+        if index is not None:
+            for name in names:
+                index.release(name)
+
+    def get_folder_name_index(self, folder, sub_folders=False):
+        """
+        Retrieves the index of the names used within the given folder.
+        The names of the entries are compared with the ones the index was built from, so entries added, removed or
+        renamed by any code are picked up, reading the names once per call instead of once per candidate name.
+        folder -- The folder whose names to retrieve.
+        sub_folders -- True for the names of the sub-folders and worksets, False for the names of the item revisions.
+        returns -- A FolderNameIndex instance.
+        """
+        if sub_folders:
+            entries = folder.sub_folders
+        else:
+            entries = folder.contained_item_revisions
+
+        index = self.folder_name_indexes.get((folder, sub_folders))
+        if index is None:
+            index = self.folder_name_indexes[(folder, sub_folders)] = FolderNameIndex(self._get_entry_names(entries, sub_folders))
+        else:
+            names = self._get_entry_names(entries, sub_folders)
+            if not index.is_current(names):
+                index.reset(names)
+
+        return index
+
+    def _get_entry_names(self, entries, sub_folders):
+        """
+        Retrieves the names of the given folder entries.
+        """
+        if sub_folders:
+            return [entry.name for entry in entries]
+
+        return [entry.getName() for entry in entries]
+
+    def add_item_revision_to_folder(self, folder, item_revision, editable=None):
+        """
+        Links the given item revision into the folder or workset, dropping the folder's cached statistics.
+        folder -- The folder or workset to add the item revision to.
+        item_revision -- The item revision to add.
+        editable -- For worksets, True to add the item revision as editable and False as non-editable, None for folders.
+        """
+        if editable is None:
+            folder.add_item_revision(item_revision)
+        else:
+            folder.add_item_revision(item_revision, editable)
+        self.folder_summaries.invalidate_folder(folder)
+
+    def remove_item_revision_from_folder(self, folder, item_revision):
+        """
+        Removes the link to the given item revision from the folder or workset, dropping the folder's cached statistics.
+        """
+        folder.remove_item_revision(item_revision)
+        self.folder_summaries.invalidate_folder(folder)
+
+    def record_item_renamed(self, item_revision, old_name):
+        """
+        Records that the given item revision was renamed, to be called by the code renaming it unless it saves the item
+        revision through save_item, which detects renames of item revisions whose names were cached.
+        Drops the cached display names of the item revision and raises item_renamed.
+        item_revision -- The renamed item revision.
+        old_name -- The name of the item revision before the rename.
+        """
+        self.invalidate_display_names(item_revision)
+        self.item_renamed.emit(item_revision, old_name)
+
+    def record_meta_data_changed(self, item_revision):
+        """
+        Records that meta data values of the given item revision changed, to be called by the code changing them unless
+        it saves the item revision through save_item, which detects changes of cached display names.
+        The display names may be built from the meta data, so the cached ones are dropped, then meta_data_changed is raised.
+        item_revision -- The changed item revision.
+        """
+        self.invalidate_display_names(item_revision)
+        self.meta_data_changed.emit(item_revision)
+
+    def _folder_removed(self, parent_folder, folder):
+        """
+        Drops the name indexes, the statistics and the state snapshot of a sub-folder or workset that was removed from
+        the given parent folder.
+        """
+        self.folder_summaries.invalidate_folder(parent_folder)
+        self.folder_summaries.remove_folder(folder)
+        self._drop_state_snapshots(workset=folder)
+        self.folder_name_indexes.pop((folder, True), None)
+        self.folder_name_indexes.pop((folder, False), None)
 
     def copy_folder(self, folder, target_folder):
         """
@@ -721,8 +1335,9 @@ class ItemService(DseService):
         # when we copy the item revisions, for now this is just a copy of the link
         new_folder_name = self.get_unique_folder_name(target_folder, folder.name)
         new_folder = target_folder.create_folder(new_folder_name)
+        self.folder_summaries.invalidate_folder(target_folder)
         for item_revision in folder.contained_item_revisions:
-            new_folder.add_item_revision(item_revision)
+            self.add_item_revision_to_folder(new_folder, item_revision)
 
         # now do the same thing for all sub-folders
         for sub_folder in folder.sub_folders:
@@ -740,13 +1355,14 @@ class ItemService(DseService):
         # when copying a workset, we simply recreate the workset hierarchy and copy the item revisions over
         new_workset_name = self.get_unique_workset_name(target_folder, workset.name)
         new_workset = target_folder.create_workset(new_workset_name)
+        self.folder_summaries.invalidate_folder(target_folder)
 
         # copy the item revisions
         for item_revision in workset.get_editable_item_revisions():
-            new_workset.add_item_revision(item_revision, True)
+            self.add_item_revision_to_folder(new_workset, item_revision, True)
 
         for item_revision in workset.get_non_editable_item_revisions():
-            new_workset.add_item_revision(item_revision, False)
+            self.add_item_revision_to_folder(new_workset, item_revision, False)
 
         # copy the BOM
         if workset.bom_item_revision is not None:
@@ -765,15 +1381,22 @@ class ItemService(DseService):
         # when an item revision is copied, the new item revision should break all links with the attribute "results"
         self.remove_results_references(copied_item_revision)
 
-        self.lws_manager.save_single_item(copied_item_revision, True)
+        unit = self.get_unit_of_work()
+        if unit is not None:
+            unit.mark_created(copied_item_revision)
+        self.save_item(copied_item_revision, True)
+        self.loaded_item_revisions[copied_item_revision] = None
+        self.item_created.emit(copied_item_revision)
 
         return copied_item_revision
 
-    def derive_output_attributes(self, item_type_definition, base_item_revision):
+    def derive_output_attributes(self, item_type_definition, base_item_revision, base_values=None):
         """
         Derives and returns an attribute dictionary for the given item type definition referenced as an output of the base item revision.
         item_type_definition -- The type definition to retrieve the attributes from.
         base_item_revision -- The item revision from which to derive the attributes.
+        base_values -- A dictionary caching the meta data values read from the base item revision, to share between the
+        outputs of the same base item revision, or None.
         """
         # simple rules are used to determine the attributes of a newly created output item:
         # 1. if the output item has an attribute name that matches one in the base item revision, use that attribute value
@@ -781,30 +1404,49 @@ class ItemService(DseService):
         if (item_type_definition is None) or (base_item_revision is None):
             raise ValueError("Must provide both a valid base item revision and valid type definition for the output item!")
 
-        attributes = {}
-        output_meta_data_entries = item_type_definition.getMetaDataEntryDefinitions()
-        base_item_meta_data_entries = base_item_revision.getDefinition().getMetaDataEntryDefinitions()
-        for output_meta_data_entry in output_meta_data_entries:
-            found_entry = None
-            for base_item_meta_data_entry in base_item_meta_data_entries:
-                if base_item_meta_data_entry.getName() == output_meta_data_entry.getName():
-                    # found it!
-                    found_entry = base_item_meta_data_entry
-                    break
+        if base_values is None:
+            base_values = {}
 
+        attributes = {}
+        for name, output_meta_data_entry in self.get_meta_data_mapping_plan(item_type_definition, base_item_revision.getDefinition()).entries:
             # the names match, the only other thing we have to ensure is that the actual value set for the meta data entry
             # is in the list of one of the values for the output entry
+            if name not in base_values:
+                try:
+                    base_values[name] = base_item_revision.getDelegate().getMetaData(name).getValue()
+                except:
+                    # the base item didn't have a value for the entry, so we skip it
+                    base_values[name] = MISSING_VALUE
+                    continue
+
+            value = base_values[name]
+            if value is MISSING_VALUE:
+                continue
+
             try:
-                value = base_item_revision.getDelegate().getMetaData(found_entry.getName()).getValue()
                 if self.verify_output_value(value, output_meta_data_entry):
                     # it's valid, we can set it
-                    attributes[output_meta_data_entry.getName()] = value
+                    attributes[name] = value
             except:
-                # the base item didn't have a value for the entry, so we skip it
+                # the value couldn't be verified, so we skip it
                 continue
 
         return attributes
 
+    def get_meta_data_mapping_plan(self, output_item_type_definition, base_item_type_definition):
+        """
+        Retrieves which meta data entries of the output item type are derived from the base item type, built once per pair of types.
+        output_item_type_definition -- The type definition of the output item.
+        base_item_type_definition -- The type definition of the base item revision.
+        returns -- A MetaDataMappingPlan instance.
+        """
+        key = (output_item_type_definition.getName(), base_item_type_definition.getName())
+        plan = self.meta_data_mapping_plans.get(key)
+        if plan is None:
+            plan = self.meta_data_mapping_plans[key] = MetaDataMappingPlan(output_item_type_definition, base_item_type_definition)
+
+        return plan
+
     def verify_output_value(self, value, meta_data_entry_definition):
         """
         Verifies that the given value passed is valid for the given meta data entry definition.
@@ -821,22 +1463,72 @@ class ItemService(DseService):
 
     def find_non_completed_references(self, item_revision, item_references, recurse=True):
         """
-        Recursively walks the reference graph to find all references of an item revision that are in a non-completed state.
+        Walks the reference graph to find all references of an item revision that are in a non-completed state.
+        The references are added grouped by state: Local, CheckedOut, InPreparation and then Withdrawn, each group being
+        the closure find_references gives for that state.
         item_revision -- The item revision to find the non-completed references for.
         item_references -- The list to add the found references to.
         recurse -- True to follow references recursively, False otherwise.
         """
-        # faster to change the item revision state enum to a set of mutually exclusive flags and change find References
-        # to take a set of flags ORed together, then check an AND, but this works too
-        self.find_references(item_revision, item_references, CpdStateEnum.Local, True)
-        self.find_references(item_revision, item_references, CpdStateEnum.CheckedOut, True)
-        self.find_references(item_revision, item_references, CpdStateEnum.InPreparation, True)
-        self.find_references(item_revision, item_references, CpdStateEnum.Withdrawn, True)
+        visited = set(item_references)
+        references_by_state = self.find_references_by_state(
+            item_revision, (CpdStateEnum.Local, CpdStateEnum.CheckedOut, CpdStateEnum.InPreparation, CpdStateEnum.Withdrawn),
+            recurse, visited)
+        for references in references_by_state.values():
+            item_references.extend(references)
+
+    def find_references_by_state(self, item_revision, states, recurse=True, visited=None):
+        """
+        Computes the reference closures of an item revision for several states in a single walk.
+        The result for each state is the one find_references gives for it: the references in that state reachable
+        through references in the same state only, in the same order.  Below the direct references, the walk only
+        follows a reference if its state matches the state of the path leading to it, and since an item revision has
+        one state, a single visited set serves all the states.  The state of each item revision is fetched once.
+        item_revision -- The item revision to find the references for.
+        states -- A sequence of CpdStateEnum states to accept.
+        recurse -- True to follow the reference tree, False otherwise.
+        visited -- An optional set of item revisions to skip, the found item revisions are added to it.
+        returns -- An ordered dictionary {state: [item revisions]} with an entry for every given state, in the given order.
+        """
+        references_by_state = OrderedDict((state, []) for state in states)
+        if visited is None:
+            visited = set()
+
+        # {item revision: CPD state} of the item revisions looked at
+        item_states = {}
+
+        # each stack entry iterates over the direct references of one item revision, together with the state the
+        # references have to be in to be followed, None at the start where any of the given states is
+        stack = [(None, self._iter_direct_references(item_revision))]
+        while stack:
+            path_state, references = stack[-1]
+            referenced_item_revision = next(references, None)
+            if referenced_item_revision is None:
+                stack.pop()
+                continue
+
+            if referenced_item_revision in visited:
+                continue
+
+            if referenced_item_revision not in item_states:
+                item_states[referenced_item_revision] = referenced_item_revision.getCpdState()
+            state = item_states[referenced_item_revision]
+            if (state not in references_by_state) or ((path_state is not None) and (state != path_state)):
+                continue
+
+            visited.add(referenced_item_revision)
+            references_by_state[state].append(referenced_item_revision)
+
+            # we may now need to walk the referenced graph of this item
+            if recurse:
+                stack.append((state, self._iter_direct_references(referenced_item_revision)))
+
+        return references_by_state
 
     # TODO: lets change the semantics so it doesn't require you pass it an empty list to fill
     def find_references(self, item_revision, item_references, state, recurse=True):
         """
-        Recursively walks the reference graph to find all references of an item revision
+        Walks the reference graph to find all references of an item revision
         that have the given state.  The item_references parameter holds the list of all
         item revisions identified so far, and new item revisions should be added to the list.
         If recurse is set to False, only the direct references are returned.
@@ -845,30 +1537,84 @@ class ItemService(DseService):
         state -- The filter for references found.
         recurse -- True to follow the reference tree, False otherwise.
         """
+        visited = set(item_references)
+        item_references.extend(self.iter_references(item_revision, (state,), recurse, visited))
+
+    def iter_references(self, item_revision, accept=None, recurse=True, visited=None):
+        """
+        Walks the reference graph of an item revision and yields every referenced item revision accepted by the filter.
+        Only accepted item revisions are followed, so the walk yields the closure of the accepted references.
+        The walk uses an explicit stack (no recursion limit on deep graphs) and yields each item revision once,
+        depth-first in the order the references are found.
+        item_revision -- The item revision to start from, it is only yielded if it's reachable from itself.
+        accept -- A predicate taking an item revision, a collection of CpdStateEnum states, or None to accept everything.
+        recurse -- True to follow the reference tree, False to only look at the direct references.
+        visited -- An optional set of item revisions to skip, the yielded item revisions are added to it.
+        """
+        if accept is None:
+            is_accepted = lambda referenced_item_revision: True
+        elif callable(accept):
+            is_accepted = accept
+        else:
+            states = frozenset(accept)
+            is_accepted = lambda referenced_item_revision: referenced_item_revision.getCpdState() in states
+
+        if visited is None:
+            visited = set()
+        # the filter is evaluated once per item revision, rejected ones are remembered as well
+        rejected = set()
+
+        # each stack entry iterates over the direct references of one item revision
+        stack = [self._iter_direct_references(item_revision)]
+        while stack:
+            referenced_item_revision = next(stack[-1], None)
+            if referenced_item_revision is None:
+                stack.pop()
+                continue
+
+            if referenced_item_revision in visited or referenced_item_revision in rejected:
+                continue
+            if not is_accepted(referenced_item_revision):
+                rejected.add(referenced_item_revision)
+                continue
+
+            visited.add(referenced_item_revision)
+            yield referenced_item_revision
+
+            # we may now need to walk the referenced graph of this item
+            if recurse:
+                stack.append(self._iter_direct_references(referenced_item_revision))
+
+    def _iter_direct_references(self, item_revision):
+        """
+        Yields the item revisions directly referenced by the given item revision, skipping unset references.
+        item_revision -- The item revision whose references to yield.
+        """
+        for _reference_tag, _reference_key, referenced_item_revision in self.iter_reference_edges(item_revision):
+            yield referenced_item_revision
+
+    def iter_reference_edges(self, item_revision):
+        """
+        Yields the references set on the given item revision.
+        item_revision -- The item revision whose references to yield.
+        returns -- A generator of (tag, key, referenced item revision) tuples, key is None for single-valued references.
+        """
         reference_tags = item_revision.getReferenceTagNames()
-        if reference_tags is not None:
-            for reference_tag in reference_tags:
-                referenced_item_definition = item_revision.getReferenceDefinition(reference_tag)
-                if referenced_item_definition.isArray():
-                    # array-valued reference, we need to look at all the keys
-                    reference_keys = item_revision.getReferenceKeys(reference_tag)
-                    for reference_key in reference_keys:
-                        referenced_item_revision = item_revision.getReference(reference_tag, reference_key)
-                        if (referenced_item_revision is not None) and (referenced_item_revision.getCpdState() == state) and (referenced_item_revision not in item_references):
-                            item_references.append(referenced_item_revision)
-
-                            # we may now need to recurse on the referenced graph of this item
-                            if recurse:
-                                self.find_references(referenced_item_revision, item_references, state, recurse)
-                else:
-                    # single-valued reference, look at the reference itself
-                    referenced_item_revision = item_revision.getReference(reference_tag)
-                    if (referenced_item_revision is not None) and (referenced_item_revision.getCpdState() == state) and (referenced_item_revision not in item_references):
-                        item_references.append(referenced_item_revision)
+        if reference_tags is None:
+            return
 
-                        # we may now need to recurse on the referenced graph of this item
-                        if recurse:
-                            self.find_references(referenced_item_revision, item_references, state, recurse)
+        for reference_tag in reference_tags:
+            if item_revision.getReferenceDefinition(reference_tag).isArray():
+                # array-valued reference, we need to look at all the keys
+                for reference_key in item_revision.getReferenceKeys(reference_tag):
+                    referenced_item_revision = item_revision.getReference(reference_tag, reference_key)
+                    if referenced_item_revision is not None:
+                        yield reference_tag, reference_key, referenced_item_revision
+            else:
+                # single-valued reference, look at the reference itself
+                referenced_item_revision = item_revision.getReference(reference_tag)
+                if referenced_item_revision is not None:
+                    yield reference_tag, None, referenced_item_revision
 
     def get_input_references(self, item_revision):
         """
@@ -877,25 +1623,16 @@ class ItemService(DseService):
         returns -- A list of AcesItemRevision instances that define the input references.
         """
         inputs = []
-        default_tool_definition = self.tool_service.get_default_tool_definition(item_revision.getDefinition().getName())
-        if default_tool_definition is not None:
-            tool_references = default_tool_definition.get_references()
-            for (tag, tool_reference) in tool_references:
-                if (tool_reference == ToolIOReference.Input) or (tool_reference == ToolIOReference.OptionalInput):
-                    # check to see if a reference is set for this tag
-                    # the tag could be in dot notation, so we may have to go down a few levels
-                    tag_elements = tag.split('.')
-                    base_item_revision = item_revision
-                    for tag_element in tag_elements:
-                        base_item_revision = base_item_revision.getReference(tag_element)
-                        if base_item_revision is None:
-                            # can't go any further in the recursion
-                            base_item_revision = None
-                            break
-
-                    # if we recursed down and got a final reference, add it to the inputs
-                    if (base_item_revision is not None) and (base_item_revision != item_revision):
-                        inputs.append(base_item_revision)
+        tool_reference_tags = self.get_tool_reference_tags(item_revision.getDefinition().getName())
+        if tool_reference_tags is not None:
+            for tag in tool_reference_tags.all_input_tags:
+                # check to see if a reference is set for this tag
+                # the tag could be in dot notation, so we may have to go down a few levels
+                base_item_revision = self.tag_path_resolver.resolve_target(item_revision, tag)
+
+                # if we recursed down and got a final reference, add it to the inputs
+                if (base_item_revision is not None) and (base_item_revision != item_revision):
+                    inputs.append(base_item_revision)
 
         return inputs
 
@@ -907,24 +1644,15 @@ class ItemService(DseService):
         """
         # in order to find the output reference tags, we need to consult the tool service for the item revision's default tool
         outputs = []
-        default_tool_definition = self.tool_service.get_default_tool_definition(item_revision.getDefinition().getName())
-        if default_tool_definition is not None:
-            tool_references = default_tool_definition.get_references()
-            for (tag, tool_reference) in tool_references:
-                if tool_reference == ToolIOReference.Output:
-                    # the tag could be in dot notation, so we may have to go down a few levels
-                    tag_elements = tag.split('.')
-                    base_item_revision = item_revision
-                    for tag_element in tag_elements:
-                        base_item_revision = base_item_revision.getReference(tag_element)
-                        if base_item_revision is None:
-                            # can't go any further in the recursion
-                            base_item_revision = None
-                            break
-
-                    # if we recursed down and got a final reference, add it to the outputs
-                    if (base_item_revision is not None) and (base_item_revision != item_revision):
-                        outputs.append(base_item_revision)
+        tool_reference_tags = self.get_tool_reference_tags(item_revision.getDefinition().getName())
+        if tool_reference_tags is not None:
+            for tag in tool_reference_tags.output_tags:
+                # the tag could be in dot notation, so we may have to go down a few levels
+                base_item_revision = self.tag_path_resolver.resolve_target(item_revision, tag)
+
+                # if we recursed down and got a final reference, add it to the outputs
+                if (base_item_revision is not None) and (base_item_revision != item_revision):
+                    outputs.append(base_item_revision)
 
         return outputs
 
@@ -933,6 +1661,7 @@ class ItemService(DseService):
         Removes all references from the given item revision that have a tag marked with the "results" attribute.
         item_revision -- The item revision to remove results references from.
         """
+        removed = False
         tags = item_revision.getReferenceTagNames()
         for tag in tags:
             reference_definition = item_revision.getReferenceDefinition(tag)
@@ -944,9 +1673,14 @@ class ItemService(DseService):
                     for key in keys:
                         if item_revision.getReference(tag, key) is not None:
                             item_revision.removeReference(tag, key)
+                            removed = True
                 else:
                     if item_revision.getReference(tag) is not None:
                         item_revision.removeReference(tag)
+                        removed = True
+
+        if removed:
+            self._item_references_changed(item_revision)
 
     def validate_reference_assignment(self, source_item, assigned_item_revision, reference_type):
         """
@@ -993,12 +1727,71 @@ class ItemService(DseService):
         return False
 
 
-    def get_icon(self, item_revision):
+    def get_icon(self, item_revision, size=None):
         """
         Retrieves an icon for the given item revision, complete with overlay for state and consistency state.
+        Composed icons are cached, item revisions of the same type and states share the same icon.
         item_revision -- The item revision to retrieve an icon for.
+        size -- A QSize to retrieve a pixmap of that size instead of the icon, None for the icon.
         returns -- A icon that can be displayed for the item revision.
         """
+        key = self._get_icon_key(item_revision, size)
+        icon = self.icon_cache.get(key)
+        if icon is None:
+            icon = self._compose_icon(key)
+            self.icon_cache.put(key, icon)
+
+        return icon
+
+    def get_icons(self, item_revisions, size=None):
+        """
+        Retrieves the icons for the given item revisions, composing each distinct icon only once.
+        item_revisions -- The item revisions to retrieve icons for.
+        size -- A QSize to retrieve pixmaps of that size instead of the icons, None for the icons.
+        returns -- A list of icons in the order of the given item revisions.
+        """
+        icons = {}
+        results = []
+        for item_revision in item_revisions:
+            key = self._get_icon_key(item_revision, size)
+            icon = icons.get(key)
+            if icon is None:
+                icon = icons[key] = self.get_icon(item_revision, size)
+            results.append(icon)
+
+        return results
+
+    def _get_overlay_tables(self):
+        """
+        Retrieves the overlay image ids per CPD state and consistency state, built once.
+        returns -- A tuple ({state: (overlay if owned by the current user, overlay otherwise)}, {consistency state: overlay}).
+        """
+        if self.status_overlays is None:
+            self.status_overlays = {
+                CpdStateEnum.Local          : (None               , None               ),
+                CpdStateEnum.InPreparation  : ('overlay-orange'   , 'overlay-orange'   ),
+                CpdStateEnum.Checked        : ('overlay-orange'   , 'overlay-orange'   ),
+                CpdStateEnum.CheckedOut     : ('overlay-green'    , 'overlay-orange'   ),
+                CpdStateEnum.Completed      : ('overlay-blue'     , 'overlay-blue'     ),
+                CpdStateEnum.Approved       : ('overlay-blue'     , 'overlay-blue'     ),
+                CpdStateEnum.Released       : ('overlay-blue'     , 'overlay-blue'     ),
+                CpdStateEnum.Withdrawn      : ('withdrawn_overlay', 'withdrawn_overlay'),
+                CpdStateEnum.Unknown        : (None               , None               ),
+            }
+            self.consistency_overlays = {
+                ConsistencyStateEnum.not_checked : None                   ,
+                ConsistencyStateEnum.NotUpToDate : 'not_uptodate_overlay' ,
+                ConsistencyStateEnum.Inconsistent: 'inconsistent_overlay' ,
+                ConsistencyStateEnum.Consistent  : 'checked_out_1_overlay',
+            }
+
+        return self.status_overlays, self.consistency_overlays
+
+    def _get_icon_key(self, item_revision, size):
+        """
+        Determines which icon the given item revision is displayed with.
+        returns -- A tuple (base id, status overlay, consistency overlay, size).
+        """
         state = CpdStateEnum.Local
         consistency_state = ConsistencyStateEnum.not_checked
         if isinstance(item_revision, AcesItemRevision):
@@ -1008,51 +1801,52 @@ class ItemService(DseService):
             state = item_revision.cpd_state
             consistency_state = item_revision.consistency_state
 
-        # base image id and options
-        icon_options = {}
-        if item_revision.getItemType() == ItemTypeEnum.Structure:
+        # base image id
+        item_type = item_revision.getItemType()
+        if item_type == ItemTypeEnum.Structure:
             base_id = 'Structure'
-        elif item_revision.getItemType() == ItemTypeEnum.Variant:
+        elif item_type == ItemTypeEnum.Variant:
             base_id = 'Variant'
         else:
             base_id = "Item"
 
-        status_overlay = {
-            CpdStateEnum.Local          : None              ,
-            CpdStateEnum.InPreparation  : ('overlay-orange'),
-            CpdStateEnum.Checked        : ('overlay-orange'),
-            CpdStateEnum.CheckedOut     : {
-                True : 'overlay-green' ,
-                False: 'overlay-orange',
-            }[self.framework_service.aces_session.getCurrentUserName() == item_revision.getOwner()],
-            CpdStateEnum.Completed      : 'overlay-blue',
-            CpdStateEnum.Approved       : 'overlay-blue',
-            CpdStateEnum.Released       : 'overlay-blue',
-            CpdStateEnum.Withdrawn      : 'withdrawn_overlay',
-            CpdStateEnum.Unknown        : None               ,
-        }[state]
+        status_overlays, consistency_overlays = self._get_overlay_tables()
+        own_overlay, other_overlay = status_overlays[state]
+        if own_overlay == other_overlay:
+            status_overlay = own_overlay
+        elif self.framework_service.aces_session.getCurrentUserName() == item_revision.getOwner():
+            status_overlay = own_overlay
+        else:
+            status_overlay = other_overlay
 
         # no status overlay for in-prep structure / variants until we have a concept for how to workflow them
-        if item_revision.getItemType() in (ItemTypeEnum.Structure, ItemTypeEnum.Variant) and state == CpdStateEnum.InPreparation:
+        if item_type in (ItemTypeEnum.Structure, ItemTypeEnum.Variant) and state == CpdStateEnum.InPreparation:
             status_overlay = None
 
+        if size is not None:
+            size = (size.width(), size.height())
+
+        return (base_id, status_overlay, consistency_overlays[consistency_state], size)
+
+    def _compose_icon(self, key):
+        """
+        Composes the icon for the given key as returned by _get_icon_key.
+        """
+        base_id, status_overlay, consistency_overlay, size = key
+        icon_options = {}
         if status_overlay is not None:
             icon_options['F'] = status_overlay
 
         # consistency overlay
-        consistency_overlay = {
-            ConsistencyStateEnum.not_checked : None                   ,
-            ConsistencyStateEnum.NotUpToDate : 'not_uptodate_overlay' ,
-            ConsistencyStateEnum.Inconsistent: 'inconsistent_overlay' ,
-            ConsistencyStateEnum.Consistent  : 'checked_out_1_overlay',
-        }[consistency_state]
-
         if consistency_overlay is not None:
             icon_options['NW'] = consistency_overlay
 
         image_service = self.context.get_service("Image")
+        icon = image_service.get_icon(base_id, **icon_options)
+        if size is not None:
+            return icon.pixmap(QSize(size[0], size[1]))
 
-        return image_service.get_icon(base_id, **icon_options)
+        return icon
 
     def add_variant(self, variant_item, data_item, variant_name):
         """
@@ -1061,9 +1855,119 @@ class ItemService(DseService):
         data_item -- The data item variant to add.
         variant_name -- The name the data item variant will be referred by.
         """
+        self.add_variants(variant_item, [(data_item, variant_name)])
+
+    def add_variants(self, variant_item, variants):
+        """
+        Adds several data item variants to the specified variant item container, opening and saving it only once.
+        The last variant added is the active one.
+        variant_item -- The variant item on which to add the data items.
+        variants -- A list of tuples (data item, variant name).
+        """
+        if not variants:
+            return
+
         with self.lws_manager.open_context(variant_item):
-            variant_item.addVariant(variant_name, data_item)
-            variant_item.activate(variant_name)
+            for data_item, variant_name in variants:
+                variant_item.addVariant(variant_name, data_item)
+            variant_item.activate(variants[-1][1])
         # TODO: shouldn't adding the variant be enough?
         # TODO: ... if not, should the context manager call save regardless of whether it was already opened?
-        self.lws_manager.save_single_item(variant_item)
+        self.save_item(variant_item)
+        self._item_references_changed(variant_item)
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Collects the saves of the item service operations within the block and saves each changed item revision once at its end.
+        If the block raises, nothing is saved and the item revisions created within the block are deleted again.
+        Changes made to existing item revisions within a failed block are not saved but remain in memory.
+        The unit of work is not a transaction: the LWS manager saves one item revision at a time and can't undo a save.
+        If a save at the end fails, the created item revisions are deleted again, but the existing item revisions saved
+        before the failure stay saved and the remaining ones stay unsaved.
+        Nested blocks are part of the outermost one, a unit of work is bound to the thread that started it.
+        returns -- The UnitOfWork instance.
+        """
+        unit = self.get_unit_of_work()
+        if unit is not None:
+            yield unit
+            return
+
+        unit = self.unit_of_work_state.unit = UnitOfWork()
+        try:
+            yield unit
+        except:
+            self.unit_of_work_state.unit = None
+            self._roll_back_unit_of_work(unit)
+            raise
+
+        self.unit_of_work_state.unit = None
+        try:
+            self._flush_unit_of_work(unit)
+        except:
+            self._roll_back_unit_of_work(unit)
+            raise
+
+    def get_unit_of_work(self):
+        """
+        Retrieves the UnitOfWork of the current thread, None outside of a unit_of_work block.
+        """
+        return getattr(self.unit_of_work_state, 'unit', None)
+
+    def save_item(self, item_revision, close_after=None):
+        """
+        Saves the given item revision, at the end of the unit of work if one is active.
+        item_revision -- The item revision to save.
+        close_after -- True to close the item revision after saving, False to keep it open, None for the default.
+        """
+        unit = self.get_unit_of_work()
+        if unit is not None:
+            unit.mark_dirty(item_revision, close_after)
+        elif close_after is None:
+            self.lws_manager.save_single_item(item_revision)
+        else:
+            self.lws_manager.save_single_item(item_revision, close_after)
+
+        self._record_item_saved(item_revision)
+
+    def _record_item_saved(self, item_revision):
+        """
+        Invoked when an item revision is saved, i.e. its edits reach this service.  Compares it with its cached names
+        to record a rename or a meta data change, dropping the cached names either way.
+        """
+        names = self.display_names.pop(item_revision)
+        if names is None:
+            # nothing cached, so nothing can be stale and nothing tells what changed
+            return
+
+        if names[2] != item_revision.getName():
+            self.record_item_renamed(item_revision, names[2])
+        elif ((names[0] is not None) and (names[0] != item_revision.getDisplayName())) or \
+                ((names[1] is not None) and (names[1] != item_revision.getAbbreviatedDisplayName())):
+            self.record_meta_data_changed(item_revision)
+
+    def _flush_unit_of_work(self, unit):
+        """
+        Saves the item revisions changed within a unit of work.
+        The created item revisions are saved first, so a failure leaves no existing item revision saved with a reference
+        to a created one that gets deleted again.
+        """
+        created_item_revisions = set(unit.created_item_revisions)
+        pending = list(unit.dirty_item_revisions.items())
+        pending = ([(item_revision, close_after) for item_revision, close_after in pending if item_revision in created_item_revisions] +
+                   [(item_revision, close_after) for item_revision, close_after in pending if item_revision not in created_item_revisions])
+        for item_revision, close_after in pending:
+            if close_after is None:
+                self.lws_manager.save_single_item(item_revision)
+            else:
+                self.lws_manager.save_single_item(item_revision, close_after)
+
+    def _roll_back_unit_of_work(self, unit):
+        """
+        Deletes the item revisions created within a failed unit of work, newest first, whether they were saved or not.
+        """
+        for item_revision in reversed(unit.created_item_revisions):
+            try:
+                self.delete_item_revision(item_revision)
+            except Exception:
+                sys.stderr.write(traceback.format_exc())
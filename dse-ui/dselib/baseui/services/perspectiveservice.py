@@ -1,9 +1,18 @@
 import importlib
+import logging
 
+from PyQt5.QtCore import QTimer
 from dselib.baseui.perspectivebase.perspective import Perspective
 from dselib.baseui.perspectivebase.perspectivemodel import PerspectiveDefinition
 from dselib.baseui.services.dseservice import (DseService,
                                                DseServiceConfigurator)
+from dselib.baseui.utils.startuptrace import startup_trace
+
+logger = logging.getLogger(__name__)
+
+# the total view cost (see Perspective.get_view_cost) of the perspective views a window keeps alive unless the
+# configuration sets viewCacheBudget, roughly the Qt objects of two or three typical perspective views
+DEFAULT_VIEW_CACHE_BUDGET = 2000
 
 
 class PerspectiveConfigurator(DseServiceConfigurator):
@@ -18,20 +27,75 @@ class PerspectiveConfigurator(DseServiceConfigurator):
         """
         DseServiceConfigurator.__init__(self, app_context, service_id)
         self.perspective_definitions = []
+        self.perspective_definition_map = {}
         self.perspective_extension_definitions = []
-        
+        self.definition_errors = []
+        self.import_in_background = False
+        self.view_cache_budget = DEFAULT_VIEW_CACHE_BUDGET
+
     def get_perspective_definitions(self):
         """
         Retrieves the loaded perspective definitions.
         """
         return self.perspective_definitions
-    
+
+    def get_perspective_definition(self, perspective_name):
+        """
+        Retrieves the perspective definition with the given name.
+        perspective_name -- The name of the perspective.
+        returns -- The PerspectiveDefinition, or None if no perspective with that name was defined.
+        """
+        return self.perspective_definition_map.get(perspective_name)
+
     def get_perspective_extension_definitions(self):
         """
         Retrieves the loaded perspective extension definitions.
         """
         return self.perspective_extension_definitions
-        
+
+    def get_definition_errors(self):
+        """
+        Retrieves the messages describing the perspective definitions that were rejected.
+        """
+        return self.definition_errors
+
+    def is_import_in_background(self):
+        """
+        Retrieves whether or not the perspective modules should be imported in idle time ahead of use.
+        """
+        return self.import_in_background
+
+    def get_view_cache_budget(self):
+        """
+        Retrieves the total view cost of the perspective views a window keeps alive, see Perspective.get_view_cost.
+        """
+        return self.view_cache_budget
+
+    def report_error(self, message):
+        """
+        Reports a bad perspective definition without stopping the processing of the others.
+        message -- The message describing the problem.
+        """
+        logger.error(message)
+        self.definition_errors.append(message)
+
+    def get_config_keys(self):
+        """
+        Retrieves the top-level configuration keys the configurator reads.
+        """
+        return ["perspectiveDefinition"]
+
+    def reset_config(self):
+        """
+        Discards the loaded perspective definitions.
+        """
+        self.perspective_definitions = []
+        self.perspective_definition_map = {}
+        self.perspective_extension_definitions = []
+        self.definition_errors = []
+        self.import_in_background = False
+        self.view_cache_budget = DEFAULT_VIEW_CACHE_BUDGET
+
     def load_config(self, config_file):
         """
         Loads the set of perspective definitions that define the perspectives.
@@ -40,7 +104,7 @@ class PerspectiveConfigurator(DseServiceConfigurator):
         """
         if config_file is None:
             return
-        
+
         for key in config_file:
             if key == "perspectiveDefinition":
                 self.load_perspective_definition(config_file[key])
@@ -48,35 +112,62 @@ class PerspectiveConfigurator(DseServiceConfigurator):
     def load_perspective_definition(self, perspective_definition_entry):
         """
         Loads the perspective definitions from the given loaded configuration file.
+        Bad definitions are reported and skipped, the remaining ones are still loaded.
         perspective_definition_entry -- The perspective definition to load from the configuration file.
         """
-        # TODO: convert this method from raising ValueErrors to logging an error notification
-        # and continuing on - we don't want to stop the processing of all other perspective definitions 
-        # for one bad one
         if "perspectives" not in perspective_definition_entry:
-            raise ValueError("Ill-formed perspective definition - "
-                             "perspective definition must have at least one perspective!")
-        
+            self.report_error("Ill-formed perspective definition - "
+                              "perspective definition must have at least one perspective!")
+            return
+
         if not isinstance(perspective_definition_entry["perspectives"], list):
-            raise ValueError("Ill-formed perspective definition - perspectives must be a valid list!")
-        
+            self.report_error("Ill-formed perspective definition - perspectives must be a valid list!")
+            return
+
+        import_in_background = perspective_definition_entry.get("importInBackground", False)
+        if not isinstance(import_in_background, bool):
+            self.report_error("Ill-formed perspective definition - the importInBackground flag must be a boolean!")
+        elif import_in_background:
+            self.import_in_background = True
+
+        if "viewCacheBudget" in perspective_definition_entry:
+            view_cache_budget = perspective_definition_entry["viewCacheBudget"]
+            if isinstance(view_cache_budget, bool) or not isinstance(view_cache_budget, int) or view_cache_budget < 0:
+                self.report_error("Ill-formed perspective definition - the viewCacheBudget must be a non-negative integer!")
+            else:
+                self.view_cache_budget = view_cache_budget
+
         perspectives = perspective_definition_entry["perspectives"]
-        
+
         for perspective_tag in perspectives:
             # ensure it has a name
             if 'name' not in perspective_tag:
-                raise ValueError("Ill-formed perspective definition - no name is given!")
+                self.report_error("Ill-formed perspective definition - no name is given!")
+                continue
 
             if 'module' not in perspective_tag:
-                raise ValueError("Ill-formed perspective definition - no module is given!")
+                self.report_error("Ill-formed perspective definition \"" + perspective_tag['name'] + "\" - no module is given!")
+                continue
 
             if 'controller' not in perspective_tag:
-                raise ValueError("Ill-formed perspective definition - no controller is given!")
+                self.report_error("Ill-formed perspective definition \"" + perspective_tag['name'] + "\" - no controller is given!")
+                continue
+
+            prewarm = perspective_tag.get('prewarm', False)
+            if not isinstance(prewarm, bool):
+                self.report_error("Ill-formed perspective definition \"" + perspective_tag['name'] +
+                                  "\" - the prewarm flag must be a boolean!")
+                continue
+
+            if perspective_tag['name'] in self.perspective_definition_map:
+                self.report_error("Duplicate perspective definition \"" + perspective_tag['name'] + "\" ignored!")
+                continue
 
             loaded_perspective_definition = PerspectiveDefinition(perspective_tag['name'], perspective_tag['module'],
-                                                                  perspective_tag['controller'])
+                                                                  perspective_tag['controller'], prewarm)
             self.perspective_definitions.append(loaded_perspective_definition)
-        
+            self.perspective_definition_map[loaded_perspective_definition.get_name()] = loaded_perspective_definition
+
 class PerspectiveService(DseService):
     """
     Represents the service that creates perspective contexts and loads perspectives.
@@ -88,32 +179,85 @@ class PerspectiveService(DseService):
         service_id -- A string defining the id of the service.
         """
         DseService.__init__(self, context, service_id)
-        
+        self.import_queue = []
+
+    def initialize_service(self):
+        """
+        Initializes the service.  This takes place after all services have been registered and all configuration items have been loaded.
+        Starts importing the perspective modules in idle time if the configuration asks for it.
+        """
+        if self.context.get_configurator("Perspective").is_import_in_background():
+            self.import_queue = list(self.context.get_configurator("Perspective").get_perspective_definitions())
+            if self.import_queue:
+                QTimer.singleShot(0, self._import_next_perspective)
+
+    def _import_next_perspective(self):
+        """
+        Resolves the controller class of the next queued perspective definition.
+        The perspective modules create widgets and QObjects, so they are imported on the main thread, one per event loop
+        iteration to keep the window responsive.
+        """
+        if not self.import_queue:
+            return
+
+        perspective_definition = self.import_queue.pop(0)
+        try:
+            self.resolve_controller(perspective_definition)
+        except Exception as e:
+            self.context.get_configurator("Perspective").report_error(str(e))
+
+        if self.import_queue:
+            QTimer.singleShot(0, self._import_next_perspective)
+
+    def resolve_controller(self, perspective_definition):
+        """
+        Retrieves the controller class of the given perspective definition, importing its module the first time.
+        perspective_definition -- The PerspectiveDefinition to resolve.
+        returns -- The Perspective subclass named by the definition.
+        """
+        perspective_controller = perspective_definition.get_controller_class()
+        if perspective_controller is not None:
+            return perspective_controller
+
+        # the perspective definition indicates the controller we need to load from what module
+        module = importlib.import_module(perspective_definition.get_module())
+        perspective_controller = getattr(module, perspective_definition.get_controller(), None)
+        if not (isinstance(perspective_controller, type) and issubclass(perspective_controller, Perspective)):
+            raise ValueError("Perspective controller with the name \"" +
+                             perspective_definition.get_controller() + "\" is not a valid Perspective class!")
+
+        perspective_definition.set_controller_class(perspective_controller)
+        return perspective_controller
+
+    def get_prewarm_perspective_names(self):
+        """
+        Retrieves the names of the perspectives that should be loaded in the background once a window is shown.
+        """
+        return [perspective_definition.get_name() for perspective_definition in
+                self.context.get_configurator("Perspective").get_perspective_definitions()
+                if perspective_definition.is_prewarmed()]
+
+    def get_view_cache_budget(self):
+        """
+        Retrieves the total view cost of the perspective views a window keeps alive, see Perspective.get_view_cost.
+        """
+        return self.context.get_configurator("Perspective").get_view_cache_budget()
+
     def load_perspective(self, perspective_name):
         """
         Loads the perspective with the given name from the information in the definition file.
         perspective_name -- The name of the perspective to load.
         perspective_context -- The context in which to load the perspective.
         """
-        perspective_definition = None
-        for loaded_perspective_definition in \
-                self.context.get_configurator("Perspective").get_perspective_definitions():
-            if loaded_perspective_definition.get_name() == perspective_name:
-                perspective_definition = loaded_perspective_definition
-                break
-            
+        perspective_definition = self.context.get_configurator("Perspective").get_perspective_definition(perspective_name)
         if perspective_definition is None:
             raise ValueError("No perspective with the name \"" + perspective_name + "\" was defined!")
-        
-        # the perspective definition indicates the controller we need to load from what module
-        module = importlib.import_module(perspective_definition.get_module())
-        perspective_controller = getattr(module, perspective_definition.get_controller())
+
+        with startup_trace.span("import " + perspective_definition.get_module(), "import"):
+            perspective_controller = self.resolve_controller(perspective_definition)
         perspective = perspective_controller(perspective_name, self.context)
-        if not isinstance(perspective, Perspective):
-            raise ValueError("Perspective controller with the name \"" +
-                             perspective_definition.get_controller() + "\" is not a valid Perspective instance!")
-    
         perspective.set_definition(perspective_definition)
-        perspective.initialize_perspective()
+        with startup_trace.span("initialize_perspective " + perspective_name, "perspective"):
+            perspective.initialize_perspective()
 
         return perspective
@@ -0,0 +1,203 @@
+from collections import deque
+
+from dselib.baseui.services.dseservice import DseService
+
+
+class ReferenceIndexService(DseService):
+    """
+    Represents the service keeping an in-memory index of the references between item revisions in both directions,
+    so that "who references this item revision" can be answered without walking the workspace.
+    The index is built once per session on the first query, from the item revisions the item service has loaded (see
+    ItemService.get_loaded_item_revisions) and everything they reference, and kept up to date from the change signals
+    of the item service.  References changed behind the item service's back are only seen after rebuilding the index.
+    """
+    def __init__(self, context, service_id):
+        """
+        Initializes the ReferenceIndexService instance.
+        context -- The context in which the service is loaded into.
+        service_id -- A string identifying the service.
+        """
+        DseService.__init__(self, context, service_id)
+        self.item_service = None
+        self.built = False
+
+        # {item revision: [(tag, key, target item revision)]} references held by an indexed item revision
+        self.forward_edges = {}
+
+        # {target item revision: set((source item revision, tag, key))} references pointing to an item revision
+        self.reverse_edges = {}
+
+    def initialize_service(self):
+        """
+        Invoked when the service is initialized by the ACES system, subscribes to the item service change signals.
+        """
+        self.item_service = self.context.get_service("Item")
+        self.item_service.item_created.connect(self._on_item_created)
+        self.item_service.item_loaded.connect(self._on_item_loaded)
+        self.item_service.item_deleted.connect(self._on_item_deleted)
+        self.item_service.references_changed.connect(self._on_references_changed)
+
+    def is_built(self):
+        """
+        Retrieves whether or not the index was built.
+        """
+        return self.built
+
+    def ensure_built(self):
+        """
+        Builds the index from the item revisions loaded by the item service, unless it was built already.
+        """
+        if not self.built:
+            self.build_index(self.item_service.get_loaded_item_revisions())
+
+    def build_index(self, item_revisions):
+        """
+        Builds the index from the given item revisions and all item revisions they reference, recursively.
+        Any previous content of the index is discarded, call it again to pick up references changed outside of the
+        item service.
+        item_revisions -- The root item revisions to index, typically all item revisions of the workspace.
+        """
+        self.forward_edges.clear()
+        self.reverse_edges.clear()
+
+        pending = deque(item_revisions)
+        while pending:
+            item_revision = pending.popleft()
+            if item_revision in self.forward_edges:
+                continue
+            for target_item_revision in self._index_item_revision(item_revision):
+                if target_item_revision not in self.forward_edges:
+                    pending.append(target_item_revision)
+
+        self.built = True
+
+    def index_item_revision(self, item_revision):
+        """
+        Adds the given item revision to the index, or re-reads its references if it is already indexed.
+        item_revision -- The item revision to index.
+        """
+        self._unindex_references(item_revision)
+        self._index_item_revision(item_revision)
+
+    def remove_item_revision(self, item_revision):
+        """
+        Removes the given item revision from the index, both the references it holds and the ones pointing to it.
+        item_revision -- The item revision to remove.
+        """
+        self._unindex_references(item_revision)
+        self.forward_edges.pop(item_revision, None)
+
+        # the item revisions referencing it no longer reach it
+        for source_item_revision, tag, key in self.reverse_edges.pop(item_revision, ()):
+            edges = self.forward_edges.get(source_item_revision)
+            if edges is not None:
+                edges.remove((tag, key, item_revision))
+
+    def get_referencing_item_revisions(self, item_revision):
+        """
+        Retrieves the item revisions directly referencing the given item revision.
+        item_revision -- The referenced item revision.
+        returns -- A list of item revisions.
+        """
+        self.ensure_built()
+        return list(set(source_item_revision for source_item_revision, _tag, _key in self.reverse_edges.get(item_revision, ())))
+
+    def get_incoming_references(self, item_revision):
+        """
+        Retrieves the references pointing to the given item revision.
+        item_revision -- The referenced item revision.
+        returns -- A list of (source item revision, tag, key) tuples, key is None for single-valued references.
+        """
+        self.ensure_built()
+        return list(self.reverse_edges.get(item_revision, ()))
+
+    def get_referenced_item_revisions(self, item_revision):
+        """
+        Retrieves the item revisions directly referenced by the given item revision, as of the last indexing.
+        item_revision -- The referencing item revision.
+        returns -- A list of item revisions.
+        """
+        self.ensure_built()
+        target_item_revisions = []
+        for _tag, _key, target_item_revision in self.forward_edges.get(item_revision, ()):
+            if target_item_revision not in target_item_revisions:
+                target_item_revisions.append(target_item_revision)
+
+        return target_item_revisions
+
+    def get_impacted_item_revisions(self, item_revision):
+        """
+        Retrieves all item revisions referencing the given item revision, directly or indirectly.
+        item_revision -- The referenced item revision.
+        returns -- A list of item revisions in breadth first order, not including the given item revision.
+        """
+        self.ensure_built()
+        visited = set([item_revision])
+        impacted = []
+        pending = deque([item_revision])
+        while pending:
+            for source_item_revision, _tag, _key in self.reverse_edges.get(pending.popleft(), ()):
+                if source_item_revision not in visited:
+                    visited.add(source_item_revision)
+                    impacted.append(source_item_revision)
+                    pending.append(source_item_revision)
+
+        return impacted
+
+    def _index_item_revision(self, item_revision):
+        """
+        Records the references held by the given item revision, which must not have any indexed references.
+        item_revision -- The item revision to index.
+        returns -- The list of referenced item revisions.
+        """
+        edges = []
+        targets = []
+        for tag, key, target_item_revision in self.item_service.iter_reference_edges(item_revision):
+            self.reverse_edges.setdefault(target_item_revision, set()).add((item_revision, tag, key))
+            edges.append((tag, key, target_item_revision))
+            targets.append(target_item_revision)
+        self.forward_edges[item_revision] = edges
+
+        return targets
+
+    def _unindex_references(self, item_revision):
+        """
+        Removes the references held by the given item revision from the reverse index.
+        item_revision -- The referencing item revision.
+        """
+        for tag, key, target_item_revision in self.forward_edges.get(item_revision, ()):
+            sources = self.reverse_edges.get(target_item_revision)
+            if sources is not None:
+                sources.discard((item_revision, tag, key))
+                if not sources and target_item_revision not in self.forward_edges:
+                    # nothing is known about the target any more
+                    del self.reverse_edges[target_item_revision]
+        self.forward_edges[item_revision] = []
+
+    def _on_item_created(self, item_revision):
+        """
+        Invoked when an item revision was created, indexes it.
+        """
+        if self.built:
+            self.index_item_revision(item_revision)
+
+    def _on_item_loaded(self, item_revision):
+        """
+        Invoked when an item revision was loaded, indexes it unless it is known already.
+        """
+        if self.built and item_revision not in self.forward_edges:
+            self.index_item_revision(item_revision)
+
+    def _on_item_deleted(self, item_revision):
+        """
+        Invoked when an item revision was deleted, removes it from the index.
+        """
+        if self.built:
+            self.remove_item_revision(item_revision)
+
+    def _on_references_changed(self, item_revision):
+        """
+        Invoked when references of an item revision were set or removed, re-reads its references.
+        """
+        if self.built:
+            self.index_item_revision(item_revision)
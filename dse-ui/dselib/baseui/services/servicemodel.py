@@ -2,7 +2,8 @@ class ServiceDefinition(object):
     """
     Represents the meta-data definition for a service.
     """
-    def __init__(self, service_id, global_flag, module, service, configurator=None):
+    def __init__(self, service_id, global_flag, module, service, configurator=None, depends_on=None, main_thread=False,
+                 preload=False, batch=True):
         """
         Initializes the ServiceDefinition instance.
         service_id -- A string identifying the service.
@@ -10,12 +11,20 @@ class ServiceDefinition(object):
         module -- The module that holds the service.
         service -- The name of the class to instantiate.
         configurator -- The configurator class to instantiate.
+        depends_on -- A list of ids of the services that must be initialized before this one.
+        main_thread -- True if the service must be initialized on the Qt main thread, False otherwise.
+        preload -- True if the service is initialized at startup instead of on first use, False otherwise.
+        batch -- True if the service can be loaded into a headless batch context, False if it needs the UI.
         """
         self.service_id = service_id
         self.global_flag = global_flag
         self.module = module
         self.service = service
         self.configurator = configurator
+        self.depends_on = depends_on if depends_on is not None else []
+        self.main_thread = main_thread
+        self.preload = preload
+        self.batch = batch
 
     def get_id(self):
         """
@@ -46,3 +55,27 @@ class ServiceDefinition(object):
         Retrieves the class name of the configurator to instantiate.
         """
         return self.configurator
+
+    def get_dependencies(self):
+        """
+        Retrieves the ids of the services that must be initialized before this one.
+        """
+        return self.depends_on
+
+    def needs_main_thread(self):
+        """
+        Retrieves whether or not the service must be initialized on the Qt main thread.
+        """
+        return self.main_thread
+
+    def is_preloaded(self):
+        """
+        Retrieves whether or not the service is initialized at startup instead of on first use.
+        """
+        return self.preload
+
+    def supports_batch(self):
+        """
+        Retrieves whether or not the service can be loaded into a headless batch context.
+        """
+        return self.batch
@@ -1,7 +1,7 @@
 import os
 
 from enum import Enum
-from PyQt5.Qt import QSettings
+from PyQt5.QtCore import QSettings
 
 from dselib.baseui.services.dseservice import DseService
 
@@ -0,0 +1,131 @@
+import time
+import traceback
+
+
+# errors considered transient by default, i.e. worth retrying (lost connections, time-outs)
+TRANSIENT_ERRORS = (OSError,)
+
+# the delay in seconds before the first retry, doubled for every further retry
+RETRY_DELAY = 0.5
+
+
+class BatchItemResult(object):
+    """
+    Represents the outcome of a batch operation for a single item revision.
+    """
+    def __init__(self, item_revision):
+        """
+        Initializes the BatchItemResult instance.
+        item_revision -- The item revision the outcome is for.
+        """
+        self.item_revision = item_revision
+
+        # the last stage the operation reached, set by the operation itself (e.g. "open", "add", "save", "checkin")
+        self.stage = None
+        self.succeeded = False
+        self.skipped = False
+        self.error = None
+        self.traceback = None
+        self.attempts = 0
+
+    def __repr__(self):
+        if self.succeeded:
+            return "<BatchItemResult " + str(self.item_revision) + " succeeded>"
+
+        return "<BatchItemResult " + str(self.item_revision) + " failed in " + str(self.stage) + ": " + str(self.error) + ">"
+
+
+def run_batch(item_revisions, operation, dependencies=None, progress=None, retries=0, is_transient=None):
+    """
+    Runs an operation for each of the given item revisions one after the other, collecting the outcome per item revision.
+    An item revision is only run after all item revisions it depends on, if one of them failed the item revision is
+    skipped.  The dependencies must not be cyclic.  Duplicate item revisions are run once and share their result.
+    item_revisions -- The item revisions to run the operation for.
+    operation -- A callable (item_revision, result) running the operation, raising an exception on failure.
+    dependencies -- A dictionary {item revision: [item revisions]} of the item revisions each item revision depends on, None if independent.
+    progress -- A callable (finished count, total count, result) invoked after each distinct item revision.
+    retries -- The number of times an operation failing with a transient error is retried.
+    is_transient -- A callable (exception) telling whether an error is transient, by default TRANSIENT_ERRORS are.
+    returns -- A list of BatchItemResult instances in the order of the given item revisions.
+    """
+    dependencies = dependencies or {}
+    results = []
+    results_by_item = {}
+    for item_revision in item_revisions:
+        if item_revision not in results_by_item:
+            results_by_item[item_revision] = BatchItemResult(item_revision)
+        results.append(results_by_item[item_revision])
+
+    if is_transient is None:
+        is_transient = lambda error: isinstance(error, TRANSIENT_ERRORS)
+
+    ordered = _order_by_dependencies(list(results_by_item.values()), results_by_item, dependencies)
+    for finished_count, result in enumerate(ordered, 1):
+        failed_dependencies = [results_by_item[dependency] for dependency in dependencies.get(result.item_revision, ())
+                               if (dependency in results_by_item) and not results_by_item[dependency].succeeded]
+        if failed_dependencies:
+            result.skipped = True
+            result.error = "Skipped since the referenced item revision " + failed_dependencies[0].item_revision.getName() + " failed!"
+        else:
+            _run_operation(operation, result, retries, is_transient)
+
+        if progress is not None:
+            progress(finished_count, len(ordered), result)
+
+    return results
+
+
+def _run_operation(operation, result, retries, is_transient):
+    """
+    Runs the operation for the item revision of the given result, retrying it after transient errors.
+    """
+    while True:
+        result.attempts += 1
+        try:
+            operation(result.item_revision, result)
+            result.succeeded = True
+            result.error = None
+            result.traceback = None
+            return
+        except Exception as e:
+            result.error = str(e)
+            result.traceback = traceback.format_exc()
+            if result.attempts > retries or not is_transient(e):
+                return
+        time.sleep(RETRY_DELAY * 2 ** (result.attempts - 1))
+
+
+def _order_by_dependencies(pending, results_by_item, dependencies):
+    """
+    Orders the given results so every item revision comes after the item revisions it depends on, otherwise keeping
+    the given order.
+    returns -- A list of BatchItemResult instances.
+    """
+    ordered = []
+    visiting = set()
+    done = set()
+    for root_result in pending:
+        if root_result.item_revision in done:
+            continue
+
+        visiting.add(root_result.item_revision)
+        stack = [(root_result, iter(dependencies.get(root_result.item_revision, ())))]
+        while stack:
+            result, item_dependencies = stack[-1]
+            dependency = next(item_dependencies, None)
+            if dependency is None:
+                stack.pop()
+                visiting.discard(result.item_revision)
+                done.add(result.item_revision)
+                ordered.append(result)
+                continue
+
+            if (dependency not in results_by_item) or (dependency in done):
+                continue
+            if dependency in visiting:
+                raise RuntimeError("Unable to run the batch, cyclic dependency on " + dependency.getName() + "!")
+
+            visiting.add(dependency)
+            stack.append((results_by_item[dependency], iter(dependencies.get(dependency, ()))))
+
+    return ordered
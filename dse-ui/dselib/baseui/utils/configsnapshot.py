@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigSnapshot(object):
+    """
+    Represents a cached snapshot of the parsed DSE configuration files.
+    The snapshot holds the already parsed json documents of every configuration file in load order and is keyed on
+    the path, size and modification time of each of those files, so any change to the configuration invalidates it.
+    """
+    # bump whenever the layout of the snapshot file changes
+    VERSION = 1
+
+    def __init__(self, snapshot_file):
+        """
+        Initializes the ConfigSnapshot instance.
+        snapshot_file -- The path of the file the snapshot is stored in.
+        """
+        self.snapshot_file = snapshot_file
+
+    @staticmethod
+    def build_key(config_files):
+        """
+        Builds the key identifying the given set of configuration files.
+        config_files -- The list of configuration file paths in the order they are loaded.
+        returns -- A list of [path, size, mtime] entries, or None if one of the files can't be read.
+        """
+        key = []
+        for config_file in config_files:
+            try:
+                stat = os.stat(config_file)
+            except OSError:
+                return None
+            key.append([os.path.abspath(config_file), stat.st_size, stat.st_mtime_ns])
+
+        return key
+
+    def load(self, key):
+        """
+        Loads the configuration documents from the snapshot if it was written for the given key.
+        key -- The key of the current configuration files as returned by build_key.
+        returns -- The list of parsed configuration documents, or None if there is no valid snapshot.
+        """
+        if key is None or not os.path.isfile(self.snapshot_file):
+            return None
+
+        try:
+            with open(self.snapshot_file) as snapshot:
+                data = json.load(snapshot)
+        except (OSError, ValueError):
+            # a broken snapshot is simply rebuilt
+            return None
+
+        if data.get("version") != self.VERSION or data.get("key") != key:
+            return None
+
+        return data.get("documents")
+
+    def save(self, key, documents):
+        """
+        Writes the given configuration documents to the snapshot file.
+        Failing to write the snapshot is not an error, the configuration is simply parsed again on the next start.
+        key -- The key of the configuration files the documents were read from.
+        documents -- The list of parsed configuration documents in load order.
+        """
+        if key is None:
+            return
+
+        temp_file = None
+        try:
+            snapshot_dir = os.path.dirname(self.snapshot_file)
+            if snapshot_dir and not os.path.isdir(snapshot_dir):
+                os.makedirs(snapshot_dir)
+
+            # every process writes its own temporary file, so concurrent starts can't interleave their writes
+            with tempfile.NamedTemporaryFile('w', dir=snapshot_dir or None, prefix=os.path.basename(self.snapshot_file) + '.',
+                                             suffix='.tmp', delete=False) as snapshot:
+                temp_file = snapshot.name
+                json.dump({"version": self.VERSION, "key": key, "documents": documents}, snapshot)
+
+            # replace the old snapshot in one step so a concurrent start never sees a partial file
+            os.replace(temp_file, self.snapshot_file)
+        except OSError as e:
+            logger.warning("Unable to write configuration snapshot %s: %s", self.snapshot_file, e)
+            if temp_file is not None and os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
@@ -0,0 +1,133 @@
+from collections import Counter
+
+
+class FolderNameIndex(object):
+    """
+    Represents the index of the names used within a folder, either by its item revisions or by its sub-folders.
+    Unique names are handed out like they always were, the base name itself if it is free, otherwise the base name with
+    the lowest free numeric suffix.  Per base name and name format the index remembers below which suffix all names are
+    taken, so asking again doesn't try the same candidates one after the other.
+    Name formats are strings like "{base} ({index})" describing how a suffix is appended to a base name.
+    """
+    def __init__(self, names):
+        """
+        Initializes the FolderNameIndex instance.
+        names -- The names currently used within the folder, in the order of the folder's entries.
+        """
+        self.entry_names = ()
+
+        # {name: number of entries using it}, several entries may share a name
+        self.name_counts = Counter()
+
+        # names handed out by reserve_unique_names for entries that haven't been added to the folder yet
+        self.reserved_names = set()
+
+        # {(base name, name format): suffix below which all names are used}
+        self.next_suffixes = {}
+
+        self.reset(names)
+
+    def is_current(self, names):
+        """
+        Retrieves whether or not the index was built from the given names, i.e. the folder didn't change since.
+        names -- The names currently used within the folder, in the order of the folder's entries.
+        """
+        return self.entry_names == tuple(names)
+
+    def reset(self, names):
+        """
+        Re-reads the names used within the folder, reserved names are kept until an entry uses them.
+        names -- The names currently used within the folder, in the order of the folder's entries.
+        """
+        self.entry_names = tuple(names)
+        self.name_counts = Counter(self.entry_names)
+        self.reserved_names -= set(self.name_counts)
+        self.next_suffixes.clear()
+
+    def is_used(self, name):
+        """
+        Retrieves whether or not the given name is used within the folder or was reserved.
+        """
+        return (name in self.name_counts) or (name in self.reserved_names)
+
+    def reserve(self, name):
+        """
+        Reserves the given name, so it isn't handed out again before the entry using it is added to the folder.
+        """
+        self.reserved_names.add(name)
+
+    def release(self, name):
+        """
+        Releases the reservation of the given name, e.g. because the entry it was reserved for won't be added.
+        """
+        if name not in self.reserved_names:
+            return
+
+        self.reserved_names.discard(name)
+        if not self.is_used(name):
+            self._name_freed(name)
+
+    def get_unique_name(self, base_name, name_format):
+        """
+        Retrieves a name not used within the folder, the base name itself if it is free.
+        The name isn't reserved, see reserve_unique_names.
+        base_name -- The name to derive the unique name from.
+        name_format -- The format appending a suffix to the base name, e.g. "{base}_{index}".
+        returns -- A string defining a unique name within the folder.
+        """
+        if not self.is_used(base_name):
+            return base_name
+
+        key = (base_name, name_format)
+        index = self.next_suffixes.get(key, 1)
+        name = name_format.format(base=base_name, index=index)
+        while self.is_used(name):
+            index += 1
+            name = name_format.format(base=base_name, index=index)
+        self.next_suffixes[key] = index
+
+        return name
+
+    def reserve_unique_names(self, base_name, count, name_format):
+        """
+        Retrieves the given number of distinct names not used within the folder and reserves them, so they aren't
+        handed out again before the entries using them are added to the folder.
+        base_name -- The name to derive the unique names from.
+        count -- The number of names to reserve.
+        name_format -- The format appending a suffix to the base name, e.g. "{base}_{index}".
+        returns -- A list of strings defining unique names within the folder.
+        """
+        names = []
+        for _i in range(count):
+            name = self.get_unique_name(base_name, name_format)
+            self.reserve(name)
+            names.append(name)
+
+        return names
+
+    def _name_freed(self, name):
+        """
+        Lowers the suffixes remembered per base name and name format if the given name, which is free now, was built
+        from them, so the gap is handed out again.
+        """
+        for key, next_suffix in list(self.next_suffixes.items()):
+            suffix = self._parse_suffix(name, key[0], key[1])
+            if 0 < suffix < next_suffix:
+                self.next_suffixes[key] = suffix
+
+    def _parse_suffix(self, name, base_name, name_format):
+        """
+        Retrieves the suffix of the given name if it was built from the base name with the name format.
+        returns -- The suffix, 0 if the name wasn't built that way.
+        """
+        prefix, _separator, postfix = name_format.partition("{index}")
+        prefix = prefix.format(base=base_name)
+        postfix = postfix.format(base=base_name)
+        if not (name.startswith(prefix) and name.endswith(postfix)) or len(name) <= len(prefix) + len(postfix):
+            return 0
+
+        suffix = name[len(prefix):len(name) - len(postfix)]
+        if not suffix.isdigit() or str(int(suffix)) != suffix:
+            return 0
+
+        return int(suffix)
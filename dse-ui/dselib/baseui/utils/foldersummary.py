@@ -0,0 +1,167 @@
+from collections import Counter
+
+
+class FolderSummary(object):
+    """
+    Represents the statistics of a folder or of a whole folder tree.
+    """
+    def __init__(self):
+        """
+        Initializes the FolderSummary instance.
+        """
+        self.item_count = 0
+        self.folder_count = 0
+
+        # {CPD state: number of item revisions}
+        self.state_histogram = Counter()
+
+    def add(self, summary):
+        """
+        Adds the statistics of another summary to this one.
+        """
+        self.item_count += summary.item_count
+        self.folder_count += summary.folder_count
+        self.state_histogram.update(summary.state_histogram)
+
+
+class FolderSummaryCache(object):
+    """
+    Represents the cache of the folder statistics of the local workspace.
+    The statistics of the item revisions directly in a folder are kept per folder and only re-read when the folder's
+    entries or the state of one of its item revisions changed, the statistics of a folder tree are the sum of them.
+    The entries of a folder are compared by identity, so entries replaced by others are noticed even if the counts
+    stay the same.  The code changing folders should still call invalidate_folder, so the trees holding the folder
+    are summed up again without having to compare their entries first.
+    """
+    def __init__(self, has_sub_folders):
+        """
+        Initializes the FolderSummaryCache instance.
+        has_sub_folders -- A callable (folder) telling whether the folder has sub-folders to descend into.
+        """
+        self.has_sub_folders = has_sub_folders
+
+        # {folder: ((item revisions, sub-folders), FolderSummary of the folder's own item revisions)}
+        self.own_summaries = {}
+
+        # {folder: FolderSummary of the folder tree}
+        self.tree_summaries = {}
+
+        # {folder: parent folder} of the folders summarized so far
+        self.parents = {}
+
+        # {item revision: set of folders holding the item revision}
+        self.item_folders = {}
+
+    def get_summary(self, folder, max_depth=None):
+        """
+        Retrieves the statistics of the given folder tree.
+        Checking whether the cached statistics are still valid compares the entries of every folder of the tree, but
+        reads no item revision unless its folder changed.
+        folder -- The root of the folder tree.
+        max_depth -- The number of sub-folder levels to include, 0 for the folder itself only, None for all levels.
+        returns -- A FolderSummary instance, which must not be modified.
+        """
+        if max_depth is not None:
+            # only whole trees are cached, a partial tree is summed up from the folders' own statistics
+            summary = FolderSummary()
+            stack = [(folder, 0)]
+            while stack:
+                current_folder, depth = stack.pop()
+                summary.add(self._get_own_summary(current_folder))
+                if self.has_sub_folders(current_folder) and (depth < max_depth):
+                    stack.extend((sub_folder, depth + 1) for sub_folder in current_folder.sub_folders)
+            return summary
+
+        # post-order walk, a folder is summed up after all of its sub-folders
+        stack = [(folder, False)]
+        while stack:
+            current_folder, sub_folders_done = stack.pop()
+            sub_folders = current_folder.sub_folders if self.has_sub_folders(current_folder) else ()
+            if not sub_folders_done:
+                self._get_own_summary(current_folder)
+                stack.append((current_folder, True))
+                for sub_folder in sub_folders:
+                    self.parents[sub_folder] = current_folder
+                    stack.append((sub_folder, False))
+            elif current_folder not in self.tree_summaries:
+                tree_summary = FolderSummary()
+                tree_summary.add(self.own_summaries[current_folder][1])
+                for sub_folder in sub_folders:
+                    tree_summary.add(self.tree_summaries[sub_folder])
+                self.tree_summaries[current_folder] = tree_summary
+
+        return self.tree_summaries[folder]
+
+    def invalidate_item(self, item_revision):
+        """
+        Drops the statistics of the folders holding the given item revision, e.g. after its state changed.
+        """
+        for folder in self.item_folders.get(item_revision, ()):
+            self.invalidate_folder(folder)
+
+    def invalidate_folder(self, folder):
+        """
+        Drops the statistics of the given folder and of the folder trees it is part of.
+        """
+        self.own_summaries.pop(folder, None)
+        self._invalidate_tree_summaries(folder)
+
+    def remove_folder(self, folder):
+        """
+        Drops everything kept for the given folder after it was deleted, so the cache doesn't keep it alive.
+        """
+        self._invalidate_tree_summaries(folder)
+        cached = self.own_summaries.pop(folder, None)
+        if cached is not None:
+            self._forget_item_folders(folder, cached[0][0])
+        self.parents.pop(folder, None)
+
+    def remove_item(self, item_revision):
+        """
+        Drops the statistics of the folders holding the given item revision after it was deleted and forgets it.
+        """
+        self.invalidate_item(item_revision)
+        self.item_folders.pop(item_revision, None)
+
+    def _invalidate_tree_summaries(self, folder):
+        """
+        Drops the statistics of the folder trees the given folder is part of.
+        """
+        while folder is not None:
+            self.tree_summaries.pop(folder, None)
+            folder = self.parents.get(folder)
+
+    def _get_own_summary(self, folder):
+        """
+        Retrieves the statistics of the item revisions directly in the given folder, re-read if its entries changed.
+        """
+        sub_folders = folder.sub_folders if self.has_sub_folders(folder) else ()
+        fingerprint = (tuple(folder.contained_item_revisions), tuple(sub_folders))
+        cached = self.own_summaries.get(folder)
+        if cached is not None:
+            if cached[0] == fingerprint:
+                return cached[1]
+            self._forget_item_folders(folder, set(cached[0][0]) - set(fingerprint[0]))
+
+        summary = FolderSummary()
+        summary.folder_count = len(sub_folders)
+        for item_revision in folder.contained_item_revisions:
+            summary.item_count += 1
+            summary.state_histogram[item_revision.getCpdState()] += 1
+            self.item_folders.setdefault(item_revision, set()).add(folder)
+
+        self.own_summaries[folder] = (fingerprint, summary)
+        self._invalidate_tree_summaries(folder)
+
+        return summary
+
+    def _forget_item_folders(self, folder, item_revisions):
+        """
+        Forgets that the given item revisions are held by the folder, after they were removed from it.
+        """
+        for item_revision in item_revisions:
+            folders = self.item_folders.get(item_revision)
+            if folders is not None:
+                folders.discard(folder)
+                if not folders:
+                    del self.item_folders[item_revision]
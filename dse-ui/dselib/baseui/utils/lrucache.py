@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """
+    Represents a dictionary of bounded size dropping the least recently used entries first.
+    """
+    def __init__(self, capacity, evicted=None):
+        """
+        Initializes the LruCache instance.
+        capacity -- The maximum number of entries.
+        evicted -- A callable (key, value) invoked for every entry dropped because the cache is full, or None.
+        """
+        self.capacity = capacity
+        self.evicted = evicted
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """
+        Retrieves the value stored for the given key, marking it as the most recently used.
+        returns -- The value, or default if there is none.
+        """
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            return default
+
+        self.entries[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a value for the given key, dropping the least recently used entry if the cache is full.
+        """
+        self.entries.pop(key, None)
+        self.entries[key] = value
+        while len(self.entries) > self.capacity:
+            evicted_key, evicted_value = self.entries.popitem(last=False)
+            if self.evicted is not None:
+                self.evicted(evicted_key, evicted_value)
+
+    def pop(self, key, default=None):
+        """
+        Removes the value stored for the given key.
+        returns -- The value, or default if there is none.
+        """
+        return self.entries.pop(key, default)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self.entries.clear()
@@ -0,0 +1,147 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+
+from dselib.baseui.services.dseservice import DseService
+
+
+class MethodMetrics(object):
+    """
+    Represents the call statistics of a single service method.
+    Latencies are kept in a fixed histogram, so the memory used doesn't grow with the number of calls.
+    """
+    # upper bounds of the histogram buckets in milliseconds, the last bucket takes everything slower
+    BUCKET_BOUNDS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0,
+                     1000.0, 2500.0, 5000.0, 10000.0, 30000.0]
+
+    def __init__(self):
+        """
+        Initializes the MethodMetrics instance.
+        """
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * (len(self.BUCKET_BOUNDS) + 1)
+
+    def add(self, duration, failed=False):
+        """
+        Records a single call.
+        duration -- The duration of the call in milliseconds.
+        failed -- True if the call raised an exception, False otherwise.
+        """
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.buckets[bisect.bisect_left(self.BUCKET_BOUNDS, duration)] += 1
+
+    def percentile(self, fraction):
+        """
+        Estimates the latency percentile from the histogram.
+        fraction -- The percentile as a fraction, e.g. 0.95.
+        returns -- The upper bound of the bucket holding the percentile in milliseconds (the maximum for the last bucket).
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(self.BUCKET_BOUNDS):
+                    return min(self.BUCKET_BOUNDS[index], self.max_time)
+                break
+
+        return self.max_time
+
+    def to_dict(self):
+        """
+        Retrieves the statistics as a json serializable dictionary, times are in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": self.total_time,
+            "mean_ms": self.total_time / self.count if self.count else 0.0,
+            "max_ms": self.max_time,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            # [upper bound in ms, count] pairs, the bound of the overflow bucket is null
+            "histogram": [list(bucket) for bucket in zip(self.BUCKET_BOUNDS + [None], self.buckets)],
+        }
+
+
+class ServiceMetrics(object):
+    """
+    Represents the call statistics of all instrumented service methods, keyed by "service_id.method".
+    """
+    # the service life cycle methods are called once and aren't interesting here
+    EXCLUDED_METHODS = ("register_service", "initialize_service", "unregister_service", "get_id")
+
+    def __init__(self):
+        """
+        Initializes the ServiceMetrics instance.
+        """
+        self.methods = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, duration, failed=False):
+        """
+        Records a single call of the method with the given name.
+        name -- The "service_id.method" name of the method.
+        duration -- The duration of the call in milliseconds.
+        failed -- True if the call raised an exception, False otherwise.
+        """
+        with self.lock:
+            method_metrics = self.methods.get(name)
+            if method_metrics is None:
+                method_metrics = self.methods[name] = MethodMetrics()
+            method_metrics.add(duration, failed)
+
+    def to_dict(self):
+        """
+        Retrieves the statistics of all methods as a json serializable dictionary.
+        """
+        with self.lock:
+            return dict((name, method_metrics.to_dict()) for name, method_metrics in self.methods.items())
+
+    def instrument(self, service):
+        """
+        Wraps the public methods the given service defines itself (i.e. not those of DseService or QObject)
+        so every call is recorded.  Generator methods are left alone since only their creation could be timed.
+        service -- The DseService instance to instrument.
+        """
+        for cls in type(service).__mro__:
+            if cls is DseService:
+                break
+            for name, member in list(vars(cls).items()):
+                if name.startswith('_') or name in self.EXCLUDED_METHODS or name in vars(service):
+                    continue
+                if not inspect.isfunction(member) or inspect.isgeneratorfunction(member):
+                    continue
+                setattr(service, name, self._wrap(service.get_id() + "." + name, getattr(service, name)))
+
+    def _wrap(self, name, method):
+        """
+        Creates the recording wrapper for a bound method.
+        name -- The "service_id.method" name to record the calls under.
+        method -- The bound method to wrap.
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000.0, failed)
+
+        return wrapper
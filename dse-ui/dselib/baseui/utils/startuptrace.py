@@ -0,0 +1,156 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class StartupTrace(object):
+    """
+    Represents a recorder for nested timings taken while DSE starts up.
+    Recording is off by default, in which case spans cost next to nothing.  Once enabled, every span is kept and
+    written as a Chrome trace-event file (loadable in chrome://tracing or Perfetto) plus a text summary sorted by time.
+    """
+    def __init__(self):
+        """
+        Initializes the StartupTrace instance.
+        """
+        self.enabled = False
+        self.output_path = None
+        self.events = []
+        self.written = False
+        self.origin = time.perf_counter()
+        # wall clock time of the origin, so external tools can relate the trace to the process launch
+        self.origin_epoch = time.time()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def enable(self, output_path):
+        """
+        Starts recording spans.
+        output_path -- The path of the Chrome trace file, the summary is written next to it with a .txt extension.
+        """
+        self.enabled = True
+        self.output_path = output_path
+
+    def is_enabled(self):
+        """
+        Retrieves whether or not spans are currently being recorded.
+        """
+        return self.enabled
+
+    @contextlib.contextmanager
+    def span(self, name, category="startup", **args):
+        """
+        Records the time spent in the enclosed block as a span nested in any span open on the same thread.
+        name -- The name of the span.
+        category -- The category of the span, used to group spans in the trace viewer.
+        args -- Additional values shown with the span in the trace viewer.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+
+        # each open span accumulates the time spent in its children so we can report self time
+        frame = [0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            self._add_event({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(args, depth=len(stack), self_us=(duration - frame[0]) * 1e6),
+            })
+
+    def mark(self, name, category="startup"):
+        """
+        Records a single point in time, e.g. the first paint of the main window.
+        name -- The name of the mark.
+        category -- The category of the mark.
+        """
+        if not self.enabled:
+            return
+
+        self._add_event({
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": (time.perf_counter() - self.origin) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        })
+
+    def finish(self):
+        """
+        Stops recording and writes the trace and the summary files.
+        Only the first call writes anything, so it is safe to call this from several shutdown paths.
+        """
+        if not self.enabled or self.written:
+            return
+
+        self.enabled = False
+        self.written = True
+        with self.lock:
+            events = list(self.events)
+
+        output_dir = os.path.dirname(self.output_path)
+        if output_dir and not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        with open(self.output_path, 'w') as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"origin_epoch": self.origin_epoch}}, trace_file)
+
+        summary_path = os.path.splitext(self.output_path)[0] + '.txt'
+        with open(summary_path, 'w') as summary_file:
+            summary_file.write(self.format_summary(events))
+
+        print('Startup trace written to: ', self.output_path)
+
+    def format_summary(self, events):
+        """
+        Formats the given events as a text table sorted by descending total time.
+        events -- The list of recorded trace events.
+        returns -- A string holding the summary.
+        """
+        lines = ["%10s %10s  %-10s %s" % ("total ms", "self ms", "category", "name")]
+        spans = [event for event in events if event["ph"] == "X"]
+        for event in sorted(spans, key=lambda e: e["dur"], reverse=True):
+            lines.append("%10.2f %10.2f  %-10s %s%s" % (event["dur"] / 1000.0, event["args"]["self_us"] / 1000.0,
+                                                      event["cat"], "  " * event["args"]["depth"], event["name"]))
+
+        marks = [event for event in events if event["ph"] == "i"]
+        if marks:
+            lines.append("")
+            for event in sorted(marks, key=lambda e: e["ts"]):
+                lines.append("%10.2f ms  %s" % (event["ts"] / 1000.0, event["name"]))
+
+        return "\n".join(lines) + "\n"
+
+    def _add_event(self, event):
+        """
+        Adds a finished event to the recording.
+        event -- The trace event dictionary to add.
+        """
+        with self.lock:
+            self.events.append(event)
+
+
+# the single recorder shared by the whole process
+startup_trace = StartupTrace()
@@ -0,0 +1,79 @@
+
+
+class ItemStateSnapshot(object):
+    """
+    Represents the CPD state, owner, opened flag and item type of a set of item revisions captured at one point in time.
+    The values are kept in parallel columns, so an eligibility check is a few passes over plain lists instead of
+    several calls into the item revisions per item revision.
+    """
+    def __init__(self, item_revisions, editable_flags, is_opened, user_name):
+        """
+        Initializes the ItemStateSnapshot instance, capturing the current values.
+        item_revisions -- The item revisions to capture.
+        editable_flags -- A list of flags parallel to item_revisions, True for the editable item revisions of a workset.
+        is_opened -- A callable (item_revision) telling whether the item revision is open in a workset.
+        user_name -- The name of the current user, kept with the snapshot for owner checks.
+        """
+        self.item_revisions = list(item_revisions)
+        self.editable = list(editable_flags)
+        self.item_types = [item_revision.getItemType() for item_revision in self.item_revisions]
+        self.item_revision_set = set(self.item_revisions)
+        self.refresh(is_opened, user_name)
+
+    def refresh(self, is_opened, user_name):
+        """
+        Re-reads the values that change while the item revisions stay the same, i.e. the CPD state, owner and opened
+        flag, and the name of the current user.  The item revisions and their item types are kept.
+        is_opened -- A callable (item_revision) telling whether the item revision is open in a workset.
+        user_name -- The name of the current user, kept with the snapshot for owner checks.
+        """
+        # the columns are replaced rather than updated, so a concurrent select sees either the old or the new values
+        self.states = [item_revision.getCpdState() for item_revision in self.item_revisions]
+        self.owners = [item_revision.getOwner() for item_revision in self.item_revisions]
+        self.opened = [bool(is_opened(item_revision)) for item_revision in self.item_revisions]
+        self.user_name = user_name
+
+    def __len__(self):
+        return len(self.item_revisions)
+
+    def contains(self, item_revision):
+        """
+        Retrieves whether or not the given item revision is part of the snapshot.
+        """
+        return item_revision in self.item_revision_set
+
+    def select(self, states=None, exclude_states=None, owners=None, exclude_owners=None, opened=None, editable=None, item_types=None):
+        """
+        Selects the item revisions matching all of the given criteria, criteria that are None are ignored.
+        states -- A collection of CPD states of which the state must be one.
+        exclude_states -- A collection of CPD states of which the state must not be one.
+        owners -- A collection of user names of which the owner must be one.
+        exclude_owners -- A collection of user names of which the owner must not be one.
+        opened -- True to select the item revisions open in a workset, False for the others.
+        editable -- True to select the editable item revisions of the workset, False for the others.
+        item_types -- A collection of item types of which the item type must be one.
+        returns -- A list of indices into the columns, in ascending order.
+        """
+        mask = [True] * len(self.item_revisions)
+        if states is not None:
+            mask = [selected and (state in states) for selected, state in zip(mask, self.states)]
+        if exclude_states is not None:
+            mask = [selected and (state not in exclude_states) for selected, state in zip(mask, self.states)]
+        if owners is not None:
+            mask = [selected and (owner in owners) for selected, owner in zip(mask, self.owners)]
+        if exclude_owners is not None:
+            mask = [selected and (owner not in exclude_owners) for selected, owner in zip(mask, self.owners)]
+        if opened is not None:
+            mask = [selected and (item_opened == opened) for selected, item_opened in zip(mask, self.opened)]
+        if editable is not None:
+            mask = [selected and (item_editable == editable) for selected, item_editable in zip(mask, self.editable)]
+        if item_types is not None:
+            mask = [selected and (item_type in item_types) for selected, item_type in zip(mask, self.item_types)]
+
+        return [index for index, selected in enumerate(mask) if selected]
+
+    def get_item_revisions(self, indices):
+        """
+        Retrieves the item revisions at the given indices.
+        """
+        return [self.item_revisions[index] for index in indices]
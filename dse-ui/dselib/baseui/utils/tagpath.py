@@ -0,0 +1,142 @@
+
+
+class TagPath(object):
+    """
+    Represents a reference tag path compiled from its dot notation, e.g. "task.input".
+    """
+    def __init__(self, tag):
+        """
+        Initializes the TagPath instance.
+        tag -- A string defining the tag path, either direct (i.e. single tag) or indirect (i.e. dot notation tag).
+        """
+        self.tag = tag
+        self.segments = tuple(tag.split('.'))
+        self.parent_segments = self.segments[:-1]
+        self.leaf = self.segments[-1]
+
+
+class TagPathResolver(object):
+    """
+    Represents the resolver of reference tag paths on item revisions.
+    Tag paths are split once and whether a tag is array-valued is looked up once per (item definition, tag), so
+    resolving the same paths over many item revisions only costs the getReference calls.
+    """
+    def __init__(self):
+        """
+        Initializes the TagPathResolver instance.
+        """
+        # {tag path string: TagPath}
+        self.tag_paths = {}
+
+        # {(item definition name, tag): True if the reference is array-valued}
+        self.array_tags = {}
+
+    def compile(self, tag):
+        """
+        Retrieves the compiled form of the given tag path.
+        tag -- A string defining the tag path.
+        returns -- A TagPath instance.
+        """
+        tag_path = self.tag_paths.get(tag)
+        if tag_path is None:
+            tag_path = self.tag_paths[tag] = TagPath(tag)
+
+        return tag_path
+
+    def is_array(self, item_revision, tag):
+        """
+        Retrieves whether or not the reference with the given (single) tag is array-valued on the given item revision.
+        item_revision -- The item revision holding the reference.
+        tag -- The tag of the reference.
+        """
+        definition = item_revision.getDefinition()
+        key = (definition.getName(), tag)
+        array = self.array_tags.get(key)
+        if array is None:
+            array = self.array_tags[key] = definition.getReferenceDefinitionByTag(tag).isArray()
+
+        return array
+
+    def resolve_parent(self, item_revision, tag):
+        """
+        Follows all but the last tag of the given tag path.
+        item_revision -- The item revision to start from.
+        tag -- A string defining the tag path.
+        returns -- The item revision holding the last tag of the path, None if the path is broken before it.
+        """
+        for tag_element in self.compile(tag).parent_segments:
+            item_revision = item_revision.getReference(tag_element)
+            if item_revision is None:
+                return None
+
+        return item_revision
+
+    def resolve_target(self, item_revision, tag):
+        """
+        Follows all tags of the given tag path.
+        item_revision -- The item revision to start from.
+        tag -- A string defining the tag path.
+        returns -- The referenced item revision, None if the path is broken.
+        """
+        for tag_element in self.compile(tag).segments:
+            item_revision = item_revision.getReference(tag_element)
+            if item_revision is None:
+                return None
+
+        return item_revision
+
+    def resolve_references(self, item_revision, tag):
+        """
+        Retrieves the references defined by the given tag path, see ItemService.get_indirect_references.
+        item_revision -- The item revision to start from.
+        tag -- A string defining the tag path.
+        returns -- A list of item revisions, empty if the path is broken.
+        """
+        return self.resolve_references_batch([item_revision], tag)[0]
+
+    def resolve_references_batch(self, item_revisions, tag, visited=None):
+        """
+        Retrieves the references defined by the given tag path for each of the given item revisions.
+        Intermediate item revisions shared by several of the paths (e.g. a common task) are only resolved once.
+        item_revisions -- The item revisions to start from.
+        tag -- A string defining the tag path.
+        visited -- A set to which the given and all intermediate item revisions are added, or None.
+        returns -- A list holding the list of references of each of the given item revisions, in the same order.
+        """
+        segments = self.compile(tag).segments
+
+        # {(item revision, segment index): references of the remaining path or None if it is broken}
+        resolved = {}
+
+        def resolve_from(base_item_revision, index):
+            if index == len(segments):
+                # we got a final reference
+                return [base_item_revision]
+
+            key = (base_item_revision, index)
+            if key in resolved:
+                return resolved[key]
+            if visited is not None:
+                visited.add(base_item_revision)
+
+            tag_element = segments[index]
+            if self.is_array(base_item_revision, tag_element):
+                # note: this only works if the array reference is last in the dot notation query
+                # we have no support for intermediate array queries
+                remaining = resolve_from(base_item_revision, index + 1)
+                if remaining is not None:
+                    remaining = [base_item_revision.getReference(tag_element, reference_key)
+                                 for reference_key in base_item_revision.getReferenceKeys(tag_element)] + remaining
+            else:
+                next_item_revision = base_item_revision.getReference(tag_element)
+                remaining = None if next_item_revision is None else resolve_from(next_item_revision, index + 1)
+
+            resolved[key] = remaining
+            return remaining
+
+        references = []
+        for item_revision in item_revisions:
+            remaining = resolve_from(item_revision, 0)
+            references.append([] if remaining is None else list(remaining))
+
+        return references
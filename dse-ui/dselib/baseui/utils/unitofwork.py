@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+
+class UnitOfWork(object):
+    """
+    Represents the item revisions changed within a block of item service operations, which are saved once at its end.
+    Only the creation of item revisions can be undone, see ItemService.unit_of_work.
+    """
+    def __init__(self):
+        """
+        Initializes the UnitOfWork instance.
+        """
+        # {item revision: close after saving or None for the default} in the order of the first change
+        self.dirty_item_revisions = OrderedDict()
+
+        # item revisions created within the block, deleted again if the block fails
+        self.created_item_revisions = []
+
+    def mark_dirty(self, item_revision, close_after=None):
+        """
+        Records that the given item revision has to be saved, repeated saves of an item revision are coalesced.
+        The last close_after given for an item revision other than None wins.
+        item_revision -- The item revision to save.
+        close_after -- True to close the item revision after saving, False to keep it open, None for the default.
+        """
+        if close_after is None:
+            close_after = self.dirty_item_revisions.get(item_revision)
+        self.dirty_item_revisions[item_revision] = close_after
+
+    def mark_created(self, item_revision):
+        """
+        Records that the given item revision was created within the block.
+        """
+        self.created_item_revisions.append(item_revision)
+
+    def take_dirty(self, item_revision):
+        """
+        Removes the given item revision from the item revisions to save, e.g. because it has to be saved right away.
+        returns -- A tuple (item revision, close after) if it had to be saved, None otherwise.
+        """
+        if item_revision not in self.dirty_item_revisions:
+            return None
+
+        return (item_revision, self.dirty_item_revisions.pop(item_revision))
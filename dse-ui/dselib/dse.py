@@ -10,14 +10,46 @@ from sip import SIP_VERSION_STR
 
 from dselib.baseui.dseapp import DseApp
 from dselib.baseui.appcontext import AppContext
+from dselib.baseui.utils.startuptrace import startup_trace
+
+
+def _enable_startup_trace(argv):
+    """
+    Turns on startup tracing if requested by the DSE_STARTUP_TRACE environment variable or the --trace-startup[=path] flag.
+    The flag is removed from argv because the remaining arguments are positional.
+    argv -- The command line arguments.
+    returns -- The command line arguments without the trace flag.
+    """
+    trace_path = os.environ.get('DSE_STARTUP_TRACE')
+    remaining_args = []
+    for arg in argv:
+        if arg == '--trace-startup':
+            trace_path = ''
+        elif arg.startswith('--trace-startup='):
+            trace_path = arg.split('=', 1)[1]
+        else:
+            remaining_args.append(arg)
+
+    if trace_path is not None:
+        if not trace_path:
+            trace_path = os.path.join(os.path.expanduser('~'), '.dse', 'dse_startup_trace.json')
+        startup_trace.enable(trace_path)
+
+    return remaining_args
 
 
 def main():
 
+    sys.argv = _enable_startup_trace(sys.argv)
     app = QApplication(sys.argv)
     app_context = AppContext()
-    app_context.initialize(sys.argv)
-    dse_app = DseApp(app_context)
+    with startup_trace.span("AppContext.initialize"):
+        app_context.initialize(sys.argv)
+    # configuration engineers can have changes to the config files picked up without restarting
+    if os.environ.get('DSE_WATCH_CONFIG') is not None:
+        app_context.watch_configuration()
+    with startup_trace.span("DseApp.__init__"):
+        dse_app = DseApp(app_context)
 
     # if a perspective name was passed on the command line, start ACES in that perspective
     if len(sys.argv) > 1:
@@ -27,9 +59,15 @@ def main():
 
     dse_app.create_view(initial_perspective)
 
+    # used by the startup benchmark, quits as soon as the window has been painted
+    if os.environ.get('DSE_EXIT_AFTER_STARTUP') is not None:
+        dse_app.dse_win.first_painted.connect(app.quit)
+
     return_code = app.exec_()
 
     app_context.close()
+    # in case the window never painted
+    startup_trace.finish()
 
     sys.exit(return_code)
 
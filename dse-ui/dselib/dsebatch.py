@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Headless batch entry point for DSE.
+Only the global services not needing the UI are loaded (see the "batch" flag of the service definitions), no
+window is created and no event loop is run.
+
+usage:
+    dsebatch.py [--workspace PATH] add-to-cpd --projects P1,P2 ITEM_ID/REVISION ...
+    dsebatch.py [--workspace PATH] complete ITEM_ID/REVISION ...
+    dsebatch.py [--workspace PATH] audit-references ITEM_ID/REVISION ...
+    dsebatch.py [--workspace PATH] run SCRIPT [ARGS ...]
+
+Item revisions can also be read from a file with one ITEM_ID/REVISION per line by passing @FILE.
+Scripts passed to run are executed with app_context, item_service and args defined.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+
+from PyQt5.QtCore import QCoreApplication
+
+from dselib.baseui.appcontext import AppContext
+
+
+def _read_item_specs(specs):
+    """
+    Expands the given item specifications, replacing @FILE entries by the lines of that file.
+    specs -- A list of ITEM_ID/REVISION strings or @FILE references.
+    returns -- A list of (item_id, revision) tuples.
+    """
+    expanded = []
+    for spec in specs:
+        if spec.startswith('@'):
+            with open(spec[1:]) as spec_file:
+                expanded.extend(line.strip() for line in spec_file if line.strip() and not line.startswith('#'))
+        else:
+            expanded.append(spec)
+
+    item_specs = []
+    for spec in expanded:
+        if '/' not in spec:
+            raise ValueError("Ill-formed item revision \"" + spec + "\" - expected ITEM_ID/REVISION!")
+        item_specs.append(tuple(spec.rsplit('/', 1)))
+
+    return item_specs
+
+
+def _resolve_items(item_service, specs):
+    """
+    Resolves the given item specifications into item revisions.
+    item_service -- The item service used to resolve the item revisions.
+    specs -- A list of ITEM_ID/REVISION strings or @FILE references.
+    returns -- A list of item revisions.
+    """
+    return [item_service.resolve_item(item_id, revision) for item_id, revision in _read_item_specs(specs)]
+
+
+def _report(errors):
+    """
+    Writes the given errors to stderr.
+    errors -- A list of error messages.
+    returns -- The process exit code, 0 without errors and 1 otherwise.
+    """
+    for error in errors:
+        sys.stderr.write(error + '\n')
+
+    return 1 if errors else 0
+
+
+def _print_progress(finished_count, total_count, result):
+    """
+    Prints a progress line for an item revision a batch operation finished.
+    """
+    print('%d / %d %s %s' % (finished_count, total_count, result.item_revision.getName(), 'ok' if result.succeeded else 'FAILED'))
+
+
+def _describe_failure(result):
+    """
+    Retrieves the error message for a failed BatchItemResult.
+    """
+    return result.item_revision.getName() + ': ' + result.error
+
+
+def add_to_cpd(app_context, args):
+    """
+    Adds the given item revisions and the Local item revisions they reference to CPD.
+    """
+    item_service = app_context.get_service("Item")
+    item_revisions = item_service.collect_items_for_cpd(_resolve_items(item_service, args.items))
+    projects = [project for project in args.projects.split(',') if project]
+    print('Adding', len(item_revisions), 'item revisions to CPD')
+
+    results = item_service.add_items_to_cpd_batch(item_revisions, projects, progress=_print_progress)
+
+    return _report([_describe_failure(result) for result in results if not result.succeeded])
+
+
+def complete(app_context, args):
+    """
+    Completes the given item revisions in CPD.
+    """
+    item_service = app_context.get_service("Item")
+    results = item_service.complete_items_batch(_resolve_items(item_service, args.items), args.retries, _print_progress)
+
+    return _report([_describe_failure(result) for result in results if not result.succeeded])
+
+
+def audit_references(app_context, args):
+    """
+    Lists the non-completed item revisions referenced by each of the given item revisions.
+    """
+    item_service = app_context.get_service("Item")
+    found = False
+    for item_revision in _resolve_items(item_service, args.items):
+        references = []
+        item_service.find_non_completed_references(item_revision, references)
+        for reference in references:
+            found = True
+            print('%s\t%s\t%s' % (item_revision.getName(), reference.getName(), reference.getCpdState()))
+
+    return 1 if found else 0
+
+
+def run_script(app_context, args):
+    """
+    Runs a python script with the batch context.
+    """
+    init_globals = {
+        'app_context': app_context,
+        'item_service': app_context.get_service("Item"),
+        'args': args.script_args,
+    }
+    runpy.run_path(args.script, init_globals=init_globals, run_name='__main__')
+
+    return 0
+
+
+def _parse_args(argv):
+    """
+    Parses the command line of the batch entry point.
+    argv -- The command line arguments without the program name.
+    """
+    parser = argparse.ArgumentParser(prog='dse-batch', description='Runs bulk DSE operations without the UI.')
+    parser.add_argument('--workspace', help='path of the local workspace to use')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('add-to-cpd', help='add item revisions and their Local references to CPD')
+    command.add_argument('--projects', required=True, help='comma separated list of projects')
+    command.add_argument('items', nargs='+', help='ITEM_ID/REVISION or @FILE')
+    command.set_defaults(handler=add_to_cpd)
+
+    command = commands.add_parser('complete', help='complete item revisions in CPD')
+    command.add_argument('--retries', type=int, default=2, help='retries of completions failing with a transient error')
+    command.add_argument('items', nargs='+', help='ITEM_ID/REVISION or @FILE')
+    command.set_defaults(handler=complete)
+
+    command = commands.add_parser('audit-references', help='list non-completed references of item revisions')
+    command.add_argument('items', nargs='+', help='ITEM_ID/REVISION or @FILE')
+    command.set_defaults(handler=audit_references)
+
+    command = commands.add_parser('run', help='run a python script with the batch context')
+    command.add_argument('script')
+    command.add_argument('script_args', nargs=argparse.REMAINDER)
+    command.set_defaults(handler=run_script)
+
+    return parser.parse_args(argv)
+
+
+def main():
+
+    args = _parse_args(sys.argv[1:])
+
+    # a core application is enough for the non-UI parts of Qt the services rely on (QSettings, signals)
+    app = QCoreApplication(sys.argv[:1])
+
+    # the framework service expects the local workspace path as the third positional argument
+    context_argv = [sys.argv[0], '']
+    if args.workspace is not None:
+        context_argv.append(os.path.expanduser(args.workspace))
+
+    app_context = AppContext(batch=True)
+    app_context.initialize(context_argv)
+    try:
+        return_code = args.handler(app_context, args)
+    finally:
+        app_context.close()
+
+    sys.exit(return_code)
+
+if __name__ == '__main__':
+    main()
@@ -55,7 +55,7 @@ class DseSetupPerspective(Perspective):
         # create the view that will display the model
         self._view = DseSetupView(self)
         # return the view
-        return self.view
+        return self._view
 
     def get_model(self):
         """
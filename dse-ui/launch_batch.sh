@@ -0,0 +1,6 @@
+#!/bin/bash
+
+# Headless counterpart of launch.sh, runs bulk operations without the UI
+
+export THIS_DIR=$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )
+$THIS_DIR/dselib/dsebatch.py $@
\ No newline at end of file
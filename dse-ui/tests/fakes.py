@@ -0,0 +1,119 @@
+"""
+Stand-ins for the LWS objects the utilities and services work on.
+"""
+
+
+class FakeCpdStateEnum(object):
+    Local = "Local"
+    CheckedOut = "CheckedOut"
+    InPreparation = "InPreparation"
+    Completed = "Completed"
+    Withdrawn = "Withdrawn"
+
+
+class FakeReferenceDefinition(object):
+    def __init__(self, array):
+        self.array = array
+
+    def isArray(self):
+        return self.array
+
+
+class FakeItemDefinition(object):
+    def __init__(self, name, array_tags=()):
+        self.name = name
+        self.array_tags = set(array_tags)
+        self.lookups = 0
+
+    def getName(self):
+        return self.name
+
+    def getReferenceDefinitionByTag(self, tag):
+        self.lookups += 1
+        return FakeReferenceDefinition(tag in self.array_tags)
+
+
+class FakeItemRevision(object):
+    """
+    Represents an item revision with a name, a CPD state and references, counting the calls made on it.
+    """
+    def __init__(self, name, state=FakeCpdStateEnum.Local, definition=None, owner="me"):
+        self.name = name
+        self.state = state
+        self.owner = owner
+        self.definition = definition or FakeItemDefinition("Item")
+        self.display_name = name
+
+        # {tag: item revision} for single-valued references, {tag: {key: item revision}} for array-valued ones
+        self.references = {}
+        self.calls = {}
+
+    def __repr__(self):
+        return "<FakeItemRevision " + self.name + ">"
+
+    def _count(self, method):
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def getName(self):
+        return self.name
+
+    def getCpdState(self):
+        self._count("getCpdState")
+        return self.state
+
+    def getOwner(self):
+        return self.owner
+
+    def getItemType(self):
+        self._count("getItemType")
+        return self.definition.getName()
+
+    def getDefinition(self):
+        return self.definition
+
+    def getDisplayName(self):
+        self._count("getDisplayName")
+        return self.display_name
+
+    def getAbbreviatedDisplayName(self):
+        return self.display_name[:3]
+
+    def getReferenceTagNames(self):
+        return list(self.references)
+
+    def getReferenceDefinition(self, tag):
+        return FakeReferenceDefinition(isinstance(self.references.get(tag), dict))
+
+    def getReferenceKeys(self, tag):
+        return list(self.references.get(tag) or {})
+
+    def getReference(self, tag, key=None):
+        self._count("getReference")
+        reference = self.references.get(tag)
+        if isinstance(reference, dict):
+            return reference.get(key)
+        return reference
+
+
+class FakeFolder(object):
+    """
+    Represents a folder of the local workspace.
+    """
+    def __init__(self, name="Folder", item_revisions=(), sub_folders=()):
+        self.name = name
+        self.contained_item_revisions = list(item_revisions)
+        self.sub_folders = list(sub_folders)
+
+    def add_item_revision(self, item_revision):
+        self.contained_item_revisions.append(item_revision)
+
+    def remove_item_revision(self, item_revision):
+        self.contained_item_revisions.remove(item_revision)
+
+    def create_folder(self, name):
+        folder = FakeFolder(name)
+        self.sub_folders.append(folder)
+        return folder
+
+    def remove_folder(self, folder):
+        self.sub_folders.remove(folder)
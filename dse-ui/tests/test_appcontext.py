@@ -0,0 +1,142 @@
+import threading
+import unittest
+
+try:
+    import PyQt5
+except ImportError:
+    raise unittest.SkipTest("PyQt5 is not installed")
+
+from dselib.baseui.appcontext import AppContext
+from dselib.baseui.services.dseservice import DseService
+from dselib.baseui.services.servicemodel import ServiceDefinition
+
+
+class RecordingService(DseService):
+    """
+    Represents a service recording on which thread it was initialized.
+    """
+    def __init__(self, context, service_id):
+        DseService.__init__(self, context, service_id)
+        self.initialized_on = None
+        self.unregistered = False
+
+    def initialize_service(self):
+        self.initialized_on = threading.current_thread()
+
+    def unregister_service(self):
+        self.unregistered = True
+
+
+class FailingService(RecordingService):
+    """
+    Represents a service whose initialization fails.
+    """
+    def initialize_service(self):
+        raise RuntimeError("initialization failed")
+
+
+class WorkerService(RecordingService):
+    """
+    Represents a service asking for the MainThread service while it initializes.
+    """
+    def initialize_service(self):
+        RecordingService.initialize_service(self)
+        self.main_thread_service = self.context.get_service("MainThread")
+
+
+class MainThreadService(RecordingService):
+    """
+    Represents a service that must be initialized on the main thread and refers back to the Worker service.
+    """
+    def initialize_service(self):
+        RecordingService.initialize_service(self)
+        self.worker_service = self.context.get_service("Worker")
+
+
+class AppContextTest(unittest.TestCase):
+    def setUp(self):
+        self.context = AppContext()
+
+    def define(self, service_id, service_class, depends_on=None, main_thread=False):
+        service_definition = ServiceDefinition(service_id, True, __name__, service_class.__name__, None, depends_on, main_thread)
+        self.context.service_definitions.append(service_definition)
+        self.context.service_definition_map[service_id] = service_definition
+
+    def test_cyclic_dependencies_are_rejected(self):
+        self.define("A", RecordingService, ["B"])
+        self.define("B", RecordingService, ["C"])
+        self.define("C", RecordingService, ["A"])
+
+        with self.assertRaises(ValueError) as raised:
+            self.context._check_service_dependencies()
+        self.assertIn("A -> B -> C -> A", str(raised.exception))
+
+    def test_undefined_dependencies_are_rejected(self):
+        self.define("A", RecordingService, ["Missing"])
+
+        with self.assertRaises(ValueError):
+            self.context._check_service_dependencies()
+
+    def test_dependencies_are_initialized_first(self):
+        self.define("A", RecordingService)
+        self.define("B", RecordingService, ["A"])
+        self.define("C", RecordingService)
+
+        self.context.initialize_services(["B", "C"])
+
+        self.assertEqual(sorted(self.context.services), ["A", "B", "C"])
+        self.assertEqual(self.context.loading_services, {})
+        self.assertTrue(self.context.is_service_loaded("A"))
+
+    def test_failing_dependency_discards_dependent_services(self):
+        self.define("A", FailingService)
+        self.define("B", RecordingService, ["A"])
+        self.define("C", RecordingService)
+
+        with self.assertRaises(RuntimeError):
+            self.context.initialize_services(["B", "C"])
+
+        self.assertNotIn("A", self.context.services)
+        self.assertNotIn("B", self.context.services)
+        self.assertEqual(self.context.loading_services, {})
+        self.assertEqual(self.context.service_owners, {})
+        self.assertFalse(self.context.is_service_loaded("B"))
+
+    def test_failing_service_is_not_published_by_get_service(self):
+        self.define("A", FailingService)
+
+        with self.assertRaises(RuntimeError):
+            self.context.get_service("A")
+
+        self.assertFalse(self.context.is_service_loaded("A"))
+        self.assertEqual(self.context.loading_services, {})
+
+    def test_main_thread_service_reached_from_a_pool_thread(self):
+        self.define("Worker", WorkerService)
+        self.define("MainThread", MainThreadService, main_thread=True)
+
+        self.context.initialize_services(["Worker"])
+
+        worker_service = self.context.get_service("Worker")
+        main_thread_service = self.context.get_service("MainThread")
+        self.assertIsNot(worker_service.initialized_on, threading.main_thread())
+        self.assertIs(main_thread_service.initialized_on, threading.main_thread())
+        self.assertIs(worker_service.main_thread_service, main_thread_service)
+        self.assertIs(main_thread_service.worker_service, worker_service)
+
+    def test_get_service_from_another_thread_waits_for_the_initialization(self):
+        self.define("A", RecordingService)
+        services = []
+        threads = [threading.Thread(target=lambda: services.append(self.context.get_service("A"))) for _i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(services), 4)
+        self.assertTrue(all(service is services[0] for service in services))
+        self.assertIsNotNone(services[0].initialized_on)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from dselib.baseui.utils import batchrunner
+from dselib.baseui.utils.batchrunner import run_batch
+
+from tests.fakes import FakeItemRevision
+
+
+class RunBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.retry_delay = batchrunner.RETRY_DELAY
+        batchrunner.RETRY_DELAY = 0
+        self.a, self.b, self.c = FakeItemRevision("a"), FakeItemRevision("b"), FakeItemRevision("c")
+        self.runs = []
+
+    def tearDown(self):
+        batchrunner.RETRY_DELAY = self.retry_delay
+
+    def run_item(self, item_revision, result):
+        self.runs.append(item_revision)
+
+    def test_dependencies_run_first(self):
+        results = run_batch([self.a, self.b, self.c], self.run_item, {self.a: [self.b], self.b: [self.c]})
+
+        self.assertEqual(self.runs, [self.c, self.b, self.a])
+        self.assertEqual([result.item_revision for result in results], [self.a, self.b, self.c])
+        self.assertTrue(all(result.succeeded for result in results))
+
+    def test_item_revisions_depending_on_a_failed_one_are_skipped(self):
+        def operation(item_revision, result):
+            result.stage = "run"
+            if item_revision is self.b:
+                raise ValueError("failed")
+            self.runs.append(item_revision)
+
+        results = run_batch([self.a, self.b, self.c], operation, {self.a: [self.b]})
+
+        self.assertEqual(self.runs, [self.c])
+        self.assertTrue(results[0].skipped)
+        self.assertIn("b", results[0].error)
+        self.assertEqual((results[1].error, results[1].stage, results[1].skipped), ("failed", "run", False))
+        self.assertTrue(results[2].succeeded)
+
+    def test_transient_errors_are_retried(self):
+        def operation(item_revision, result):
+            self.runs.append(item_revision)
+            if len(self.runs) < 3:
+                raise OSError("connection lost")
+
+        result = run_batch([self.a], operation, retries=2)[0]
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(result.attempts, 3)
+        self.assertIsNone(result.error)
+
+    def test_other_errors_are_not_retried(self):
+        def operation(item_revision, result):
+            raise ValueError("invalid")
+
+        result = run_batch([self.a], operation, retries=2)[0]
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual(result.attempts, 1)
+        self.assertIsNotNone(result.traceback)
+
+    def test_duplicates_run_once_and_share_the_result(self):
+        progress = []
+
+        results = run_batch([self.a, self.a], self.run_item,
+                            progress=lambda finished_count, total_count, result: progress.append((finished_count, total_count)))
+
+        self.assertEqual(self.runs, [self.a])
+        self.assertIs(results[0], results[1])
+        self.assertEqual(progress, [(1, 1)])
+
+    def test_cyclic_dependencies_are_rejected(self):
+        with self.assertRaises(RuntimeError):
+            run_batch([self.a, self.b], self.run_item, {self.a: [self.b], self.b: [self.a]})
+
+
+if __name__ == '__main__':
+    unittest.main()
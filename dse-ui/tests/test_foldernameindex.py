@@ -0,0 +1,84 @@
+import unittest
+
+from dselib.baseui.utils.foldernameindex import FolderNameIndex
+
+ITEM_NAME_FORMAT = "{base}{index}"
+COPY_NAME_FORMAT = "{base} ({index})"
+
+
+class FolderNameIndexTest(unittest.TestCase):
+    def test_base_name_is_used_if_free(self):
+        index = FolderNameIndex(["Other"])
+
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item")
+
+    def test_first_free_suffix_is_handed_out(self):
+        index = FolderNameIndex(["Item", "Item1", "Item3"])
+
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item2")
+
+    def test_get_unique_name_does_not_reserve(self):
+        index = FolderNameIndex(["Item"])
+
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item1")
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item1")
+        self.assertEqual(index.reserved_names, set())
+
+    def test_reserved_names_are_distinct_and_skipped(self):
+        index = FolderNameIndex(["A- Copy", "A- Copy (2)"])
+
+        self.assertEqual(index.reserve_unique_names("A- Copy", 3, COPY_NAME_FORMAT),
+                         ["A- Copy (1)", "A- Copy (3)", "A- Copy (4)"])
+        self.assertEqual(index.get_unique_name("A- Copy", COPY_NAME_FORMAT), "A- Copy (5)")
+
+    def test_released_gap_is_handed_out_again(self):
+        index = FolderNameIndex(["Item"])
+        index.reserve_unique_names("Item", 3, ITEM_NAME_FORMAT)
+
+        index.release("Item2")
+
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item2")
+
+    def test_reset_keeps_the_reservations_not_used_yet(self):
+        index = FolderNameIndex(["Item"])
+        index.reserve_unique_names("Item", 2, ITEM_NAME_FORMAT)
+
+        index.reset(["Item", "Item1"])
+
+        self.assertEqual(index.reserved_names, {"Item2"})
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item3")
+
+    def test_reset_frees_removed_names(self):
+        index = FolderNameIndex(["Item", "Item1", "Item2"])
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item3")
+
+        index.reset(["Item", "Item2"])
+
+        self.assertEqual(index.get_unique_name("Item", ITEM_NAME_FORMAT), "Item1")
+
+    def test_name_shared_by_several_entries_stays_used(self):
+        index = FolderNameIndex(["Item", "Item"])
+
+        index.reset(["Item"])
+
+        self.assertTrue(index.is_used("Item"))
+        self.assertEqual(index.name_counts["Item"], 1)
+
+    def test_is_current_compares_the_names(self):
+        index = FolderNameIndex(["A", "B"])
+
+        self.assertTrue(index.is_current(["A", "B"]))
+        self.assertFalse(index.is_current(["A", "C"]))
+        self.assertFalse(index.is_current(["A"]))
+
+    def test_parse_suffix_only_accepts_the_exact_format(self):
+        index = FolderNameIndex([])
+
+        self.assertEqual(index._parse_suffix("Item (12)", "Item", COPY_NAME_FORMAT), 12)
+        self.assertEqual(index._parse_suffix("Item (012)", "Item", COPY_NAME_FORMAT), 0)
+        self.assertEqual(index._parse_suffix("Item (x)", "Item", COPY_NAME_FORMAT), 0)
+        self.assertEqual(index._parse_suffix("Item", "Item", COPY_NAME_FORMAT), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from dselib.baseui.utils.foldersummary import FolderSummaryCache
+
+from tests.fakes import FakeCpdStateEnum, FakeFolder, FakeItemRevision
+
+
+class FolderSummaryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.local = FakeItemRevision("local", FakeCpdStateEnum.Local)
+        self.completed = FakeItemRevision("completed", FakeCpdStateEnum.Completed)
+        self.sub_folder = FakeFolder("sub", [self.completed])
+        self.root = FakeFolder("root", [self.local], [self.sub_folder])
+        self.cache = FolderSummaryCache(lambda folder: True)
+
+    def test_tree_summary(self):
+        summary = self.cache.get_summary(self.root)
+
+        self.assertEqual(summary.item_count, 2)
+        self.assertEqual(summary.folder_count, 1)
+        self.assertEqual(summary.state_histogram, {FakeCpdStateEnum.Local: 1, FakeCpdStateEnum.Completed: 1})
+
+    def test_max_depth_limits_the_summary(self):
+        summary = self.cache.get_summary(self.root, 0)
+
+        self.assertEqual(summary.item_count, 1)
+        self.assertEqual(summary.state_histogram, {FakeCpdStateEnum.Local: 1})
+
+    def test_unchanged_folders_are_not_read_again(self):
+        self.cache.get_summary(self.root)
+        self.cache.get_summary(self.root)
+
+        self.assertEqual(self.completed.calls["getCpdState"], 1)
+
+    def test_replaced_entry_with_the_same_count_is_noticed(self):
+        self.cache.get_summary(self.root)
+        replacement = FakeItemRevision("replacement", FakeCpdStateEnum.Withdrawn)
+        self.sub_folder.contained_item_revisions = [replacement]
+
+        summary = self.cache.get_summary(self.root)
+
+        self.assertEqual(summary.state_histogram, {FakeCpdStateEnum.Local: 1, FakeCpdStateEnum.Withdrawn: 1})
+        self.assertNotIn(self.completed, self.cache.item_folders)
+
+    def test_invalidate_item_rereads_its_folders(self):
+        self.cache.get_summary(self.root)
+        self.completed.state = FakeCpdStateEnum.Withdrawn
+
+        self.cache.invalidate_item(self.completed)
+
+        self.assertEqual(self.cache.get_summary(self.root).state_histogram[FakeCpdStateEnum.Withdrawn], 1)
+
+    def test_remove_folder_forgets_it(self):
+        self.cache.get_summary(self.root)
+        self.root.remove_folder(self.sub_folder)
+
+        self.cache.remove_folder(self.sub_folder)
+        self.cache.invalidate_folder(self.root)
+
+        self.assertEqual(self.cache.get_summary(self.root).item_count, 1)
+        self.assertNotIn(self.sub_folder, self.cache.own_summaries)
+        self.assertNotIn(self.sub_folder, self.cache.parents)
+        self.assertNotIn(self.completed, self.cache.item_folders)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+import unittest
+from unittest import mock
+
+try:
+    import PyQt5
+except ImportError:
+    raise unittest.SkipTest("PyQt5 is not installed")
+
+from dselib.baseui.services import itemservice
+from dselib.baseui.services.itemservice import ItemService
+
+from tests.fakes import FakeCpdStateEnum, FakeFolder, FakeItemDefinition, FakeItemRevision
+
+
+class FakeLwsManager(object):
+    """
+    Represents the LWS manager, recording the saves and deletions.
+    """
+    def __init__(self):
+        self.sys_settings = {'show_full_name': 'True', 'cpd_user': 'me'}
+        self.saved = []
+        self.deleted = []
+        self.failing_save = None
+
+    def save_single_item(self, item_revision, close_after=None):
+        if item_revision is self.failing_save:
+            raise OSError("save failed")
+        self.saved.append(item_revision)
+
+    def delete_item(self, item_revision):
+        self.deleted.append(item_revision)
+
+
+class FakeSession(object):
+    def createItem(self, item_type_definition, name, attributes, references):
+        return FakeItemRevision(name, definition=item_type_definition)
+
+
+class FakeFrameworkService(object):
+    def __init__(self, lws_manager):
+        self.lws_manager = lws_manager
+        self.aces_session = FakeSession()
+
+
+class FakeToolReferenceTags(object):
+    """
+    Represents the classified reference tags of a tool without tasks.
+    """
+    class tool_definition(object):
+        @staticmethod
+        def get_tasks():
+            return []
+
+    def __init__(self, workset_tags):
+        self.workset_tags = workset_tags
+
+
+class ItemServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        # the module looks these up as globals
+        for name, value in (("CpdStateEnum", FakeCpdStateEnum), ("Workset", type(None)), ("WorkspaceFolder", FakeFolder)):
+            patcher = mock.patch.object(itemservice, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.lws_manager = FakeLwsManager()
+        self.service = self.create_service()
+
+    def create_service(self):
+        service = ItemService(None, "Item")
+        service.lws_manager = self.lws_manager
+        service.framework_service = FakeFrameworkService(self.lws_manager)
+        return service
+
+
+class UniqueNameTest(ItemServiceTestCase):
+    def test_item_name_takes_the_first_free_suffix(self):
+        folder = FakeFolder(item_revisions=[FakeItemRevision(name) for name in ("Analysis", "Analysis1", "Analysis3")])
+        item_type_definition = mock.Mock(**{"getDisplayName.return_value": "Analysis"})
+
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Analysis2")
+        # asking doesn't reserve anything
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Analysis2")
+
+    def test_copy_workset_and_folder_names(self):
+        source = FakeItemRevision("A")
+        folder = FakeFolder(item_revisions=[source, FakeItemRevision("A- Copy")],
+                            sub_folders=[FakeFolder(name) for name in ("Workset", "Workset_1", "New Folder")])
+
+        self.assertEqual(self.service.get_unique_item_copy_name(source, folder), "A- Copy (1)")
+        self.assertEqual(self.service.get_unique_workset_name(folder), "Workset_2")
+        self.assertEqual(self.service.get_unique_folder_name(folder, None), "New Folder1")
+        self.assertEqual(self.service.get_unique_folder_name(folder, "Other"), "Other")
+
+    def test_changes_made_elsewhere_are_picked_up(self):
+        renamed = FakeItemRevision("Item1")
+        folder = FakeFolder(item_revisions=[FakeItemRevision("Item"), renamed])
+        item_type_definition = mock.Mock(**{"getDisplayName.return_value": "Item"})
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Item2")
+
+        renamed.name = "Other"
+
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Item1")
+
+    def test_reserved_names_are_skipped_until_released(self):
+        folder = FakeFolder(item_revisions=[FakeItemRevision("Item")])
+        item_type_definition = mock.Mock(**{"getDisplayName.return_value": "Item"})
+
+        names = self.service.reserve_unique_names(folder, "Item", 2)
+
+        self.assertEqual(names, ["Item1", "Item2"])
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Item3")
+        self.service.release_unique_names(folder, names)
+        self.assertEqual(self.service.get_unique_item_name(item_type_definition, folder), "Item1")
+
+
+class ReferenceClosureTest(ItemServiceTestCase):
+    def setUp(self):
+        ItemServiceTestCase.setUp(self)
+        # root -> local -> checked out below local, root -> checked out -> local below checked out
+        self.root = FakeItemRevision("root", FakeCpdStateEnum.Completed)
+        self.local = FakeItemRevision("local", FakeCpdStateEnum.Local)
+        self.checked_out = FakeItemRevision("checked out", FakeCpdStateEnum.CheckedOut)
+        self.checked_out_below_local = FakeItemRevision("checked out below local", FakeCpdStateEnum.CheckedOut)
+        self.local_below_checked_out = FakeItemRevision("local below checked out", FakeCpdStateEnum.Local)
+        self.deep_local = FakeItemRevision("deep local", FakeCpdStateEnum.Local)
+        self.root.references = {"first": self.local, "second": self.checked_out}
+        self.local.references = {"child": self.checked_out_below_local, "other": self.deep_local}
+        self.checked_out.references = {"child": self.local_below_checked_out}
+
+    def test_each_state_only_follows_references_in_that_state(self):
+        references = []
+        self.service.find_non_completed_references(self.root, references)
+
+        self.assertEqual(references, [self.local, self.deep_local, self.checked_out])
+
+    def test_matches_find_references_per_state(self):
+        expected = []
+        for state in (FakeCpdStateEnum.Local, FakeCpdStateEnum.CheckedOut, FakeCpdStateEnum.InPreparation, FakeCpdStateEnum.Withdrawn):
+            self.service.find_references(self.root, expected, state)
+
+        references = []
+        self.service.find_non_completed_references(self.root, references)
+
+        self.assertEqual(references, expected)
+
+    def test_direct_references_only(self):
+        references_by_state = self.service.find_references_by_state(self.root, (FakeCpdStateEnum.Local, FakeCpdStateEnum.CheckedOut), False)
+
+        self.assertEqual(references_by_state, {FakeCpdStateEnum.Local: [self.local], FakeCpdStateEnum.CheckedOut: [self.checked_out]})
+
+    def test_cycles_are_walked_once(self):
+        self.deep_local.references = {"back": self.local}
+
+        references = []
+        self.service.find_references(self.root, references, FakeCpdStateEnum.Local)
+
+        self.assertEqual(references, [self.local, self.deep_local])
+
+
+class UnitOfWorkTest(ItemServiceTestCase):
+    def setUp(self):
+        ItemServiceTestCase.setUp(self)
+        self.existing = FakeItemRevision("existing")
+        self.item_type_definition = FakeItemDefinition("Item")
+
+    def test_saves_are_done_once_at_the_end(self):
+        with self.service.unit_of_work():
+            created = self.service.create_item(self.item_type_definition, "created")
+            self.service.save_item(self.existing)
+            self.service.save_item(self.existing)
+            self.assertEqual(self.lws_manager.saved, [])
+
+        self.assertEqual(self.lws_manager.saved, [created, self.existing])
+        self.assertIsNone(self.service.get_unit_of_work())
+
+    def test_failing_block_deletes_the_created_item_revisions(self):
+        with self.assertRaises(RuntimeError):
+            with self.service.unit_of_work():
+                created = self.service.create_item(self.item_type_definition, "created")
+                self.service.save_item(self.existing)
+                raise RuntimeError("failed")
+
+        self.assertEqual(self.lws_manager.saved, [])
+        self.assertEqual(self.lws_manager.deleted, [created])
+        self.assertIsNone(self.service.get_unit_of_work())
+
+    def test_failing_save_deletes_the_created_item_revisions(self):
+        self.lws_manager.failing_save = self.existing
+
+        with self.assertRaises(OSError):
+            with self.service.unit_of_work():
+                self.service.save_item(self.existing)
+                created = self.service.create_item(self.item_type_definition, "created")
+
+        # the created item revision was saved first and is deleted again
+        self.assertEqual(self.lws_manager.saved, [created])
+        self.assertEqual(self.lws_manager.deleted, [created])
+
+    def test_nested_blocks_are_part_of_the_outermost_one(self):
+        with self.service.unit_of_work() as unit:
+            with self.service.unit_of_work() as nested_unit:
+                self.service.save_item(self.existing)
+            self.assertIs(nested_unit, unit)
+            self.assertEqual(self.lws_manager.saved, [])
+
+        self.assertEqual(self.lws_manager.saved, [self.existing])
+
+
+class CacheTest(ItemServiceTestCase):
+    def test_display_names_are_evicted_least_recently_used_first(self):
+        with mock.patch.object(ItemService, "DISPLAY_NAME_CACHE_SIZE", 2):
+            service = self.create_service()
+        first, second, third = FakeItemRevision("first"), FakeItemRevision("second"), FakeItemRevision("third")
+
+        for item_revision in (first, second, first, third, first, second):
+            service.get_display_name(item_revision)
+
+        self.assertEqual(first.calls["getDisplayName"], 1)
+        self.assertEqual(second.calls["getDisplayName"], 2)
+        self.assertEqual(len(service.display_names), 2)
+
+    def test_saving_detects_renames_and_meta_data_changes(self):
+        item_revision = FakeItemRevision("name")
+        with mock.patch.object(self.service, "record_item_renamed") as record_item_renamed, \
+                mock.patch.object(self.service, "record_meta_data_changed") as record_meta_data_changed:
+            self.service.get_display_name(item_revision)
+            item_revision.display_name = "name [changed]"
+            self.service.save_item(item_revision)
+            record_meta_data_changed.assert_called_once_with(item_revision)
+            self.assertEqual(self.service.get_display_name(item_revision), "name [changed]")
+
+            item_revision.name = "renamed"
+            self.service.save_item(item_revision)
+            record_item_renamed.assert_called_once_with(item_revision, "name")
+
+    def test_workset_dependencies_are_evicted_with_their_sources(self):
+        with mock.patch.object(ItemService, "WORKSET_DEPENDENCY_CACHE_SIZE", 1):
+            service = self.create_service()
+        service.tool_reference_tags["Item"] = FakeToolReferenceTags([("input", True), ("output", False)])
+        first, second = FakeItemRevision("first"), FakeItemRevision("second")
+        first_input, second_output = FakeItemRevision("first input"), FakeItemRevision("second output")
+        first.references = {"input": first_input}
+        second.references = {"output": second_output}
+
+        self.assertEqual(service.calculate_workset_dependencies_batch([first, second]),
+                         [([], [first_input]), ([second_output], [])])
+
+        # both were resolved together, so either one's references changing drops both
+        self.assertNotIn(first, service.workset_dependencies)
+        self.assertEqual(service.workset_dependency_sources, {first: {second}, second: {second}})
+
+        service.invalidate_workset_dependencies(second)
+
+        self.assertEqual(len(service.workset_dependencies), 0)
+        self.assertEqual(service.workset_dependency_sources, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
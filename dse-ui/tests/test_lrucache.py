@@ -0,0 +1,52 @@
+import unittest
+
+from dselib.baseui.utils.lrucache import LruCache
+
+
+class LruCacheTest(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LruCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_put_refreshes_an_existing_entry(self):
+        cache = LruCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 3)
+        cache.put("c", 4)
+
+        self.assertEqual(cache.get("a"), 3)
+        self.assertIsNone(cache.get("b"))
+
+    def test_evicted_callback_gets_the_dropped_entries(self):
+        evicted = []
+        cache = LruCache(1, lambda key, value: evicted.append((key, value)))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.pop("b")
+        cache.put("c", 3)
+        cache.clear()
+
+        # only entries dropped for lack of room are reported
+        self.assertEqual(evicted, [("a", 1)])
+
+    def test_pop_and_defaults(self):
+        cache = LruCache(2)
+        cache.put("a", 1)
+
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertEqual(cache.pop("a", "missing"), "missing")
+        self.assertEqual(cache.get("a", "missing"), "missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from dselib.baseui.utils.statesnapshot import ItemStateSnapshot
+
+from tests.fakes import FakeCpdStateEnum, FakeItemDefinition, FakeItemRevision
+
+
+class ItemStateSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.opened = set()
+        self.local = FakeItemRevision("local", FakeCpdStateEnum.Local)
+        self.completed = FakeItemRevision("completed", FakeCpdStateEnum.Completed, FakeItemDefinition("Task"))
+        self.checked_out = FakeItemRevision("checked out", FakeCpdStateEnum.CheckedOut, owner="other")
+        self.snapshot = ItemStateSnapshot([self.local, self.completed, self.checked_out], [True, True, False],
+                                          lambda item_revision: item_revision in self.opened, "me")
+
+    def test_select_combines_the_criteria(self):
+        snapshot = self.snapshot
+
+        self.assertEqual(snapshot.select(), [0, 1, 2])
+        self.assertEqual(snapshot.select(editable=True), [0, 1])
+        self.assertEqual(snapshot.select(states=(FakeCpdStateEnum.Completed, FakeCpdStateEnum.CheckedOut)), [1, 2])
+        self.assertEqual(snapshot.select(exclude_states=(FakeCpdStateEnum.Local,), editable=True), [1])
+        self.assertEqual(snapshot.select(exclude_owners=("me",)), [2])
+        self.assertEqual(snapshot.select(item_types=("Task",)), [1])
+        self.assertEqual(snapshot.get_item_revisions(snapshot.select(opened=False)), [self.local, self.completed, self.checked_out])
+
+    def test_contains(self):
+        self.assertTrue(self.snapshot.contains(self.local))
+        self.assertFalse(self.snapshot.contains(FakeItemRevision("other")))
+        self.assertEqual(len(self.snapshot), 3)
+
+    def test_refresh_rereads_only_the_live_columns(self):
+        self.local.state = FakeCpdStateEnum.InPreparation
+        self.opened.add(self.completed)
+
+        self.snapshot.refresh(lambda item_revision: item_revision in self.opened, "other")
+
+        self.assertEqual(self.snapshot.select(states=(FakeCpdStateEnum.InPreparation,)), [0])
+        self.assertEqual(self.snapshot.select(opened=True), [1])
+        self.assertEqual(self.snapshot.user_name, "other")
+        self.assertEqual(self.local.calls["getItemType"], 1)
+        self.assertEqual(self.local.calls["getCpdState"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
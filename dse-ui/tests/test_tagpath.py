@@ -0,0 +1,59 @@
+import unittest
+
+from dselib.baseui.utils.tagpath import TagPathResolver
+
+from tests.fakes import FakeItemDefinition, FakeItemRevision
+
+
+class TagPathResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.resolver = TagPathResolver()
+        self.tool = FakeItemDefinition("Tool", array_tags=("inputs",))
+        self.task = FakeItemRevision("task", definition=self.tool)
+        self.first_input = FakeItemRevision("first input")
+        self.second_input = FakeItemRevision("second input")
+        self.output = FakeItemRevision("output")
+        self.task.references = {"inputs": {"1": self.first_input, "2": self.second_input}, "output": self.output}
+        self.base = FakeItemRevision("base")
+        self.base.references = {"task": self.task}
+
+    def test_compile_splits_once(self):
+        tag_path = self.resolver.compile("task.output")
+
+        self.assertIs(self.resolver.compile("task.output"), tag_path)
+        self.assertEqual(tag_path.segments, ("task", "output"))
+        self.assertEqual(tag_path.parent_segments, ("task",))
+        self.assertEqual(tag_path.leaf, "output")
+
+    def test_resolve_single_and_array_references(self):
+        self.assertEqual(self.resolver.resolve_references(self.base, "task.output"), [self.output])
+        # like ItemService.get_indirect_references always did, the item revision holding the array comes last
+        self.assertEqual(self.resolver.resolve_references(self.base, "task.inputs"), [self.first_input, self.second_input, self.task])
+        self.assertEqual(self.resolver.resolve_target(self.base, "task.output"), self.output)
+        self.assertIs(self.resolver.resolve_parent(self.base, "task.output"), self.task)
+
+    def test_broken_path_resolves_to_nothing(self):
+        self.assertEqual(self.resolver.resolve_references(self.base, "missing.output"), [])
+        self.assertIsNone(self.resolver.resolve_target(self.base, "missing.output"))
+        self.assertIsNone(self.resolver.resolve_parent(self.base, "missing.output"))
+
+    def test_array_lookups_are_cached_per_definition(self):
+        self.resolver.resolve_references(self.base, "task.inputs")
+        self.resolver.resolve_references(self.base, "task.inputs")
+
+        self.assertEqual(self.tool.lookups, 1)
+
+    def test_batch_resolves_shared_item_revisions_once(self):
+        other_base = FakeItemRevision("other base")
+        other_base.references = {"task": self.task}
+        visited = set()
+
+        references = self.resolver.resolve_references_batch([self.base, other_base], "task.output", visited)
+
+        self.assertEqual(references, [[self.output], [self.output]])
+        self.assertEqual(self.task.calls["getReference"], 1)
+        self.assertEqual(visited, {self.base, other_base, self.task})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from dselib.baseui.utils.unitofwork import UnitOfWork
+
+
+class UnitOfWorkTest(unittest.TestCase):
+    def test_repeated_saves_are_coalesced_in_the_order_of_the_first_change(self):
+        unit = UnitOfWork()
+        unit.mark_dirty("a")
+        unit.mark_dirty("b", True)
+        unit.mark_dirty("a", False)
+
+        self.assertEqual(list(unit.dirty_item_revisions.items()), [("a", False), ("b", True)])
+
+    def test_close_after_none_keeps_the_previous_value(self):
+        unit = UnitOfWork()
+        unit.mark_dirty("a", True)
+        unit.mark_dirty("a")
+
+        self.assertEqual(unit.dirty_item_revisions["a"], True)
+
+    def test_take_dirty(self):
+        unit = UnitOfWork()
+        unit.mark_dirty("a", True)
+
+        self.assertEqual(unit.take_dirty("a"), ("a", True))
+        self.assertIsNone(unit.take_dirty("a"))
+        self.assertEqual(len(unit.dirty_item_revisions), 0)
+
+    def test_created_item_revisions_are_kept_in_order(self):
+        unit = UnitOfWork()
+        unit.mark_created("a")
+        unit.mark_created("b")
+
+        self.assertEqual(unit.created_item_revisions, ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()